@@ -0,0 +1,33 @@
+"""Select the parser used by Beautiful Soup to parse HTML."""
+
+from functools import cache
+from importlib.util import find_spec
+
+# Parsers supported by Beautiful Soup, from the fastest to the slowest
+HTML_PARSERS = ("lxml", "html5lib", "html.parser")
+
+
+@cache
+def get_html_parser(name="auto"):
+    """
+    Return the name of the Beautiful Soup parser to use.
+    "auto" selects lxml if it is installed, the built-in html.parser otherwise.
+    Raise if the parser is unknown or not installed.
+    """
+
+    if name == "auto":
+        return "lxml" if find_spec("lxml") else "html.parser"
+
+    if name not in HTML_PARSERS:
+        raise Exception(
+            f"Unknown SEO_HTML_PARSER {name!r}, "
+            f"choose one of: auto, {', '.join(HTML_PARSERS)}."
+        )
+
+    if name != "html.parser" and not find_spec(name):
+        raise Exception(
+            f"You must install {name} to use it as SEO_HTML_PARSER: "
+            f"python -m pip install {name}"
+        )
+
+    return name
@@ -0,0 +1,64 @@
+"""Normalize the URLs of internal links, like Pelican URLs."""
+
+from functools import lru_cache
+from urllib.parse import unquote, urljoin, urlsplit
+
+# Number of resolved links kept, the same navigation links are on every page
+URL_CACHE_SIZE = 2**16
+
+
+@lru_cache(maxsize=URL_CACHE_SIZE)
+def _resolve_link(href, siteurl, document_directory):
+    """
+    Return the internal URL of a link from a document in :document_directory:,
+    as returned by get_internal_url. Links are resolved once by directory.
+    Malformed links, like an invalid IPv6 host, are external.
+    """
+
+    site = urlsplit(siteurl or "")
+    site_path = site.path.rstrip("/") + "/"
+
+    # Resolve the link against the absolute URL of the document directory
+    base = f"{site.scheme}://{site.netloc}" if site.netloc else ""
+    base += site_path + document_directory
+    try:
+        link = urlsplit(urljoin(base, href))
+    except ValueError:
+        return None
+
+    if (link.scheme, link.netloc) != (site.scheme, site.netloc):
+        return None
+    if not (link.path + "/").startswith(site_path):
+        return None
+
+    path = unquote(link.path[len(site_path) :])
+    if path.endswith("index.html") and path[: -len("index.html")][-1:] in ("", "/"):
+        path = path[: -len("index.html")]
+
+    return path
+
+
+def get_internal_url(href, siteurl, document_url=""):
+    """
+    Return the URL of an internal link, relative to the site root, unquoted and
+    without query, fragment or trailing "index.html", like Pelican URLs.
+    Links are internal if they have the scheme and host of :siteurl:, or none.
+    Relative links are resolved from the :document_url: they appear in.
+    Return None for an external link.
+    """
+
+    href = href.strip()
+    document_directory, _, document_name = (
+        (document_url or "").lstrip("/").rpartition("/")
+    )
+    if document_directory:
+        document_directory += "/"
+
+    if not href or href[0] in "#?":
+        # Link to the document itself
+        href = document_name
+    elif href[0] == "/" or ":" in href.partition("/")[0]:
+        # Absolute links don't depend on the document
+        document_directory = ""
+
+    return _resolve_link(href, siteurl, document_directory)
@@ -12,20 +12,125 @@ Author : Maëva Brunelles <https://github.com/MaevaBrunelles>
 License : GNU AFFERO GENERAL PUBLIC LICENSE Version 3
 """
 
+from collections.abc import Mapping
+from itertools import islice
 import logging
+import os
+import re
 
 from pelican import signals
-from pelican.generators import ArticlesGenerator, PagesGenerator
+from pelican.generators import ArticlesGenerator, PagesGenerator, StaticGenerator
+from pelican.paginator import Paginator
 
 from . import settings as default_plugin_settings
+from .html_parser import get_html_parser
+from .internal_url import get_internal_url
 from .seo_enhancer import SEOEnhancer
+from .seo_enhancer.background_enhancer import BackgroundHTMLEnhancer
+from .seo_enhancer.enhancement_manifest import EnhancementManifest
+from .seo_enhancer.sitemap_writer import SitemapWriter
+from .seo_enhancer.url_state_store import URLStateStore
 from .seo_report import SEOReport
+from .seo_report.analysis_cache import AnalysisCache
+from .seo_report.site_analyzer import LinkGraphAnalyzer
 
 logger = logging.getLogger(__name__)
 
+# Context key of the plugin settings resolved at initialization.
+# Lowercase, like the other values Pelican adds to the context at runtime.
+PLUGIN_SETTINGS_KEY = "seo_plugin_settings"
+
+# Context key of the link graph of all the articles and pages, built once
+# for the build by the SEO report or the sitemap, whichever needs it first.
+LINK_GRAPH_KEY = "seo_link_graph"
+
+# HTML enhancements waiting for the end of the build, by file path.
+# Only used when SEO_ENHANCER_DEFERRED is enabled.
+_deferred_html_enhancements = {}
+
+# Background threads enhancing HTML files while Pelican writes the next ones.
+# Only used when SEO_ENHANCER_BACKGROUND is enabled.
+_background_html_enhancer = BackgroundHTMLEnhancer()
+
+# Hashes of the enhanced files, kept from one build to the next in CACHE_PATH.
+# Only used when SEO_ENHANCER_MANIFEST is enabled.
+MANIFEST_FILE_NAME = "seo_enhancer_manifest.json"
+_enhancement_manifest = EnhancementManifest()
+
+# Content hash and last change of each document URL, kept from one build
+# to the next in CACHE_PATH. Only used when SEO_ENHANCER_URL_STATES is enabled.
+URL_STATES_FILE_NAME = "seo_enhancer_url_states.sqlite3"
+_url_state_store = URLStateStore()
+
+# URLs added, changed or removed since the previous build, written in CACHE_PATH.
+# Only used when SEO_ENHANCER_INDEXNOW_KEY is set.
+INDEXNOW_URLS_FILE_NAME = "seo_enhancer_indexnow_urls.txt"
+INDEXNOW_KEY_PATTERN = re.compile(r"[a-zA-Z0-9-]{8,128}")
+
+# Sitemap priority of the documents with the lowest internal link authority
+MIN_SITEMAP_PRIORITY = 0.1
+
+# Analysis of the documents, kept from one build to the next in CACHE_PATH.
+# Only used when SEO_REPORT_CACHE is enabled.
+ANALYSIS_CACHE_FILE_NAME = "seo_report_cache.json"
+
+# Attributes of the generators listing the contents they write
+GENERATED_CONTENTS = {
+    ArticlesGenerator: (
+        "articles",
+        "translations",
+        "hidden_articles",
+        "hidden_translations",
+        "drafts",
+        "drafts_translations",
+    ),
+    PagesGenerator: (
+        "pages",
+        "translations",
+        "hidden_pages",
+        "hidden_translations",
+        "draft_pages",
+        "draft_translations",
+    ),
+    StaticGenerator: ("staticfiles",),
+}
+# Taxonomies of the articles, with the prefix of their feed settings
+TAXONOMIES = {"categories": "CATEGORY_", "tags": "TAG_", "authors": "AUTHOR_"}
+# Template of the page of each taxonomy item. The direct template listing
+# the items has the name of the taxonomy, like "tags".
+TAXONOMY_TEMPLATES = {"categories": "category", "tags": "tag", "authors": "author"}
+
+
+class PluginSettings(Mapping):
+    """Read-only mapping of the plugin settings, shared by all the signal hooks."""
+
+    __slots__ = ("_settings",)
+
+    def __init__(self, settings):
+        self._settings = dict(settings)
+
+    def __getitem__(self, name):
+        """Return the value of the :name: setting."""
+        return self._settings[name]
+
+    def __iter__(self):
+        """Iterate over setting names."""
+        return iter(self._settings)
+
+    def __len__(self):
+        """Return the number of settings."""
+        return len(self._settings)
+
+    def __repr__(self):
+        """Return a representation with all settings."""
+        return f"PluginSettings({self._settings!r})"
+
 
 def plugin_initializer(settings):
-    """Raise if SITEURL parameter is not set in Pelican settings."""
+    """
+    Raise if SITEURL parameter is not set in Pelican settings.
+    Resolve and validate the plugin settings once for the whole build.
+    """
 
     if not settings.settings.get("SITEURL"):
         raise Exception(
@@ -33,6 +138,9 @@ def plugin_initializer(settings):
             to use SEO plugin."
         )
 
+    # Pelican copies its settings in the context of all generators and writers
+    settings.settings[PLUGIN_SETTINGS_KEY] = resolve_plugin_settings(settings.settings)
+
     logger.info("SEO plugin initialized")
 
 
@@ -41,9 +149,19 @@ def get_plugin_settings(context):
 
     .. note:: Pelican's settings take precedence over the plugin's default settings.
 
+    Common settings:
+
+        - SEO_HTML_PARSER
+
     SEO report settings:
 
         - SEO_REPORT
+        - SEO_REPORT_FORMATS
+        - SEO_REPORT_PARALLEL
+        - SEO_REPORT_PROCESSES
+        - SEO_REPORT_CACHE
+        - SEO_REPORT_SHARD_BY
+        - SEO_REPORT_SHARD_SIZE
         - SEO_ARTICLES_LIMIT
         - SEO_PAGES_LIMIT
 
@@ -52,7 +170,19 @@ def get_plugin_settings(context):
         - SEO_ENHANCER
         - SEO_ENHANCER_OPEN_GRAPH
         - SEO_ENHANCER_TWITTER_CARDS
+        - SEO_ENHANCER_SITEMAP
+        - SEO_ENHANCER_SITEMAP_GZIP
         - SEO_ENHANCER_SITEMAP_URL
+        - SEO_ENHANCER_SITEMAP_PRIORITY
+        - SEO_ENHANCER_ROBOTS_COMPACT
+        - SEO_ENHANCER_DEFERRED
+        - SEO_ENHANCER_PROCESSES
+        - SEO_ENHANCER_BACKGROUND
+        - SEO_ENHANCER_BACKGROUND_THREADS
+        - SEO_ENHANCER_BACKGROUND_QUEUE_SIZE
+        - SEO_ENHANCER_MANIFEST
+        - SEO_ENHANCER_URL_STATES
+        - SEO_ENHANCER_INDEXNOW_KEY
 
     :return: Dictionary of settings for the plugin
     :rtype: <dict>
@@ -73,87 +203,632 @@ def get_plugin_settings(context):
     return plugin_settings
 
 
+def _validate_positive_integer(plugin_settings, name, *, optional=False):
+    """
+    Raise if the :name: setting is not an integer of at least 1,
+    or None if it is :optional:.
+    """
+
+    value = plugin_settings[name]
+    if optional and value is None:
+        return
+    if not isinstance(value, int) or isinstance(value, bool) or value < 1:
+        raise Exception(f"{name} must be an integer of at least 1, not {value!r}.")
+
+
+def validate_plugin_settings(plugin_settings):
+    """Raise if plugin settings are inconsistent with each other."""
+
+    seo_enhancer_setting = plugin_settings["SEO_ENHANCER"]
+    open_graph_setting = plugin_settings["SEO_ENHANCER_OPEN_GRAPH"]
+    twitter_cards_setting = plugin_settings["SEO_ENHANCER_TWITTER_CARDS"]
+
+    if (open_graph_setting or twitter_cards_setting) and not seo_enhancer_setting:
+        raise Exception(
+            "You must enable SEO_ENHANCER setting to use social medias features."
+        )
+
+    if plugin_settings["SEO_ENHANCER_SITEMAP"] and not seo_enhancer_setting:
+        raise Exception("You must enable SEO_ENHANCER setting to generate a sitemap.")
+
+    if (
+        plugin_settings["SEO_ENHANCER_SITEMAP_PRIORITY"]
+        and not plugin_settings["SEO_ENHANCER_SITEMAP"]
+    ):
+        raise Exception(
+            "You must enable SEO_ENHANCER_SITEMAP setting to set sitemap priorities."
+        )
+
+    if plugin_settings["SEO_ENHANCER_URL_STATES"] and not seo_enhancer_setting:
+        raise Exception("You must enable SEO_ENHANCER setting to track URL states.")
+
+    indexnow_key = plugin_settings["SEO_ENHANCER_INDEXNOW_KEY"]
+    if indexnow_key is not None:
+        if not plugin_settings["SEO_ENHANCER_URL_STATES"]:
+            raise Exception(
+                "You must enable SEO_ENHANCER_URL_STATES setting to use IndexNow."
+            )
+        if not INDEXNOW_KEY_PATTERN.fullmatch(indexnow_key):
+            raise Exception(
+                "SEO_ENHANCER_INDEXNOW_KEY must have 8 to 128 characters "
+                "among letters, digits and dashes."
+            )
+
+    if twitter_cards_setting and not open_graph_setting:
+        raise Exception("You must enable Open Graph feature to use Twitter Cards.")
+
+    if (
+        plugin_settings["SEO_ENHANCER_DEFERRED"]
+        and plugin_settings["SEO_ENHANCER_BACKGROUND"]
+    ):
+        raise Exception(
+            "You can't enable both SEO_ENHANCER_DEFERRED "
+            "and SEO_ENHANCER_BACKGROUND settings."
+        )
+
+    # With no thread, or an unbounded queue, the enhancer would hang or grow
+    _validate_positive_integer(plugin_settings, "SEO_ENHANCER_BACKGROUND_THREADS")
+    _validate_positive_integer(plugin_settings, "SEO_ENHANCER_BACKGROUND_QUEUE_SIZE")
+    # Checked at startup rather than after the whole analysis
+    _validate_positive_integer(plugin_settings, "SEO_REPORT_SHARD_SIZE")
+    _validate_positive_integer(plugin_settings, "SEO_REPORT_PROCESSES", optional=True)
+    _validate_positive_integer(plugin_settings, "SEO_ENHANCER_PROCESSES", optional=True)
+
+    shard_by = plugin_settings["SEO_REPORT_SHARD_BY"]
+    if shard_by is not None and shard_by not in SEOReport.SHARD_GROUPS:
+        raise Exception(
+            f"Unknown SEO_REPORT_SHARD_BY {shard_by!r}, "
+            f"choose one of: None, {', '.join(SEOReport.SHARD_GROUPS)}."
+        )
+
+    report_formats = plugin_settings["SEO_REPORT_FORMATS"]
+    if not isinstance(report_formats, (list, tuple, set, frozenset)):
+        raise TypeError(
+            f"SEO_REPORT_FORMATS must be a list of formats, like "
+            f'["html", "jsonl"], not {report_formats!r}.'
+        )
+    unknown_formats = set(report_formats) - set(SEOReport.REPORT_FORMATS)
+    if unknown_formats:
+        raise Exception(
+            f"Unknown SEO_REPORT_FORMATS {', '.join(sorted(unknown_formats))}, "
+            f"choose among: {', '.join(SEOReport.REPORT_FORMATS)}."
+        )
+
+    get_html_parser(plugin_settings["SEO_HTML_PARSER"])
+
+
+def resolve_plugin_settings(context):
+    """
+    Return the plugin settings resolved at initialization if the context has them.
+    Otherwise, get and validate them from the given context.
+
+    :rtype: <PluginSettings>
+    """
+
+    plugin_settings = context.get(PLUGIN_SETTINGS_KEY)
+    if plugin_settings is None:
+        plugin_settings = PluginSettings(get_plugin_settings(context))
+        validate_plugin_settings(plugin_settings)
+
+    return plugin_settings
+
+
+def _get_feed_paths(settings, taxonomies):
+    """
+    Return the paths of the feeds in :settings:, with those of each item
+    of the :taxonomies: returned by get_site_urls.
+    """
+
+    paths = []
+    for name, value in settings.items():
+        if not name.endswith(("_ATOM", "_RSS")) or not isinstance(value, str):
+            continue
+        if "{" not in value:
+            paths.append(value)
+            continue
+        for taxonomy, prefix in TAXONOMIES.items():
+            if name.startswith(prefix):
+                paths.extend(
+                    value.format(slug=item.slug)
+                    for item in taxonomies.get(taxonomy, ())
+                )
+
+    return paths
+
+
+def _get_theme_static_paths(settings):
+    """Return the paths of the theme static files, copied in THEME_STATIC_DIR."""
+
+    paths = []
+    for static_path in settings["THEME_STATIC_PATHS"]:
+        source = os.path.join(settings["THEME"], static_path)
+        for root, _, files in os.walk(source):
+            for name in files:
+                relative_path = os.path.relpath(os.path.join(root, name), source)
+                relative_url = relative_path.replace(os.sep, "/")
+                paths.append(f"{settings['THEME_STATIC_DIR']}/{relative_url}")
+
+    return paths
+
+
+def _get_listing_pages(
+    settings, template_name, save_as, url, articles, *, links=(), link_articles=True
+):
+    """
+    Return the pages written by Pelican for a listing of :articles:,
+    paginated like Writer.write_file, as (url, save_as, linked URLs) tuples.
+    The first page keeps the :url: of the listing, which themes link to.
+    Each page links to :links:, its articles if :link_articles:
+    and the next page.
+    """
+
+    if template_name in settings["PAGINATED_TEMPLATES"]:
+        per_page = (
+            settings["PAGINATED_TEMPLATES"][template_name]
+            or settings["DEFAULT_PAGINATION"]
+        )
+        paginator = Paginator(save_as, url, articles, settings, per_page)
+        pages = []
+        for number in paginator.page_range:
+            page = paginator.page(number)
+            page_url = url if number == 1 else page.url
+            pages.append((page_url, page.save_as, page.object_list))
+    else:
+        pages = [(url, save_as, articles)]
+
+    listing_pages = []
+    for number, (page_url, page_save_as, page_articles) in enumerate(pages, 1):
+        linked_urls = list(links)
+        if link_articles:
+            linked_urls.extend(article.url for article in page_articles)
+        if number < len(pages):
+            linked_urls.append(pages[number][0])
+        listing_pages.append((page_url, page_save_as, linked_urls))
+
+    return listing_pages
+
+
+def _get_menu_urls(generators):
+    """
+    Return the URLs of the menu of Pelican's themes : MENUITEMS,
+    then pages and categories if displayed on the menu.
+    """
+
+    settings = generators[0].settings
+    menu_urls = [url for _, url in settings.get("MENUITEMS", ())]
+    for generator in generators:
+        if isinstance(generator, PagesGenerator) and settings["DISPLAY_PAGES_ON_MENU"]:
+            menu_urls.extend(page.url for page in getattr(generator, "pages", ()))
+        if (
+            isinstance(generator, ArticlesGenerator)
+            and settings["DISPLAY_CATEGORIES_ON_MENU"]
+        ):
+            menu_urls.extend(
+                category.url for category, _ in getattr(generator, "categories", ())
+            )
+
+    return menu_urls
+
+
+def get_site_listings(generators):
+    """
+    Return the listing pages written by Pelican, as (url, save_as,
+    linked URLs) tuples : direct templates, categories, tags, authors and
+    period archives, with their paginated pages.
+    Pages of the index also link to the menu returned by _get_menu_urls.
+    """
+
+    settings = generators[0].settings
+    menu_urls = _get_menu_urls(generators)
+    listings = []
+    for generator in generators:
+        if not isinstance(generator, ArticlesGenerator):
+            continue
+
+        # Tags are a dict, categories and authors a list of pairs
+        taxonomies = {
+            taxonomy: dict(getattr(generator, taxonomy, ())) for taxonomy in TAXONOMIES
+        }
+
+        articles = getattr(generator, "articles", [])
+        for template in settings["DIRECT_TEMPLATES"]:
+            save_as = settings.get(f"{template.upper()}_SAVE_AS", f"{template}.html")
+            if not save_as:
+                continue
+            url = settings.get(f"{template.upper()}_URL", f"{template}.html")
+            links = menu_urls if template == "index" else ()
+            link_articles = template not in taxonomies
+            if not link_articles:
+                # Like "tags.html", listing the items of a taxonomy
+                links = [item.url for item in taxonomies[template]]
+            listings.extend(
+                _get_listing_pages(
+                    settings,
+                    template,
+                    save_as,
+                    url,
+                    articles,
+                    links=links,
+                    link_articles=link_articles,
+                )
+            )
+
+        for taxonomy, items in taxonomies.items():
+            for item, item_articles in items.items():
+                if item.save_as:
+                    listings.extend(
+                        _get_listing_pages(
+                            settings,
+                            TAXONOMY_TEMPLATES[taxonomy],
+                            item.save_as,
+                            item.url,
+                            item_articles,
+                        )
+                    )
+
+        for periods in getattr(generator, "period_archives", {}).values():
+            for period in periods:
+                listings.extend(
+                    _get_listing_pages(
+                        settings,
+                        "period_archives",
+                        period["save_as"],
+                        period["url"],
+                        period["articles"],
+                    )
+                )
+
+    return listings
+
+
+def get_site_urls(generators):
+    """
+    Return the set of the URLs written by Pelican, as returned by
+    get_internal_url : articles, pages and static files with their
+    translations, hidden and draft versions, the listing pages returned
+    by get_site_listings, template pages, feeds and theme static files.
+    Nothing is read from the output directory.
+    """
+
+    settings = generators[0].settings
+    paths = ["", *settings["TEMPLATE_PAGES"].values()]
+
+    def _add_content(content):
+        # Contents with an empty save_as are not written
+        if getattr(content, "save_as", None):
+            paths.extend((content.url, content.save_as))
+
+    taxonomies = {}
+    for generator in generators:
+        for generator_class, attributes in GENERATED_CONTENTS.items():
+            if isinstance(generator, generator_class):
+                for attribute in attributes:
+                    for content in getattr(generator, attribute, ()):
+                        _add_content(content)
+
+        if isinstance(generator, ArticlesGenerator):
+            for taxonomy in TAXONOMIES:
+                # Tags are a dict, categories and authors a list of pairs
+                taxonomies[taxonomy] = list(dict(getattr(generator, taxonomy, ())))
+                for item in taxonomies[taxonomy]:
+                    _add_content(item)
+
+    for url, save_as, _ in get_site_listings(generators):
+        paths.extend((url, save_as))
+
+    paths.extend(_get_feed_paths(settings, taxonomies))
+    paths.extend(_get_theme_static_paths(settings))
+
+    return {get_internal_url(path, "") for path in paths}
+
+
+def _analyze_documents(seo_report, documents, generators, plugin_settings):
+    """
+    Return the analysis of the :documents:, in parallel with
+    SEO_REPORT_PARALLEL and from the analysis cache with SEO_REPORT_CACHE.
+    """
+
+    processes = 1
+    if plugin_settings["SEO_REPORT_PARALLEL"]:
+        processes = plugin_settings["SEO_REPORT_PROCESSES"]
+
+    analysis_cache = None
+    if plugin_settings["SEO_REPORT_CACHE"]:
+        analysis_cache = AnalysisCache()
+        analysis_cache.load(
+            os.path.join(generators[0].context["CACHE_PATH"], ANALYSIS_CACHE_FILE_NAME)
+        )
+
+    documents_analysis = seo_report.launch_analyses(
+        documents, processes=processes, cache=analysis_cache
+    )
+
+    if analysis_cache is not None:
+        analysis_cache.save()
+
+    return documents_analysis
+
+
 def run_seo_report(generators):
     """Run SEO report creation if SEO_REPORT is enabled in settings."""
 
-    plugin_settings = get_plugin_settings(generators[0].context)
+    plugin_settings = resolve_plugin_settings(generators[0].context)
     if not plugin_settings["SEO_REPORT"]:
         return
 
-    seo_report = SEOReport()
-    documents_analysis = []
+    seo_report = SEOReport(
+        html_parser=get_html_parser(plugin_settings["SEO_HTML_PARSER"])
+    )
+    documents = []
     site_name = generators[0].context.get("SITENAME")
 
+    # The link graph is complete if the limits leave no document out
+    complete = True
+
     for generator in generators:
         if isinstance(generator, ArticlesGenerator):
             # Launch analysis for each article. User can limit this number.
-            for _, article in zip(
-                range(plugin_settings["SEO_ARTICLES_LIMIT"]), generator.articles
-            ):
-                analysis = seo_report.launch_analysis(document=article)
-                documents_analysis.append(analysis)
+            limit = plugin_settings["SEO_ARTICLES_LIMIT"]
+            documents.extend(islice(generator.articles, limit))
+            complete &= limit is None or len(generator.articles) <= limit
 
         if isinstance(generator, PagesGenerator):
             # Launch analysis each page. User can limit this number.
-            for _, page in zip(
-                range(plugin_settings["SEO_PAGES_LIMIT"]), generator.pages
-            ):
-                analysis = seo_report.launch_analysis(document=page)
-                documents_analysis.append(analysis)
+            limit = plugin_settings["SEO_PAGES_LIMIT"]
+            documents.extend(islice(generator.pages, limit))
+            complete &= limit is None or len(generator.pages) <= limit
 
-    seo_report.generate(site_name=site_name, documents_analysis=documents_analysis)
+    documents_analysis = _analyze_documents(
+        seo_report, documents, generators, plugin_settings
+    )
+
+    # Run once for the HTML report and the records, not to log its warnings twice
+    site_analysis = seo_report.analyze_site(
+        documents_analysis,
+        get_site_urls(generators),
+        listings=[(url, links) for url, _, links in get_site_listings(generators)],
+        complete=complete,
+    )
+    if complete:
+        # All articles and pages are in it : the sitemap can use it
+        generators[0].context[LINK_GRAPH_KEY] = site_analysis["link_graph_analysis"]
+
+    report_formats = plugin_settings["SEO_REPORT_FORMATS"]
+    if "html" in report_formats and plugin_settings["SEO_REPORT_SHARD_BY"]:
+        seo_report.generate_shards(
+            site_name=site_name,
+            documents_analysis=documents_analysis,
+            shard_by=plugin_settings["SEO_REPORT_SHARD_BY"],
+            shard_size=plugin_settings["SEO_REPORT_SHARD_SIZE"],
+            site_analysis=site_analysis,
+        )
+    elif "html" in report_formats:
+        seo_report.generate(
+            site_name=site_name,
+            documents_analysis=documents_analysis,
+            site_analysis=site_analysis,
+        )
+
+    seo_report.generate_records(
+        documents_analysis=documents_analysis,
+        formats=report_formats,
+        site_analysis=site_analysis,
+    )
+
+
+def _get_lastmod(document):
+    """
+    Return the datetime of the last change of a document : from the URL
+    state store if SEO_ENHANCER_URL_STATES is enabled, recording its state,
+    otherwise its modified date or its date.
+    """
+
+    lastmod = getattr(document, "modified", None) or getattr(document, "date", None)
+    if not _url_state_store.loaded:
+        return lastmod
+
+    return _url_state_store.update(
+        document.url, URLStateStore.hash_document(document), first_seen=lastmod
+    )
+
+
+def _get_link_graph(generators, plugin_settings):
+    """
+    Return the link graph of all the articles and pages of the site with its
+    listings : the one of the SEO report if it analyzed them all, otherwise
+    built from their analysis, with the SEO report settings.
+    """
+
+    context = generators[0].context
+    link_graph_analysis = context.get(LINK_GRAPH_KEY)
+    if link_graph_analysis is not None:
+        return link_graph_analysis
+
+    documents = []
+    for generator in generators:
+        if isinstance(generator, ArticlesGenerator):
+            documents.extend(generator.articles)
+        if isinstance(generator, PagesGenerator):
+            documents.extend(generator.pages)
+
+    seo_report = SEOReport(
+        html_parser=get_html_parser(plugin_settings["SEO_HTML_PARSER"])
+    )
+    documents_analysis = _analyze_documents(
+        seo_report, documents, generators, plugin_settings
+    )
+    link_graph_analysis = LinkGraphAnalyzer(
+        documents_analysis,
+        listings=[(url, links) for url, _, links in get_site_listings(generators)],
+        complete=True,
+    )
+    context[LINK_GRAPH_KEY] = link_graph_analysis
+
+    return link_graph_analysis
+
+
+def _get_sitemap_priorities(link_graph_analysis, urls):
+    """
+    Return the sitemap priority of each document of the :urls:, from the
+    rank of its internal link authority among them : 1.0 for the highest,
+    down to 0.1 for the lowest. Documents with the same authority get the
+    same priority.
+    """
+
+    # Authorities equal but for the precision of their computation are tied
+    authorities = {
+        url: round(link_graph_analysis.get_url_authority(url), 4) for url in urls
+    }
+    ranks = {
+        authority: rank
+        for rank, authority in enumerate(sorted(set(authorities.values())))
+    }
+    if len(ranks) == 1:
+        return dict.fromkeys(authorities, 1.0)
+
+    highest_rank = len(ranks) - 1
+    return {
+        url: round(
+            MIN_SITEMAP_PRIORITY
+            + (1 - MIN_SITEMAP_PRIORITY) * ranks[authority] / highest_rank,
+            1,
+        )
+        for url, authority in authorities.items()
+    }
 
 
 def run_robots_file(generators):
     """
     Run robots.txt file creation if SEO_ENHANCER
-    is enabled in settings.
+    is enabled in settings. With SEO_ENHANCER_SITEMAP, the sitemap
+    is written in the same pass, without the noindex and disallow documents.
     """
-    plugin_settings = get_plugin_settings(generators[0].context)
+    plugin_settings = resolve_plugin_settings(generators[0].context)
     if not plugin_settings["SEO_ENHANCER"]:
         return
 
-    seo_enhancer = SEOEnhancer()
+    seo_enhancer = SEOEnhancer(
+        html_parser=get_html_parser(plugin_settings["SEO_HTML_PARSER"])
+    )
     robots_rules = []
     output_path = generators[0].output_path
+    sitemap_url = plugin_settings["SEO_ENHANCER_SITEMAP_URL"]
+
+    cache_path = generators[0].context.get("CACHE_PATH", "cache")
+    if plugin_settings["SEO_ENHANCER_URL_STATES"]:
+        _url_state_store.load(os.path.join(cache_path, URL_STATES_FILE_NAME))
+
+    sitemap_writer = None
+    if plugin_settings["SEO_ENHANCER_SITEMAP"]:
+        sitemap_writer = SitemapWriter(
+            output_path=output_path,
+            siteurl=generators[0].context.get("SITEURL"),
+            compress=plugin_settings["SEO_ENHANCER_SITEMAP_GZIP"],
+        )
+    # Priorities are ranks among the sitemap documents : their entries
+    # are written once they are all known
+    sitemap_priority = plugin_settings["SEO_ENHANCER_SITEMAP_PRIORITY"]
+    sitemap_entries = []
+
+    # URLs of the noindex and disallow documents, kept out of search engines
+    unindexed_urls = set()
+
+    def _add_document(document):
+        document_metadata = seo_enhancer.populate_robots(document=document)
+        robots_rules.append(document_metadata)
+        lastmod = _get_lastmod(document)
+        if document_metadata["noindex"] or document_metadata["disallow"]:
+            unindexed_urls.add(document.url)
+        elif sitemap_priority:
+            sitemap_entries.append((document.url, lastmod))
+        elif sitemap_writer is not None:
+            sitemap_writer.add(document.url, lastmod=lastmod)
 
     for generator in generators:
         if isinstance(generator, ArticlesGenerator):
             for article in generator.articles:
-                article_metadata = seo_enhancer.populate_robots(document=article)
-                robots_rules.append(article_metadata)
+                _add_document(article)
 
         if isinstance(generator, PagesGenerator):
             for page in generator.pages:
-                page_metadata = seo_enhancer.populate_robots(document=page)
-                robots_rules.append(page_metadata)
+                _add_document(page)
+
+    if sitemap_entries:
+        sitemap_priorities = _get_sitemap_priorities(
+            _get_link_graph(generators, plugin_settings),
+            [url for url, _ in sitemap_entries],
+        )
+        for url, lastmod in sitemap_entries:
+            sitemap_writer.add(url, lastmod=lastmod, priority=sitemap_priorities[url])
+
+    if sitemap_writer is not None:
+        sitemap_index_url = sitemap_writer.close()
+        sitemap_url = sitemap_url or sitemap_index_url
+
+    if plugin_settings["SEO_ENHANCER_INDEXNOW_KEY"] is not None:
+        # All documents are recorded : the store knows the removed ones.
+        # Like the sitemap, changed URLs are only those to index.
+        changed_urls = [
+            url for url in _url_state_store.changed_urls if url not in unindexed_urls
+        ]
+        seo_enhancer.generate_indexnow(
+            key=plugin_settings["SEO_ENHANCER_INDEXNOW_KEY"],
+            urls=[*changed_urls, *_url_state_store.removed_urls],
+            output_path=output_path,
+            urls_path=os.path.join(cache_path, INDEXNOW_URLS_FILE_NAME),
+            siteurl=generators[0].context.get("SITEURL"),
+        )
+
+    site_urls = get_site_urls(generators)
+    compact = plugin_settings["SEO_ENHANCER_ROBOTS_COMPACT"]
 
     seo_enhancer.generate_robots(
         rules=robots_rules,
         output_path=output_path,
-        sitemap_url=plugin_settings["SEO_ENHANCER_SITEMAP_URL"],
+        sitemap_url=sitemap_url,
+        site_urls=site_urls if compact else None,
+    )
+    # Every URL of the site is matched against the written file
+    seo_enhancer.check_robots(
+        rules=robots_rules, output_path=output_path, site_urls=site_urls
     )
 
 
+def _get_previous_state(path, context, plugin_settings):
+    """
+    Return the state of the file recorded in the enhancement manifest
+    by the previous build. Return None if SEO_ENHANCER_MANIFEST is disabled.
+    """
+
+    if not plugin_settings["SEO_ENHANCER_MANIFEST"]:
+        return None
+
+    if not _enhancement_manifest.loaded:
+        _enhancement_manifest.load(
+            os.path.join(context.get("CACHE_PATH", "cache"), MANIFEST_FILE_NAME)
+        )
+
+    return _enhancement_manifest.get(os.path.relpath(path, context["OUTPUT_PATH"]))
+
+
+def _record_states(states, context):
+    """Record the new states of enhanced files in the enhancement manifest."""
+
+    for path, state in states.items():
+        _enhancement_manifest.record(
+            os.path.relpath(path, context["OUTPUT_PATH"]), state
+        )
+
+
 def run_html_enhancer(path, context):
     """Run HTML enhancements if SEO_ENHANCER is enabled in settings."""
-    plugin_settings = get_plugin_settings(context)
-
-    seo_enhancer_setting = plugin_settings["SEO_ENHANCER"]
-    if not seo_enhancer_setting:
+    plugin_settings = resolve_plugin_settings(context)
+    if not plugin_settings["SEO_ENHANCER"]:
         return
 
     open_graph_setting = plugin_settings["SEO_ENHANCER_OPEN_GRAPH"]
     twitter_cards_setting = plugin_settings["SEO_ENHANCER_TWITTER_CARDS"]
 
-    if (open_graph_setting or twitter_cards_setting) and not seo_enhancer_setting:
-        raise Exception(
-            "You must enable SEO_ENHANCER setting to use social medias features."
-        )
-
-    if twitter_cards_setting and not open_graph_setting:
-        raise Exception("You must enable Open Graph feature to use Twitter Cards.")
-
     content_file = None
     if context.get("article"):
         content_file = context["article"]
@@ -161,18 +836,93 @@ def run_html_enhancer(path, context):
         content_file = context["page"]
 
     if content_file:
-        seo_enhancer = SEOEnhancer()
+        seo_enhancer = SEOEnhancer(
+            html_parser=get_html_parser(plugin_settings["SEO_HTML_PARSER"])
+        )
         html_enhancements = seo_enhancer.launch_html_enhancer(
             file=content_file,
             output_path=context.get("OUTPUT_PATH"),
             path=path,
             open_graph=open_graph_setting,
             twitter_cards=twitter_cards_setting,
+            lastmod=_url_state_store.get_lastmod(content_file.url),
         )
-        seo_enhancer.add_html_to_file(
+        if plugin_settings["SEO_ENHANCER_DEFERRED"]:
+            # Files are enhanced all together when the build is finalized
+            _deferred_html_enhancements[path] = html_enhancements
+            return
+
+        previous_state = _get_previous_state(path, context, plugin_settings)
+
+        if plugin_settings["SEO_ENHANCER_BACKGROUND"]:
+            if not _background_html_enhancer.started:
+                _background_html_enhancer.start(
+                    seo_enhancer=seo_enhancer,
+                    threads=plugin_settings["SEO_ENHANCER_BACKGROUND_THREADS"],
+                    queue_size=plugin_settings["SEO_ENHANCER_BACKGROUND_QUEUE_SIZE"],
+                )
+            _background_html_enhancer.submit(
+                enhancements=html_enhancements,
+                path=path,
+                previous_state=previous_state,
+            )
+            return
+
+        state = seo_enhancer.add_html_to_file(
             enhancements=html_enhancements,
             path=path,
+            previous_state=previous_state,
         )
+        if state is not None:
+            _record_states({path: state}, context)
+
+
+def run_deferred_html_enhancer(pelican):
+    """Run HTML enhancements recorded while SEO_ENHANCER_DEFERRED is enabled."""
+
+    if not _deferred_html_enhancements:
+        return
+
+    plugin_settings = resolve_plugin_settings(pelican.settings)
+    enhancements_by_path = dict(_deferred_html_enhancements)
+    _deferred_html_enhancements.clear()
+
+    previous_states = None
+    if plugin_settings["SEO_ENHANCER_MANIFEST"]:
+        previous_states = {
+            path: _get_previous_state(path, pelican.settings, plugin_settings)
+            for path in enhancements_by_path
+        }
+
+    seo_enhancer = SEOEnhancer(
+        html_parser=get_html_parser(plugin_settings["SEO_HTML_PARSER"])
+    )
+    states = seo_enhancer.add_html_to_files(
+        enhancements_by_path=enhancements_by_path,
+        processes=plugin_settings["SEO_ENHANCER_PROCESSES"],
+        states=previous_states,
+    )
+    if states:
+        _record_states(states, pelican.settings)
+
+
+def join_background_html_enhancer(pelican):
+    """Wait for HTML enhancements queued while SEO_ENHANCER_BACKGROUND is enabled."""
+
+    states = _background_html_enhancer.join()
+    _record_states(states, pelican.settings)
+
+
+def finalize_html_enhancer(pelican):
+    """
+    Finish the HTML enhancements left for the end of the build,
+    then save the enhancement manifest and the URL states.
+    """
+
+    run_deferred_html_enhancer(pelican)
+    join_background_html_enhancer(pelican)
+    _enhancement_manifest.save()
+    _url_state_store.save()
 
 
 def register():
@@ -186,3 +936,4 @@ def register():
     # Seo enhancer
     signals.all_generators_finalized.connect(run_robots_file)
     signals.content_written.connect(run_html_enhancer)
+    signals.finalized.connect(finalize_html_enhancer)
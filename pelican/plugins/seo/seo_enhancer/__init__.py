@@ -1,26 +1,50 @@
 """Improve SEO technical for each article and page : HTML code and robots.txt file."""
 
-import json
+from concurrent.futures import ProcessPoolExecutor
 import logging
 import os
 
-from bs4 import BeautifulSoup, NavigableString
+from bs4 import BeautifulSoup
 
+from pelican.plugins.seo.internal_url import get_internal_url
+
+from .enhancement_manifest import EnhancementManifest
+from .head_injector import HeadInjector
 from .html_enhancer import HTMLEnhancer
+from .robots_compactor import compact_robots_urls
 from .robots_file_creator import RobotsFileCreator
+from .robots_matcher import RobotsMatcher
+from .sitemap_writer import get_absolute_url
 
 logger = logging.getLogger(__name__)
 
+# robots.txt directive of each rule of populate_robots
+ROBOTS_DIRECTIVES = {"noindex": "Noindex", "disallow": "Disallow"}
+# Number of conflicting URLs listed in the logs
+CONFLICTS_LOG_LIMIT = 10
+
 
 class SEOEnhancer:
     """Improve SEO for each article and page : HTML code and robots.txt file."""
 
+    def __init__(self, html_parser="html.parser"):
+        self._html_parser = html_parser
+
     def launch_html_enhancer(
-        self, file, output_path, path, open_graph=False, twitter_cards=False
+        self,
+        file,
+        output_path,
+        path,
+        open_graph=False,
+        twitter_cards=False,
+        *,
+        lastmod=None,
     ):
         """
         Call HTMLEnhancer for each article and page.
         Return a dict with all HTML enhancements.
+        :lastmod: is the last change of the document, recorded by the
+        URL state store.
         """
 
         html_enhancer = HTMLEnhancer(
@@ -29,6 +53,8 @@ class SEOEnhancer:
             path=path,
             open_graph=open_graph,
             twitter_cards=twitter_cards,
+            html_parser=self._html_parser,
+            lastmod=lastmod,
         )
 
         html_enhancements = {
@@ -69,80 +95,254 @@ class SEOEnhancer:
             "disallow": robots_file.get_disallow,
         }
 
-    def generate_robots(self, rules, output_path, sitemap_url=None):
-        """Create robots.txt, with noindex and disallow rules for each document URL."""
+    def _get_robots_lines(self, rules, site_urls=None):
+        """
+        Yield the noindex and disallow lines of the rules of each document URL.
+        With :site_urls:, directories whose URLs all have the same rule get a
+        single line, yielded in place of the first one it replaces.
+        """
+
+        rule_paths = {}
+        if site_urls is not None:
+            for rule_name in ROBOTS_DIRECTIVES:
+                rule_paths[rule_name] = compact_robots_urls(
+                    [rule["document_url"] for rule in rules if rule.get(rule_name)],
+                    site_urls,
+                )
+
+        directory_lines = set()
+        for rule in rules:
+            for rule_name, directive in ROBOTS_DIRECTIVES.items():
+                if not rule.get(rule_name):
+                    continue
+
+                url = rule.get("document_url")
+                path = rule_paths.get(rule_name, {}).get(url, url)
+                # Crawlers only match paths from the site root
+                line = f"{directive}: /{path.lstrip('/')}"
+                if path != url:
+                    if line in directory_lines:
+                        continue
+                    directory_lines.add(line)
+                yield line
+
+    def generate_robots(self, rules, output_path, sitemap_url=None, site_urls=None):
+        """
+        Create robots.txt, with noindex and disallow rules for each document URL.
+        With the :site_urls: returned by get_site_urls, rules are compacted :
+        a directory whose URLs all have the same rule gets a single line.
+        """
         if not os.path.isdir(output_path):
             os.mkdir(output_path)
 
         robots_path = os.path.join(output_path, "robots.txt")
 
+        written_size = 0
         with open(robots_path, "w+") as robots_file:
             robots_file.write("User-agent: *")
-            for rule in rules:
-                if rule.get("noindex"):
-                    robots_file.write("\n" + "Noindex: " + rule.get("document_url"))
-                if rule.get("disallow"):
-                    robots_file.write("\n" + "Disallow: " + rule.get("document_url"))
+            for line in self._get_robots_lines(rules, site_urls):
+                robots_file.write("\n" + line)
+                written_size += len(f"\n{line}".encode())
             if sitemap_url:
                 robots_file.write("\n" + "Sitemap: " + sitemap_url)
 
         logger.info("SEO plugin - SEO Enhancement: robots.txt file created")
 
-    @staticmethod
-    def _add_meta_tag(soup, attr_name, prefix, name, content):
-        tag = soup.new_tag(
-            name="meta",
-            attrs={attr_name: prefix + ":" + name, "content": content},
+        if site_urls is not None:
+            full_size = sum(
+                len(f"\n{line}".encode()) for line in self._get_robots_lines(rules)
+            )
+            logger.info(
+                "SEO plugin - SEO Enhancement: robots.txt rules compacted, "
+                f"{full_size - written_size} bytes saved"
+            )
+
+    def check_robots(self, rules, output_path, site_urls):
+        """
+        Check the robots.txt file written by generate_robots in :output_path:
+        against the rules of each document URL. Each of the :site_urls:
+        returned by get_site_urls is matched like crawlers do.
+        Log and return the conflicts, as (directive, URL) lists : "unexpected"
+        for URLs ruled without a rule of their own, "missing" for URLs
+        whose rule doesn't apply.
+        """
+
+        with open(os.path.join(output_path, "robots.txt")) as robots_file:
+            robots_matcher = RobotsMatcher(robots_file.read())
+
+        is_ruled = {
+            "noindex": robots_matcher.is_noindex,
+            "disallow": lambda path: not robots_matcher.is_allowed(path),
+        }
+        conflicts = {"unexpected": [], "missing": []}
+        for rule_name, directive in ROBOTS_DIRECTIVES.items():
+            ruled_urls = {
+                get_internal_url(rule["document_url"], "")
+                for rule in rules
+                if rule.get(rule_name)
+            }
+            for url in sorted(ruled_urls.union(site_urls)):
+                ruled = is_ruled[rule_name](f"/{url}")
+                if ruled and url not in ruled_urls:
+                    conflicts["unexpected"].append((directive, url))
+                elif not ruled and url in ruled_urls:
+                    conflicts["missing"].append((directive, url))
+
+        for conflict, message in (
+            ("unexpected", "rules applying to other URLs"),
+            ("missing", "rules not applying to their URL"),
+        ):
+            if conflicts[conflict]:
+                urls = ", ".join(
+                    f"{directive} /{url}"
+                    for directive, url in conflicts[conflict][:CONFLICTS_LOG_LIMIT]
+                )
+                logger.warning(
+                    f"SEO plugin - SEO Enhancement: robots.txt has {message} "
+                    f"({len(conflicts[conflict])}): {urls}"
+                )
+
+        return conflicts
+
+    def generate_indexnow(self, key, urls, output_path, urls_path, siteurl=None):
+        """
+        Create the IndexNow key file, "<key>.txt" at the site root, and the
+        list of :urls: to submit in :urls_path:, one absolute URL by line.
+        """
+
+        os.makedirs(output_path, exist_ok=True)
+        with open(os.path.join(output_path, f"{key}.txt"), "w") as key_file:
+            key_file.write(key)
+
+        os.makedirs(os.path.dirname(urls_path) or ".", exist_ok=True)
+        with open(urls_path, "w", encoding="utf8") as urls_file:
+            for url in urls:
+                urls_file.write(get_absolute_url(siteurl, url) + "\n")
+
+        logger.info(
+            f"SEO plugin - SEO Enhancement: IndexNow key file created, "
+            f"{len(urls)} URLs to submit"
         )
-        soup.head.append(tag)
-        soup.head.append(NavigableString("\n"))
 
-    def add_html_to_file(self, enhancements, path):
-        """Open HTML file, add enhancements with bs4 and create the new HTML files."""
+    def _add_html_with_bs4(self, enhancements, html_content):
+        """
+        Add enhancements with bs4 and return the new HTML content.
+        Used as a fallback when the document has no closing </head> tag.
+        Return None if the document has no <head> at all.
+        """
+
+        soup = BeautifulSoup(
+            html_content, features=self._html_parser, preserve_whitespace_tags={"html"}
+        )
+        if not soup.head:
+            return None
+
+        block = HeadInjector(enhancements).render_block(str(soup.head))
+        # The block is a fragment: html.parser doesn't wrap it in <html><body>
+        soup.head.append(BeautifulSoup(block, features="html.parser"))
+
+        return str(soup)
+
+    def add_html_to_file(self, enhancements, path, previous_state=None):
+        """
+        Open HTML file, splice enhancements at the end of <head>
+        and create the new HTML file.
+        The rest of the document is copied as is. Documents without
+        a closing </head> tag are enhanced with bs4 instead.
 
-        with open(path, encoding="utf8") as html_file:
+        :previous_state: state of the file recorded in the enhancement manifest
+        by the previous build, {} if unknown. When given, return the new state.
+        If neither the HTML nor the enhancements changed, the previous
+        modification time is restored so that the file looks untouched
+        to deployment tools like rsync.
+        """
+
+        # newline="" keeps line endings untouched, both when reading and writing
+        with open(path, encoding="utf8", newline="") as html_file:
             html_content = html_file.read()
-            soup = BeautifulSoup(
-                html_content, features="html.parser", preserve_whitespace_tags={"html"}
-            )
 
-        canonical_tag = soup.new_tag(
-            "link", rel="canonical", href=enhancements.get("canonical_tag")
+        enhanced_content = HeadInjector(enhancements).inject(html_content)
+        if enhanced_content is None:
+            enhanced_content = self._add_html_with_bs4(enhancements, html_content)
+
+        if enhanced_content is None:
+            logger.warning(f"SEO plugin - SEO Enhancement: No <head> found in {path}")
+            return None
+
+        # Already enhanced the same way, by a previous run
+        if enhanced_content != html_content:
+            with open(path, "w", encoding="utf8", newline="") as html_file:
+                html_file.write(enhanced_content)
+
+        logger.info(f"SEO plugin - SEO Enhancement: Done for {path}")
+
+        if previous_state is None:
+            return None
+
+        state = {
+            "source": EnhancementManifest.hash_content(html_content),
+            "enhancements": EnhancementManifest.hash_enhancements(enhancements),
+        }
+        unchanged = previous_state.get("source") == state["source"] and (
+            previous_state.get("enhancements") == state["enhancements"]
         )
-        soup.head.append(canonical_tag)
-        soup.head.append(NavigableString("\n"))
-
-        schemas = [e for e in enhancements if e.endswith("_schema")]
-        for schema in schemas:
-            schema_script = soup.new_tag("script", type="application/ld+json")
-            # Json dumps permit to keep dict double quotes instead of simples
-            # Google valids schema only with double quotes
-            schema_script.append(json.dumps(enhancements[schema], ensure_ascii=False))
-            soup.head.append(schema_script)
-            soup.head.append(NavigableString("\n"))
-
-        # Let's add first Twitter Cards tags in the HTML if feature is enabled
-        if "twitter_cards" in enhancements:
-            for tw_property, tw_content in enhancements["twitter_cards"].items():
-                self._add_meta_tag(soup, "name", "twitter", tw_property, tw_content)
-
-        if "open_graph" in enhancements:
-            for og_property, og_content in enhancements["open_graph"].items():
-                self._add_meta_tag(soup, "property", "og", og_property, og_content)
-
-        if "open_graph_article" in enhancements:
-            for og_property, og_content in enhancements["open_graph_article"].items():
-                if isinstance(og_content, str):
-                    self._add_meta_tag(
-                        soup, "property", "article", og_property, og_content
+        if unchanged:
+            os.utime(path, ns=(os.stat(path).st_atime_ns, previous_state["mtime_ns"]))
+        state["mtime_ns"] = os.stat(path).st_mtime_ns
+
+        return state
+
+    def add_html_to_files(self, enhancements_by_path, processes=None, states=None):
+        """
+        Add enhancements to many HTML files, spreading the work across
+        a pool of processes. Each file is enhanced exactly like add_html_to_file.
+        :processes: defaults to the number of CPUs, 1 disables the pool.
+        :states: previous states of the files, by path. When given,
+        return the new states, by path.
+        """
+
+        if not enhancements_by_path:
+            return {} if states is not None else None
+
+        paths = list(enhancements_by_path)
+        enhancements = [enhancements_by_path[path] for path in paths]
+        previous_states = [
+            states.get(path, {}) if states is not None else None for path in paths
+        ]
+
+        processes = min(processes or os.cpu_count() or 1, len(paths))
+        if processes == 1:
+            new_states = [
+                self.add_html_to_file(
+                    enhancements=html_enhancements,
+                    path=path,
+                    previous_state=previous_state,
+                )
+                for path, html_enhancements, previous_state in zip(
+                    paths, enhancements, previous_states
+                )
+            ]
+        else:
+            # Send files by batches to limit inter-process communication
+            chunksize = max(1, len(paths) // (processes * 4))
+            with ProcessPoolExecutor(max_workers=processes) as executor:
+                # Consume the results to raise the exceptions of the workers
+                new_states = list(
+                    executor.map(
+                        self.add_html_to_file,
+                        enhancements,
+                        paths,
+                        previous_states,
+                        chunksize=chunksize,
                     )
-                elif isinstance(og_content, list):
-                    for element in og_content:
-                        self._add_meta_tag(
-                            soup, "property", "article", og_property, element
-                        )
+                )
 
-        with open(path, "w", encoding="utf8") as html_file:
-            html_file.write(str(soup))
+            logger.info(
+                f"SEO plugin - SEO Enhancement: {len(paths)} files enhanced "
+                f"with {processes} processes"
+            )
 
-        logger.info(f"SEO plugin - SEO Enhancement: Done for {path}")
+        if states is None:
+            return None
+
+        return dict(zip(paths, new_states))
@@ -0,0 +1,104 @@
+"""
+Background enhancer : add HTML enhancements to files from background threads,
+while Pelican keeps rendering and writing the next ones.
+"""
+
+import logging
+from queue import Queue
+from threading import Thread
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundHTMLEnhancer:
+    """
+    Queue HTML enhancements and apply them in background threads.
+    The queue is bounded: submit() blocks when it is full, so Pelican
+    can't get too far ahead of the enhancement work.
+    """
+
+    def __init__(self):
+        self._seo_enhancer = None
+        self._queue = None
+        self._threads = []
+        self._errors = []
+        self._states = {}
+
+    @property
+    def started(self):
+        """Return True if the background threads are running."""
+
+        return bool(self._threads)
+
+    def start(self, seo_enhancer, threads=1, queue_size=100):
+        """
+        Start the background threads with a queue of :queue_size: files,
+        enhanced by the given SEOEnhancer.
+        """
+
+        self._seo_enhancer = seo_enhancer
+        self._queue = Queue(maxsize=queue_size)
+        self._errors = []
+        self._states = {}
+        self._threads = [
+            Thread(target=self._work, name=f"seo-enhancer-{i}", daemon=True)
+            for i in range(threads)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def _work(self):
+        """Enhance queued files until a None sentinel is received."""
+
+        while True:
+            job = self._queue.get()
+            try:
+                if job is None:
+                    return
+                state = self._seo_enhancer.add_html_to_file(**job)
+                if state is not None:
+                    self._states[job["path"]] = state
+            except Exception as error:
+                logger.exception(
+                    f"SEO plugin - SEO Enhancement: Failed for {job['path']}"
+                )
+                self._errors.append(error)
+            finally:
+                self._queue.task_done()
+
+    def submit(self, enhancements, path, previous_state=None):
+        """
+        Queue a file to enhance. Block while the queue is full.
+        See SEOEnhancer.add_html_to_file for :previous_state:.
+        """
+
+        self._queue.put(
+            {
+                "enhancements": enhancements,
+                "path": path,
+                "previous_state": previous_state,
+            }
+        )
+
+    def join(self):
+        """
+        Wait for all queued files to be enhanced and stop the threads.
+        Return the new states of the files submitted with a previous state, by path.
+        Raise the first error met by the threads, if any.
+        """
+
+        if not self.started:
+            return {}
+
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+
+        self._threads = []
+        errors, self._errors = self._errors, []
+        states, self._states = self._states, {}
+        if errors:
+            raise errors[0]
+
+        return states
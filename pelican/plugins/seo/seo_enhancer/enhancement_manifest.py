@@ -0,0 +1,108 @@
+"""
+Enhancement manifest : remember, from one build to the next, the hashes
+of each HTML file before enhancement and of its enhancements.
+"""
+
+import hashlib
+import json
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+
+class EnhancementManifest:
+    """
+    Persistent manifest of enhanced HTML files, keyed by path.
+    Each entry is a state dict.
+
+    State :
+
+        {
+            "source": :hash of the HTML before enhancement:,
+            "enhancements": :hash of the enhancements:,
+            "mtime_ns": :modification time of the enhanced file:,
+        }
+
+    Entries of files that were not enhanced during the build are pruned on save.
+    """
+
+    VERSION = 1
+
+    def __init__(self):
+        self._path = None
+        self._previous_states = {}
+        self._states = {}
+
+    @property
+    def loaded(self):
+        """Return True if the manifest has been loaded from a file."""
+
+        return self._path is not None
+
+    @staticmethod
+    def hash_content(content):
+        """Return the hash of an HTML content."""
+
+        return hashlib.blake2b(content.encode("utf8"), digest_size=16).hexdigest()
+
+    @staticmethod
+    def hash_enhancements(enhancements):
+        """Return the hash of an enhancements dict, whatever the keys order."""
+
+        serialized = json.dumps(
+            enhancements, sort_keys=True, ensure_ascii=False, default=str
+        )
+        return hashlib.blake2b(serialized.encode("utf8"), digest_size=16).hexdigest()
+
+    def load(self, path):
+        """Load the manifest file. A missing or invalid file gives an empty one."""
+
+        self._path = path
+        self._previous_states = {}
+        self._states = {}
+
+        try:
+            with open(path, encoding="utf8") as manifest_file:
+                manifest = json.load(manifest_file)
+        except (OSError, ValueError):
+            return
+
+        if manifest.get("version") == self.VERSION:
+            self._previous_states = manifest.get("files", {})
+
+    def get(self, key):
+        """Return the state recorded by the previous build, or an empty dict."""
+
+        return self._previous_states.get(key, {})
+
+    def record(self, key, state):
+        """Record the state of a file enhanced during this build."""
+
+        if state:
+            self._states[key] = state
+
+    def save(self):
+        """Write the manifest file, with only the files enhanced during this build."""
+
+        if not self.loaded:
+            return
+
+        pruned = len(self._previous_states.keys() - self._states.keys())
+
+        os.makedirs(os.path.dirname(self._path) or ".", exist_ok=True)
+        with open(self._path, "w", encoding="utf8") as manifest_file:
+            json.dump(
+                {"version": self.VERSION, "files": self._states},
+                manifest_file,
+                sort_keys=True,
+            )
+
+        logger.info(
+            f"SEO plugin - SEO Enhancement: manifest saved with "
+            f"{len(self._states)} files, {pruned} removed"
+        )
+
+        self._path = None
+        self._previous_states = {}
+        self._states = {}
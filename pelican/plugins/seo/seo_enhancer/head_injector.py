@@ -0,0 +1,164 @@
+"""
+Head injector : render HTML enhancements as tags and splice them
+right before the closing </head> tag, without parsing the whole document.
+"""
+
+from html import escape
+import json
+import re
+
+# The closing </head> tag, in group 2, after the comments and the text of
+# script, style and title elements, where "</head>" is not a tag.
+# Unclosed ones run to the end of the document.
+HEAD_CLOSING_TAG = re.compile(
+    r"<!--.*?(?:-->|\Z)|<(script|style|title)\b[^>]*>.*?(?:</\1\s*>|\Z)"
+    r"|(</head\s*>)",
+    re.IGNORECASE | re.DOTALL,
+)
+
+# Comments surrounding the injected tags, to find them back on the next run
+BLOCK_START = "<!-- pelican-seo -->"
+BLOCK_END = "<!-- /pelican-seo -->"
+
+# Equivalent tags that may already be provided by the theme
+CANONICAL_LINK = re.compile(r"<link\b[^>]*\brel\s*=\s*[\"']?canonical\b", re.IGNORECASE)
+SOCIAL_META = re.compile(
+    r"<meta\b[^>]*\b(?:property|name)\s*=\s*[\"']?((?:og|twitter|article):[\w:]+)",
+    re.IGNORECASE,
+)
+JSON_LD_SCRIPT = re.compile(
+    r"<script\b[^>]*\btype\s*=\s*[\"']?application/ld\+json[^>]*>(.*?)</script",
+    re.IGNORECASE | re.DOTALL,
+)
+JSON_LD_TYPE = re.compile(r"\"@type\"\s*:\s*\"([^\"]+)\"")
+
+
+class HeadInjector:
+    """
+    Render HTML enhancements and insert them at the end of the <head> element.
+    The rest of the document is copied as is.
+
+    Injected tags are surrounded by BLOCK_START and BLOCK_END comments, so that
+    running the injector again replaces them instead of adding them twice.
+    Tags the theme already provides (canonical link, JSON-LD schema of the same
+    type, Open Graph or Twitter Cards property) are not added.
+    """
+
+    def __init__(self, enhancements):
+        self._enhancements = enhancements
+
+    @staticmethod
+    def _escape_attribute(value):
+        """Escape an attribute value the same way bs4 minimal formatter does."""
+
+        return escape(str(value), quote=False).replace('"', "&quot;")
+
+    def _meta_tag(self, attr_name, prefix, name, content):
+        return (
+            f'<meta content="{self._escape_attribute(content)}" '
+            f'{attr_name}="{prefix}:{name}"/>'
+        )
+
+    @staticmethod
+    def _find_existing_tags(head_content):
+        """
+        Return what the given <head> content already provides : canonical link,
+        JSON-LD schema types and social meta properties.
+        """
+
+        schema_types = set()
+        for script in JSON_LD_SCRIPT.finditer(head_content):
+            schema_types.update(JSON_LD_TYPE.findall(script.group(1)))
+
+        return {
+            "canonical": bool(CANONICAL_LINK.search(head_content)),
+            "schema_types": schema_types,
+            "properties": {name.lower() for name in SOCIAL_META.findall(head_content)},
+        }
+
+    def render_tags(self, head_content=""):
+        """
+        Return the list of tags to add, in the same order
+        and with the same markup as the bs4 enhancement.
+        Tags already provided by :head_content: are skipped.
+        """
+
+        existing = self._find_existing_tags(head_content)
+
+        def _add_meta_tags(tags, attr_name, prefix, properties):
+            for name, content in properties.items():
+                if f"{prefix}:{name}".lower() in existing["properties"]:
+                    continue
+                # A list gives one tag per element, like article tags
+                for element in content if isinstance(content, list) else [content]:
+                    tags.append(self._meta_tag(attr_name, prefix, name, element))
+
+        tags = []
+
+        if not existing["canonical"]:
+            canonical_url = self._escape_attribute(self._enhancements["canonical_tag"])
+            tags.append(f'<link href="{canonical_url}" rel="canonical"/>')
+
+        schemas = [e for e in self._enhancements if e.endswith("_schema")]
+        for schema in schemas:
+            if self._enhancements[schema].get("@type") in existing["schema_types"]:
+                continue
+            # Json dumps permit to keep dict double quotes instead of simples
+            # Google valids schema only with double quotes.
+            # "</" is escaped so that a value can't close the script element.
+            schema_json = json.dumps(
+                self._enhancements[schema], ensure_ascii=False
+            ).replace("</", "<\\/")
+            tags.append(f'<script type="application/ld+json">{schema_json}</script>')
+
+        if "twitter_cards" in self._enhancements:
+            _add_meta_tags(tags, "name", "twitter", self._enhancements["twitter_cards"])
+
+        if "open_graph" in self._enhancements:
+            _add_meta_tags(tags, "property", "og", self._enhancements["open_graph"])
+
+        if "open_graph_article" in self._enhancements:
+            _add_meta_tags(
+                tags, "property", "article", self._enhancements["open_graph_article"]
+            )
+
+        return tags
+
+    def render_block(self, head_content=""):
+        """Return the tags to add surrounded by the block comments."""
+
+        tags = self.render_tags(head_content)
+        return "".join(tag + "\n" for tag in [BLOCK_START, *tags, BLOCK_END])
+
+    def inject(self, html_content):
+        """
+        Return the HTML content with the enhancements inserted before </head>,
+        or in place of the ones injected by a previous run.
+        Return None if the document has no closing </head> tag.
+        """
+
+        for match in HEAD_CLOSING_TAG.finditer(html_content):
+            if match.group(2):
+                offset = match.start(2)
+                break
+        else:
+            return None
+
+        head_content = html_content[:offset]
+
+        block_start = head_content.find(BLOCK_START)
+        block_end = head_content.find(BLOCK_END, block_start)
+        if block_start == -1 or block_end == -1:
+            block_start = block_end = offset
+        else:
+            block_end += len(BLOCK_END)
+            # The line break added after the block end comment
+            if html_content.startswith("\n", block_end):
+                block_end += 1
+            head_content = head_content[:block_start] + head_content[block_end:]
+
+        return (
+            html_content[:block_start]
+            + self.render_block(head_content)
+            + html_content[block_end:]
+        )
@@ -11,12 +11,12 @@ from .open_graph import OpenGraph, OpenGraphArticle
 from .twitter_cards import TwitterCards
 
 
-def _get_plain_text_summary(metadata):
+def _get_plain_text_summary(metadata, html_parser="html.parser"):
     """Get content from summary, without HTML tags."""
 
     soup = BeautifulSoup(
         metadata.get("summary", ""),
-        "html.parser",
+        html_parser,
     )
     text_summary = soup.get_text().strip()
     return text_summary
@@ -25,7 +25,17 @@ def _get_plain_text_summary(metadata):
 class HTMLEnhancer:
     """HTML Enhancer : get instances of HTML enhancements."""
 
-    def __init__(self, file, output_path, path, open_graph=False, twitter_cards=False):
+    def __init__(
+        self,
+        file,
+        output_path,
+        path,
+        open_graph=False,
+        twitter_cards=False,
+        *,
+        html_parser="html.parser",
+        lastmod=None,
+    ):
         _file_type = "website"  # Default value
         if isinstance(file, Article):
             _file_type = "article"
@@ -83,13 +93,14 @@ class HTMLEnhancer:
                 title=_metadata.get("og_title") or _title,
                 description=_metadata.get("og_description")
                 or _metadata.get("description")
-                or _get_plain_text_summary(_metadata),
+                or _get_plain_text_summary(_metadata, html_parser),
                 image=_metadata.get("og_image") or _image,
                 locale=_settings.get("LOCALE"),
             )
 
             if isinstance(file, Article):
-                _modified = getattr(file, "modified", None)
+                # The last change recorded by the URL state store comes first
+                _modified = lastmod or getattr(file, "modified", None)
                 _author_profiles = _settings.get(
                     "SEO_ENHANCER_AUTHOR_FACEBOOK_PROFILES", {}
                 )
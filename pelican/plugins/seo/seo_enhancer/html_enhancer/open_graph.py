@@ -107,7 +107,8 @@ class OpenGraphArticle:
         if self.category is not None:
             tags["section"] = self.category
         if self.tags is not None and self.tags:
-            tags["tags"] = self.tags
+            # Pelican Tag objects are turned into plain strings
+            tags["tags"] = [str(tag) for tag in self.tags]
         if self.author is not None:
             tags["author"] = self.author
         return tags
@@ -0,0 +1,52 @@
+"""Compact robots.txt rules, with a single rule for fully ruled directories."""
+
+from pelican.plugins.seo.internal_url import get_internal_url
+
+# Key of the counters in the trie nodes : other keys are path segments
+COUNTS = None
+SITE_COUNT = 0
+RULED_COUNT = 1
+
+
+def _count_paths(trie, paths, counter):
+    """Increment the :counter: of each directory of the :paths: in the :trie:."""
+
+    for path in paths:
+        node = trie
+        for segment in path.split("/")[:-1]:
+            node = node.setdefault(segment, {COUNTS: [0, 0]})
+            node[COUNTS][counter] += 1
+
+
+def compact_robots_urls(urls, site_urls):
+    """
+    Return the robots.txt rule path of each of the document :urls:, by URL.
+    URLs are indexed in a trie of directories, with the number of
+    :site_urls: and of ruled :urls: in each one. When all the site URLs
+    in a directory are ruled, the rule is the directory : "category/"
+    instead of each "category/..." URL. Other URLs keep their own rule.
+    The site root is never used as a rule.
+    """
+
+    ruled_urls = {url: get_internal_url(url, "") for url in urls}
+    ruled_paths = set(ruled_urls.values())
+
+    trie = {}
+    _count_paths(trie, set(site_urls) | ruled_paths, SITE_COUNT)
+    _count_paths(trie, ruled_paths, RULED_COUNT)
+
+    rules = {}
+    for url, path in ruled_urls.items():
+        rules[url] = url
+        node = trie
+        directory = ""
+        for segment in path.split("/")[:-1]:
+            node = node[segment]
+            directory += f"{segment}/"
+            site_count, ruled_count = node[COUNTS]
+            # A directory rule for a single URL saves nothing
+            if ruled_count == site_count and ruled_count > 1:
+                rules[url] = directory
+                break
+
+    return rules
@@ -0,0 +1,186 @@
+"""Match URL paths against the rules of a robots.txt file."""
+
+import re
+
+# Key of the rules ending in a trie node : other keys are characters
+RULE = ""
+
+
+def _get_trie(patterns):
+    """Return the trie of characters of :patterns:, with RULE at their end."""
+
+    trie = {}
+    for pattern, rule in patterns:
+        node = trie
+        for character in pattern:
+            node = node.setdefault(character, {})
+        node[RULE] = rule
+
+    return trie
+
+
+def _get_trie_expression(node):
+    """
+    Return the regular expression matching the longest pattern of a trie
+    :node: starting a path. Children start with different characters, so
+    a single one can match, and continuing to a longer pattern is tried first.
+    """
+
+    branches = []
+    for character, child in node.items():
+        if character == RULE:
+            continue
+        # Chains of characters without rule nor branch are a single literal
+        literal, descendant = character, child
+        while len(descendant) == 1 and RULE not in descendant:
+            next_character, descendant = next(iter(descendant.items()))
+            literal += next_character
+        branches.append(re.escape(literal) + _get_trie_expression(descendant))
+
+    if not branches:
+        return ""
+    expression = f"(?:{'|'.join(branches)})"
+    return f"{expression}?" if RULE in node else expression
+
+
+class RobotsRules:
+    """
+    Set of robots.txt rules, returning the longest pattern matching a path.
+    Patterns without wildcards are indexed in a trie of characters, compiled
+    to a single regular expression : a path is matched in one pass whatever
+    the number of rules. Patterns with "*" or "$" wildcards are indexed in
+    a trie by the characters before their first wildcard : the patterns of
+    each start of the path are alternatives of a single expression.
+    """
+
+    def __init__(self):
+        # Value of each pattern without wildcards
+        self._rules = {}
+        # (length, value, expression) of the wildcard patterns, by prefix
+        self._patterns = {}
+        # Compiled on the first match following an addition
+        self._rules_expression = None
+        self._patterns_trie = None
+
+    def add(self, pattern, value):
+        """
+        Add a rule :pattern: with its :value:. If another rule has the same
+        pattern, the highest value is kept : Allow (True) wins over Disallow.
+        """
+
+        prefix = pattern.split("*", 1)[0].split("$", 1)[0]
+        if prefix == pattern:
+            self._rules[pattern] = max(self._rules.get(pattern, value), value)
+            self._rules_expression = None
+            return
+
+        expression = ".*".join(map(re.escape, pattern.rstrip("$").split("*")))
+        if pattern.endswith("$"):
+            expression += r"\Z"
+        self._patterns.setdefault(prefix, []).append((len(pattern), value, expression))
+        self._patterns_trie = None
+
+    def _compile(self):
+        """Compile the rules and the patterns added since the last match."""
+
+        if self._rules_expression is None:
+            self._rules_expression = re.compile(
+                _get_trie_expression(_get_trie((rule, True) for rule in self._rules))
+            )
+
+        if self._patterns_trie is None:
+            compiled_patterns = {}
+            for prefix, patterns in self._patterns.items():
+                # The first alternative matching wins : sort them by precedence
+                patterns.sort(reverse=True)
+                compiled_patterns[prefix] = (
+                    patterns,
+                    re.compile("|".join(f"({pattern[2]})" for pattern in patterns)),
+                )
+            self._patterns_trie = _get_trie(compiled_patterns.items())
+
+    def _match_patterns(self, path):
+        """
+        Yield the length and the value of the best wildcard pattern
+        of each start of :path: matching it.
+        """
+
+        node = self._patterns_trie
+        for length in range(len(path) + 1):
+            if RULE in node:
+                patterns, expression = node[RULE]
+                pattern_match = expression.match(path)
+                if pattern_match is not None:
+                    yield patterns[pattern_match.lastindex - 1][:2]
+            if length == len(path):
+                return
+            node = node.get(path[length])
+            if node is None:
+                return
+
+    def match(self, path):
+        """
+        Return the length and the value of the longest pattern matching the
+        start of :path:, or None. Allow wins over Disallow at the same length.
+        """
+
+        self._compile()
+
+        matches = []
+        if self._rules:
+            rule_match = self._rules_expression.match(path)
+            if rule_match is not None:
+                length = rule_match.end()
+                matches.append((length, self._rules[path[:length]]))
+
+        if self._patterns:
+            matches.extend(self._match_patterns(path))
+
+        return max(matches, default=None)
+
+
+class RobotsMatcher:
+    """
+    Parse the rules of a robots.txt file for all crawlers (User-agent: *)
+    and tell if a URL path is allowed and indexable, following RFC 9309 :
+    the rule with the longest matching pattern applies, Allow wins ties.
+    Noindex rules, not part of the RFC, apply to the paths they match.
+    """
+
+    def __init__(self, robots_text):
+        self._access_rules = RobotsRules()
+        self._noindex_rules = RobotsRules()
+
+        agents = []
+        in_agents = False
+        for line in robots_text.splitlines():
+            name, _, value = line.split("#", 1)[0].partition(":")
+            name = name.strip().lower()
+            value = value.strip()
+
+            if name == "user-agent":
+                # Consecutive User-agent lines start the same group
+                if not in_agents:
+                    agents = []
+                agents.append(value)
+                in_agents = True
+                continue
+
+            in_agents = False
+            if "*" not in agents or not value:
+                continue
+            if name in ("allow", "disallow"):
+                self._access_rules.add(value, name == "allow")
+            elif name == "noindex":
+                self._noindex_rules.add(value, True)
+
+    def is_allowed(self, path):
+        """Return True if crawlers may crawl the URL :path:."""
+
+        best_match = self._access_rules.match(path)
+        return best_match is None or best_match[1]
+
+    def is_noindex(self, path):
+        """Return True if a Noindex rule matches the URL :path:."""
+
+        return self._noindex_rules.match(path) is not None
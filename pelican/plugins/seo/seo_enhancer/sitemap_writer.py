@@ -0,0 +1,142 @@
+"""Write the sitemap of the site, streamed to disk in files of limited size."""
+
+import gzip
+import logging
+import os
+from urllib.parse import quote
+from xml.sax.saxutils import escape
+
+logger = logging.getLogger(__name__)
+
+# Limits of a single sitemap file, uncompressed (sitemaps.org protocol)
+MAX_URLS = 50_000
+MAX_SIZE = 50 * 1024 * 1024
+
+SITEMAP_NAMESPACE = "http://www.sitemaps.org/schemas/sitemap/0.9"
+XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8"?>\n'
+URLSET_HEADER = f'{XML_DECLARATION}<urlset xmlns="{SITEMAP_NAMESPACE}">\n'
+URLSET_FOOTER = "</urlset>\n"
+INDEX_NAME = "sitemap_index.xml"
+
+# Characters kept as is in URLs: reserved ones, and "%" of already quoted URLs
+URL_SAFE_CHARACTERS = "/:@!$&'()*+,;=~%"
+
+
+def get_absolute_url(siteurl, url):
+    """Return the absolute URL of a :url: relative to the site root, quoted."""
+
+    url = quote(url.lstrip("/"), safe=URL_SAFE_CHARACTERS)
+    return f"{(siteurl or '').rstrip('/')}/{url}"
+
+
+class SitemapWriter:
+    """
+    Write sitemap entries to disk as they are added, without keeping them
+    in memory. A new file is started every MAX_URLS URLs or MAX_SIZE bytes:
+    sitemap.xml, then sitemap-2.xml, sitemap-3.xml... Files are listed in
+    sitemap_index.xml, written on close. With :compress:, files are gzipped
+    and get a ".gz" extension.
+    """
+
+    def __init__(self, output_path, siteurl, compress=False):
+        self._output_path = output_path
+        self._siteurl = siteurl
+        self._compress = compress
+        self._file_names = []
+        self._file = None
+        # URLs and bytes of the file being written
+        self._file_urls_count = 0
+        self._file_size = 0
+
+        self.urls_count = 0
+
+    def _open_file(self, name, header):
+        """Open a new sitemap file in the output path and write its :header:."""
+
+        if self._compress:
+            name += ".gz"
+        os.makedirs(self._output_path, exist_ok=True)
+        path = os.path.join(self._output_path, name)
+
+        sitemap_file = (gzip.open if self._compress else open)(
+            path, "wt", encoding="utf-8"
+        )
+        sitemap_file.write(header)
+
+        return name, sitemap_file
+
+    def _start_file(self):
+        """Close the current file, if any, and start the next one."""
+
+        self._close_file()
+
+        number = len(self._file_names) + 1
+        name, self._file = self._open_file(
+            "sitemap.xml" if number == 1 else f"sitemap-{number}.xml", URLSET_HEADER
+        )
+        self._file_names.append(name)
+        self._file_urls_count = 0
+        self._file_size = len(URLSET_HEADER.encode())
+
+    def _close_file(self):
+        """Write the end of the current file and close it."""
+
+        if self._file is not None:
+            self._file.write(URLSET_FOOTER)
+            self._file.close()
+            self._file = None
+
+    def add(self, url, lastmod=None, priority=None):
+        """
+        Write the entry of a site :url:, relative to the site root,
+        with its :lastmod: datetime and its :priority:, from 0 to 1, if given.
+        """
+
+        entry = f"<url><loc>{escape(get_absolute_url(self._siteurl, url))}</loc>"
+        if lastmod is not None:
+            entry += f"<lastmod>{lastmod.isoformat()}</lastmod>"
+        if priority is not None:
+            entry += f"<priority>{priority:.1f}</priority>"
+        entry += "</url>\n"
+        entry_size = len(entry.encode())
+
+        if (
+            self._file is None
+            or self._file_urls_count == MAX_URLS
+            or self._file_size + entry_size + len(URLSET_FOOTER) > MAX_SIZE
+        ):
+            self._start_file()
+
+        self._file.write(entry)
+        self._file_urls_count += 1
+        self._file_size += entry_size
+        self.urls_count += 1
+
+    def close(self):
+        """
+        Close the last sitemap file and write the sitemap index.
+        Return the URL of the index.
+        """
+
+        if not self._file_names:
+            # An empty sitemap is still valid
+            self._start_file()
+        self._close_file()
+
+        index_name, index_file = self._open_file(
+            INDEX_NAME, f'{XML_DECLARATION}<sitemapindex xmlns="{SITEMAP_NAMESPACE}">\n'
+        )
+        with index_file:
+            for name in self._file_names:
+                index_file.write(
+                    f"<sitemap><loc>{escape(get_absolute_url(self._siteurl, name))}"
+                    "</loc></sitemap>\n"
+                )
+            index_file.write("</sitemapindex>\n")
+
+        logger.info(
+            f"SEO plugin - SEO Enhancement: sitemap created, {self.urls_count} URLs "
+            f"in {len(self._file_names)} files"
+        )
+
+        return get_absolute_url(self._siteurl, index_name)
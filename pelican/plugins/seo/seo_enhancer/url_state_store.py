@@ -0,0 +1,168 @@
+"""
+URL state store : remember, from one build to the next, the content hash
+of each URL and when it last changed, in a SQLite database.
+"""
+
+from datetime import datetime, timezone
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import time
+
+logger = logging.getLogger(__name__)
+
+TABLE_SCHEMA = (
+    "CREATE TABLE url_states "
+    "(url TEXT PRIMARY KEY, hash BLOB NOT NULL, changed INTEGER NOT NULL) "
+    "WITHOUT ROWID"
+)
+
+
+class URLStateStore:
+    """
+    Persistent store of document URLs, keyed by URL.
+    Each entry is a state tuple.
+
+    State :
+
+        (:16 bytes hash of the document content:, :timestamp of its last change:)
+
+    A URL seen for the first time gets the date of the document, if any,
+    as last change. Then, its last change is the build where its hash changed.
+    Entries of URLs that were not updated during the build are removed on save.
+    """
+
+    VERSION = 1
+
+    def __init__(self):
+        self._path = None
+        self._build_time = None
+        self._previous_states = {}
+        self._states = {}
+        self._changed_urls = []
+
+    @property
+    def loaded(self):
+        """Return True if the store has been loaded from a file."""
+
+        return self._path is not None
+
+    @property
+    def changed_urls(self):
+        """Return the URLs added or changed since the previous build, in order."""
+
+        return self._changed_urls
+
+    @property
+    def removed_urls(self):
+        """Return the URLs of the previous build not updated during this build."""
+
+        return [url for url in self._previous_states if url not in self._states]
+
+    @staticmethod
+    def hash_document(document):
+        """Return the hash of the title and the content of a document."""
+
+        serialized = json.dumps([document.title, document.content], ensure_ascii=False)
+        return hashlib.blake2b(serialized.encode("utf8"), digest_size=16).digest()
+
+    def load(self, path):
+        """Load the store file. A missing or invalid file gives an empty one."""
+
+        self._path = path
+        self._build_time = int(time.time())
+        self._previous_states = {}
+        self._states = {}
+        self._changed_urls = []
+
+        if not os.path.isfile(path):
+            return
+
+        try:
+            connection = sqlite3.connect(path)
+            try:
+                (version,) = connection.execute("PRAGMA user_version").fetchone()
+                if version == self.VERSION:
+                    self._previous_states = {
+                        url: (url_hash, changed)
+                        for url, url_hash, changed in connection.execute(
+                            "SELECT url, hash, changed FROM url_states"
+                        )
+                    }
+            finally:
+                connection.close()
+        except sqlite3.Error:
+            self._previous_states = {}
+
+    def update(self, url, url_hash, first_seen=None):
+        """
+        Record the hash of a URL during this build and return the datetime
+        of its last change. :first_seen: is the last change of a URL missing
+        from the previous build, the build time by default.
+        """
+
+        previous_state = self._previous_states.get(url)
+        if previous_state is not None and previous_state[0] == url_hash:
+            changed = previous_state[1]
+        else:
+            changed = self._build_time
+            if previous_state is None and first_seen is not None:
+                changed = int(first_seen.timestamp())
+            if url not in self._states:
+                self._changed_urls.append(url)
+
+        self._states[url] = (url_hash, changed)
+
+        return datetime.fromtimestamp(changed, timezone.utc)
+
+    def get_lastmod(self, url):
+        """
+        Return the datetime of the last change of a URL updated during
+        this build, or None.
+        """
+
+        state = self._states.get(url)
+        if state is None:
+            return None
+
+        return datetime.fromtimestamp(state[1], timezone.utc)
+
+    def save(self):
+        """Write the store file, with only the URLs updated during this build."""
+
+        if not self.loaded:
+            return
+
+        removed = len(self.removed_urls)
+
+        os.makedirs(os.path.dirname(self._path) or ".", exist_ok=True)
+        connection = sqlite3.connect(self._path)
+        try:
+            with connection:
+                connection.execute("DROP TABLE IF EXISTS url_states")
+                connection.execute(TABLE_SCHEMA)
+                connection.executemany(
+                    "INSERT INTO url_states VALUES (?, ?, ?)",
+                    (
+                        (url, url_hash, changed)
+                        for url, (url_hash, changed) in self._states.items()
+                    ),
+                )
+            connection.execute(f"PRAGMA user_version = {self.VERSION}")
+            # Give the pages of the previous table back to the file system
+            connection.execute("VACUUM")
+        finally:
+            connection.close()
+
+        logger.info(
+            f"SEO plugin - SEO Enhancement: URL states saved with "
+            f"{len(self._states)} URLs, {len(self._changed_urls)} changed "
+            f"and {removed} removed since the previous build"
+        )
+
+        self._path = None
+        self._previous_states = {}
+        self._states = {}
+        self._changed_urls = []
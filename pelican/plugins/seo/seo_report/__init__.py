@@ -1,21 +1,83 @@
 """Generate a SEO report by calling SEO analyzers for each content."""
 
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+import csv
 import datetime
+import json
 import logging
 import os
+import re
 
 from jinja2 import Environment, FileSystemLoader
 
-from .seo_analyzer import SEOAnalyzer
+from pelican.contents import Page
+
+from .seo_analyzer import SEOAnalyzer, get_analysis_inputs
+from .site_analyzer import (
+    BrokenLinkAnalyzer,
+    DuplicateAnalyzer,
+    LinkGraphAnalyzer,
+    NearDuplicateAnalyzer,
+)
 
 logger = logging.getLogger(__name__)
 
+REPORT_BASE_NAME = "seo_report"
+REPORT_FILE_NAME = f"{REPORT_BASE_NAME}.html"
+# Directory of the shard pages, next to the report
+SHARDS_DIR_NAME = REPORT_BASE_NAME
+# Name of the texts compared by the DuplicateAnalyzer, in the report
+DUPLICATE_FIELD_NAMES = {
+    "page_title": "title",
+    "page_description": "description",
+    "content_title": "content title",
+}
+# Fields of the JSON Lines and CSV reports records
+RECORD_FIELDS = (
+    "url",
+    "date",
+    "section",
+    "category",
+    "page_title_length",
+    "page_title_status",
+    "page_description_length",
+    "page_description_status",
+    "content_title_count",
+    "content_title_status",
+    "internal_link_count",
+    "internal_link_status",
+    "inbound_link_count",
+    "outbound_link_count",
+    "link_depth",
+    "link_authority",
+    "link_graph_status",
+    "broken_link_count",
+    "broken_link_status",
+    "duplicate_page_title_count",
+    "duplicate_page_description_count",
+    "duplicate_content_title_count",
+    "near_duplicate_count",
+    "duplicate_status",
+)
+
 
 class SEOReport:
     """Generate a SEO report by calling SEO analyzers for each content."""
 
     PAGE_TITLE_RECOMMENDED_LENGTH = range(60, 71)
     PAGE_DESCRIPTION_RECOMMENDED_LENGTH = range(150, 161)
+    # Groups of documents available for the shards of the report
+    SHARD_GROUPS = ("section", "category", "date")
+    # Output formats of the report
+    REPORT_FORMATS = ("html", "jsonl", "csv")
+    # Maximum number of URLs listed for each finding of a document
+    URLS_LIMIT = 10
+    # Maximum recommended number of clicks from the home page to a document
+    LINK_DEPTH_LIMIT = 3
+
+    def __init__(self, html_parser="html.parser"):
+        self._html_parser = html_parser
 
     def _convert_date(self, date):
         """Get SafeDate Pelican object and return date in string."""
@@ -25,31 +87,131 @@ class SEOReport:
         )
         return date_time.strftime("%Y-%m-%d %H:%M")
 
-    def launch_analysis(self, document):
+    def get_analysis_inputs(self, document):
         """
-        Launch SEO analysis for a document (either article or page).
-        Return a dict with document informations and his analysis.
+        Return the document fields needed by its analysis, as a picklable dict
+        that can be sent to another process.
         """
 
-        seo_analysis = SEOAnalyzer(document)
-
         date = None
         if hasattr(document, "date"):
             date = self._convert_date(document.date)
 
-        document_analysis = {
-            "url": document.url,
+        category = getattr(document, "category", None)
+
+        return {
             "date": date,
+            "section": "pages" if isinstance(document, Page) else "articles",
+            "category": getattr(category, "name", None),
+            **get_analysis_inputs(document),
+        }
+
+    def analyze(self, inputs):
+        """
+        Launch SEO analysis from the inputs returned by get_analysis_inputs.
+        Return a dict with document informations and his analysis.
+        """
+
+        seo_analysis = SEOAnalyzer(inputs=inputs, html_parser=self._html_parser)
+
+        document_analysis = {
+            "url": inputs["url"],
+            "date": inputs["date"],
+            "section": inputs["section"],
+            "category": inputs["category"],
             "seo_analysis": {
                 "page_title_analysis": seo_analysis.page_title_analysis,
                 "page_description_analysis": seo_analysis.page_description_analysis,
                 "content_title_analysis": seo_analysis.content_title_analysis,
                 "internal_link_analysis": seo_analysis.internal_link_analysis,
+                "content_fingerprint_analysis": (
+                    seo_analysis.content_fingerprint_analysis
+                ),
             },
         }
 
         return document_analysis
 
+    def launch_analysis(self, document):
+        """
+        Launch SEO analysis for a document (either article or page).
+        Return a dict with document informations and his analysis.
+        """
+
+        return self.analyze(self.get_analysis_inputs(document))
+
+    def _analyze_all(self, inputs, processes=None):
+        """
+        Launch SEO analysis for many documents inputs, spreading the work
+        across a pool of processes. Return the list of document analysis.
+        """
+
+        if not inputs:
+            return []
+
+        processes = min(processes or os.cpu_count() or 1, len(inputs))
+        if processes == 1:
+            return [self.analyze(document_inputs) for document_inputs in inputs]
+
+        # Send documents by batches to limit inter-process communication
+        chunksize = max(1, len(inputs) // (processes * 4))
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            documents_analysis = list(
+                executor.map(self.analyze, inputs, chunksize=chunksize)
+            )
+
+        logger.info(
+            f"SEO plugin - SEO Report: {len(inputs)} documents analyzed "
+            f"with {processes} processes"
+        )
+
+        return documents_analysis
+
+    def launch_analyses(self, documents, processes=None, cache=None):
+        """
+        Launch SEO analysis for many documents, spreading the work across
+        a pool of processes. Each document is analyzed exactly like launch_analysis.
+        :processes: defaults to the number of CPUs, 1 disables the pool.
+        :cache: is a loaded AnalysisCache. Documents it already holds
+        are not analyzed again, the others are recorded in it.
+        Return the list of document analysis, in the same order as :documents:.
+        """
+
+        # Documents fields are read here : Pelican objects are not picklable
+        inputs = [self.get_analysis_inputs(document) for document in documents]
+        if cache is None:
+            return self._analyze_all(inputs, processes)
+
+        documents_analysis = []
+        # Index in documents_analysis and cache key of the documents to analyze
+        missing = []
+        for document_inputs in inputs:
+            key = cache.key(document_inputs, self._html_parser)
+            seo_analysis = cache.get(key)
+            if seo_analysis is None:
+                missing.append((len(documents_analysis), key))
+                documents_analysis.append(None)
+                continue
+
+            documents_analysis.append(
+                {
+                    "url": document_inputs["url"],
+                    "date": document_inputs["date"],
+                    "section": document_inputs["section"],
+                    "category": document_inputs["category"],
+                    "seo_analysis": seo_analysis,
+                }
+            )
+
+        missing_analysis = self._analyze_all(
+            [inputs[index] for index, _ in missing], processes
+        )
+        for (index, key), document_analysis in zip(missing, missing_analysis):
+            cache.record(key, document_analysis["seo_analysis"])
+            documents_analysis[index] = document_analysis
+
+        return documents_analysis
+
     def _page_title_report(self, page_title_analysis):
         """
         Create report for page title thanks to dedicated analysis.
@@ -193,9 +355,133 @@ class SEOReport:
 
         return report
 
-    def _launch_report(self, document_analysis):
+    def _link_graph_report(self, inbound_count, depth, complete, authority):
+        """
+        Create report for the links to a document thanks to the site-wide
+        LinkGraphAnalyzer, from its inbound links count, its link depth
+        (None if it can't be reached from the home page) and its internal
+        link authority, from 0 to 1.
+        Orphan and depth problems are only reported if the graph is :complete:.
+        Return a dict with details.
+        """
+
+        report = {
+            "title": "Internal link graph analysis",
+            "content": {"good": [], "to_improve": [], "problems": []},
+        }
+
+        if depth == 0:
+            report["content"]["good"].append(
+                "This is the home page, where the link depth is counted from."
+            )
+        elif inbound_count:
+            report["content"]["good"].append(
+                f"{inbound_count} other pages link to this one. Nice job!"
+            )
+        elif complete:
+            report["content"]["problems"].append(
+                "No other page links to this one: it's an orphan page, "
+                "hard to find for visitors and search engines."
+            )
+
+        report["content"]["good"].append(
+            f"Your internal link authority is {round(authority * 100)}/100, "
+            "compared to the document most linked by the others."
+        )
+
+        if depth == 0 or not inbound_count:
+            return report
+
+        if depth is not None and depth <= self.LINK_DEPTH_LIMIT:
+            report["content"]["good"].append(
+                f"This document is {depth} clicks away from the home page. Nice job!"
+            )
+        elif not complete:
+            # A page missing from the graph may link to the document
+            return report
+        elif depth is None:
+            report["content"]["to_improve"].append(
+                "This document can't be reached from the home page "
+                "through internal links."
+            )
+        else:
+            report["content"]["to_improve"].append(
+                f"This document is {depth} clicks away from the home page. "
+                f"The recommended maximum is {self.LINK_DEPTH_LIMIT} clicks."
+            )
+
+        return report
+
+    def _list_urls(self, urls):
+        """Return the URLs as text, keeping the report readable when many."""
+
+        listed_urls = ", ".join(urls[: self.URLS_LIMIT])
+        if len(urls) > self.URLS_LIMIT:
+            listed_urls += ", ..."
+        return listed_urls
+
+    def _broken_link_report(self, broken_links):
+        """
+        Create report for broken internal links thanks to the site-wide
+        BrokenLinkAnalyzer, from the broken links of a document.
+        Return a dict with details.
+        """
+
+        report = {
+            "title": "Broken internal link analysis",
+            "content": {"good": [], "to_improve": [], "problems": []},
+        }
+
+        if broken_links:
+            report["content"]["problems"].append(
+                f"{len(broken_links)} internal links lead to pages the site "
+                f"doesn't have: {self._list_urls(broken_links)}"
+            )
+        else:
+            report["content"]["good"].append(
+                "Your internal links all lead to pages of the site. Nice job!"
+            )
+
+        return report
+
+    def _duplicate_report(self, duplicates, near_duplicates):
+        """
+        Create report for duplicate texts thanks to the site-wide
+        DuplicateAnalyzer and NearDuplicateAnalyzer, from the duplicates
+        and near-duplicates of a document.
+        Return a dict with details.
+        """
+
+        report = {
+            "title": "Duplicate content analysis",
+            "content": {"good": [], "to_improve": [], "problems": []},
+        }
+
+        if not duplicates and not near_duplicates:
+            report["content"]["good"].append(
+                "Your title, description and content are unique. Nice job!"
+            )
+
+        for field, other_urls in duplicates.items():
+            report["content"]["to_improve"].append(
+                f"Your {DUPLICATE_FIELD_NAMES[field]} is also used by "
+                f"{len(other_urls)} other documents: {self._list_urls(other_urls)}"
+            )
+
+        if near_duplicates:
+            report["content"]["to_improve"].append(
+                f"Your content is nearly the same as {len(near_duplicates)} other "
+                f"documents: {self._list_urls(near_duplicates)}"
+            )
+
+        return report
+
+    def _launch_report(self, document_analysis, site_analysis=None):
         """
         Get all documents analysis and launch dedicated report for each.
+        With the :site_analysis: returned by analyze_site,
+        add internal link graph and duplicate content reports,
+        and a broken internal link report if the site URLs were given.
         Return a dict with all micro-reports.
         """
         seo_analysis = document_analysis["seo_analysis"]
@@ -225,45 +511,402 @@ class SEOReport:
             internal_link_report,
         ]
 
+        if site_analysis is not None:
+            link_graph_analysis = site_analysis["link_graph_analysis"]
+            link_graph_report = self._link_graph_report(
+                inbound_count=link_graph_analysis.get_inbound_count(document_analysis),
+                depth=link_graph_analysis.get_depth(document_analysis),
+                complete=link_graph_analysis.complete,
+                authority=link_graph_analysis.get_authority(document_analysis),
+            )
+            document_report.append(link_graph_report)
+
+            duplicate_report = self._duplicate_report(
+                duplicates=site_analysis["duplicate_analysis"].get_duplicates(
+                    document_analysis
+                ),
+                near_duplicates=site_analysis[
+                    "near_duplicate_analysis"
+                ].get_near_duplicates(document_analysis),
+            )
+            document_report.append(duplicate_report)
+
+            broken_link_analysis = site_analysis["broken_link_analysis"]
+            if broken_link_analysis is not None:
+                broken_link_report = self._broken_link_report(
+                    broken_links=broken_link_analysis.get_broken_links(
+                        document_analysis
+                    )
+                )
+                document_report.append(broken_link_report)
+
         return document_report
 
-    def generate(self, site_name, documents_analysis):
+    @staticmethod
+    def _sort_by_date(documents_analysis):
         """
-        Generate the SEO report.
-        Return HTML file generated by Jinja2.
+        Sort documents by publication date, from recent to oldest.
+        Document without a date are sorted at the end of the report.
+        """
+
+        return sorted(
+            documents_analysis,
+            key=lambda k: (k["date"] is not None, k["date"]),
+            reverse=True,
+        )
+
+    @staticmethod
+    def _get_report_status(report):
+        """
+        Return the status of a micro-report : "problems" if it has any,
+        "to_improve" if it has points to improve, "good" otherwise.
+        """
+
+        if report["content"]["problems"]:
+            return "problems"
+        if report["content"]["to_improve"]:
+            return "to_improve"
+        return "good"
+
+    @staticmethod
+    def _count_report(totals, document_report):
+        """
+        Add a document report to the site-wide totals : for each analysis,
+        the document counts as a problem, as to improve or as good.
+        """
+
+        totals["documents"] += 1
+        for report in document_report:
+            counts = totals["analysis"].setdefault(
+                report["title"], {"good": 0, "to_improve": 0, "problems": 0}
+            )
+            counts[SEOReport._get_report_status(report)] += 1
+
+    def _iter_reports(self, documents_analysis, site_analysis, totals=None):
+        """
+        Yield the report of each document, in the given order.
+        Reports are created one by one, while the template is rendered.
+        Site-wide :totals: are updated along, if given.
         """
 
-        seo_reports = []
         for document_analysis in documents_analysis:
-            document_report = self._launch_report(document_analysis)
+            document_report = self._launch_report(document_analysis, site_analysis)
+            if totals is not None:
+                self._count_report(totals, document_report)
 
-            documents_reports = {
+            yield {
                 "url": document_analysis.get("url"),
                 "date": document_analysis.get("date"),
                 "seo_reports": document_report,
             }
 
-            seo_reports.append(documents_reports)
+    def analyze_site(
+        self, documents_analysis, site_urls=None, listings=(), complete=False
+    ):
+        """
+        Launch site-wide analysis, across all the documents analysis.
+        Internal links are checked against :site_urls:, if given.
+        The link graph also has the :listings: of the site, and is
+        :complete: if they are all the pages of the site with the documents.
+        Return a dict with the site-wide analyzers, to share between
+        the HTML report and the records.
+        """
 
-        # Sort documents by publication date, from recent to oldest.
-        # Document without a date are sorted at the end of the report.
-        seo_reports = sorted(
-            seo_reports, key=lambda k: (k["date"] is not None, k["date"]), reverse=True
-        )
+        duplicate_analysis = DuplicateAnalyzer(documents_analysis)
+        near_duplicate_analysis = NearDuplicateAnalyzer(documents_analysis)
+        link_graph_analysis = LinkGraphAnalyzer(documents_analysis, listings, complete)
+        broken_link_analysis = None
+        if site_urls is not None:
+            broken_link_analysis = BrokenLinkAnalyzer(documents_analysis, site_urls)
+
+        for field, name in DUPLICATE_FIELD_NAMES.items():
+            groups = duplicate_analysis.count_duplicate_groups(field)
+            if groups:
+                logger.info(
+                    f"SEO plugin - SEO Report: {groups} groups of documents "
+                    f"share the same {name}"
+                )
+        if near_duplicate_analysis.groups_count:
+            logger.info(
+                f"SEO plugin - SEO Report: {near_duplicate_analysis.groups_count} "
+                "groups of documents have nearly the same content"
+            )
+        if link_graph_analysis.complete and link_graph_analysis.orphans_count:
+            logger.info(
+                f"SEO plugin - SEO Report: {link_graph_analysis.orphans_count} "
+                "documents have no inbound internal link"
+            )
+        if broken_link_analysis is not None and broken_link_analysis.broken_links_count:
+            logger.warning(
+                f"SEO plugin - SEO Report: {broken_link_analysis.broken_links_count} "
+                "broken internal links found"
+            )
+
+        return {
+            "duplicate_analysis": duplicate_analysis,
+            "near_duplicate_analysis": near_duplicate_analysis,
+            "link_graph_analysis": link_graph_analysis,
+            "broken_link_analysis": broken_link_analysis,
+        }
+
+    def _render(self, template_name, path, **context):
+        """
+        Render a Jinja2 template in the file at :path:.
+        The file is written as it is rendered, without holding it in memory.
+        """
 
         # Get Jinja HTML template
         plugin_path = os.path.dirname(os.path.realpath(__file__))
         file_loader = FileSystemLoader(plugin_path + "/template")
         env = Environment(loader=file_loader)
 
-        template = env.get_template("seo_report.html")
+        template = env.get_template(template_name)
         css_file = plugin_path + "/static/seo_report.css"
-        output = template.render(
-            site_name=site_name, seo_reports=seo_reports, css_file=css_file
+        output = template.stream(css_file=css_file, **context)
+        # Write rendered chunks by groups rather than one by one
+        output.enable_buffering(size=100)
+
+        with open(path, "w", encoding="utf8") as report:
+            for chunk in output:
+                report.write(chunk)
+
+    def generate(self, site_name, documents_analysis, site_analysis=None):
+        """
+        Generate the SEO report.
+        The HTML file is written by Jinja2 as it is rendered,
+        without holding the whole report in memory.
+        :site_analysis: is the result of analyze_site, run if not given.
+        """
+
+        if site_analysis is None:
+            site_analysis = self.analyze_site(documents_analysis)
+
+        self._render(
+            "seo_report.html",
+            REPORT_FILE_NAME,
+            site_name=site_name,
+            seo_reports=self._iter_reports(
+                self._sort_by_date(documents_analysis), site_analysis
+            ),
         )
 
-        # Create HTML file
-        with open("seo_report.html", "w", encoding="utf8") as report:
-            report.write(output)
+        logger.info(f"SEO plugin - SEO Report: {REPORT_FILE_NAME} file created")
+
+    @staticmethod
+    def _get_shard_group(document_analysis, shard_by):
+        """Return the name of the group of a document, see generate_shards."""
+
+        if shard_by == "date":
+            date = document_analysis["date"]
+            return date[:4] if date else "Undated"
+
+        if shard_by == "category":
+            return document_analysis["category"] or "Uncategorized"
+
+        return document_analysis["section"].capitalize()
+
+    def generate_shards(
+        self,
+        site_name,
+        documents_analysis,
+        shard_by="section",
+        shard_size=500,
+        site_analysis=None,
+    ):
+        """
+        Generate the SEO report as an index page with site-wide totals,
+        linking to shard pages of at most :shard_size: documents.
+        Documents are grouped in shards by :shard_by: : "section" (articles
+        or pages), "category" or "date" (publication year).
+        Shards are written in the SHARDS_DIR_NAME directory.
+        :site_analysis: is the result of analyze_site, run if not given.
+        """
 
-        logger.info("SEO plugin - SEO Report: seo_report.html file created")
+        if site_analysis is None:
+            site_analysis = self.analyze_site(documents_analysis)
+
+        # Groups are ordered by their most recent document
+        groups = {}
+        for document_analysis in self._sort_by_date(documents_analysis):
+            group = self._get_shard_group(document_analysis, shard_by)
+            groups.setdefault(group, []).append(document_analysis)
+
+        os.makedirs(SHARDS_DIR_NAME, exist_ok=True)
+
+        totals = {"documents": 0, "analysis": {}}
+        index = []
+        slugs = set()
+        shard_names = set()
+        for group, group_analysis in groups.items():
+            slug = re.sub(r"[^a-z0-9]+", "-", group.lower()).strip("-") or "shard"
+            # Two groups may have the same slug, like "C++" and "C"
+            while slug in slugs:
+                slug += "-"
+            slugs.add(slug)
+
+            shard_count = -(-len(group_analysis) // shard_size)
+            shards = []
+            for number in range(1, shard_count + 1):
+                shard_analysis = group_analysis[
+                    (number - 1) * shard_size : number * shard_size
+                ]
+                shard_name = f"{slug}-{number}.html"
+                shard_names.add(shard_name)
+
+                self._render(
+                    "seo_report.html",
+                    os.path.join(SHARDS_DIR_NAME, shard_name),
+                    site_name=site_name,
+                    seo_reports=self._iter_reports(
+                        shard_analysis, site_analysis, totals
+                    ),
+                    index_url=f"../{REPORT_FILE_NAME}",
+                    shard_title=f"{group} ({number}/{shard_count})",
+                )
+                shards.append(
+                    {
+                        "url": f"{SHARDS_DIR_NAME}/{shard_name}",
+                        "documents": len(shard_analysis),
+                    }
+                )
+
+            index.append({"name": group, "shards": shards})
+
+        # Remove the shards of the groups that no longer exist
+        for name in os.listdir(SHARDS_DIR_NAME):
+            if name.endswith(".html") and name not in shard_names:
+                os.remove(os.path.join(SHARDS_DIR_NAME, name))
+
+        self._render(
+            "seo_report_index.html",
+            REPORT_FILE_NAME,
+            site_name=site_name,
+            totals=totals,
+            groups=index,
+        )
+
+        logger.info(
+            f"SEO plugin - SEO Report: {REPORT_FILE_NAME} file created "
+            f"with {len(shard_names)} shards"
+        )
+
+    def _get_record(self, document_analysis, site_analysis):
+        """
+        Return a flat record of a document analysis and report,
+        with the fields of RECORD_FIELDS.
+        """
+
+        seo_analysis = document_analysis["seo_analysis"]
+        page_title_analysis = seo_analysis["page_title_analysis"]
+        page_description_analysis = seo_analysis["page_description_analysis"]
+        content_title_analysis = seo_analysis["content_title_analysis"]
+        internal_link_analysis = seo_analysis["internal_link_analysis"]
+
+        # Status of each micro-report, by title, whatever their order
+        statuses = {
+            report["title"]: self._get_report_status(report)
+            for report in self._launch_report(document_analysis, site_analysis)
+        }
+        duplicates = site_analysis["duplicate_analysis"].get_duplicates(
+            document_analysis
+        )
+        near_duplicates = site_analysis["near_duplicate_analysis"].get_near_duplicates(
+            document_analysis
+        )
+        link_graph_analysis = site_analysis["link_graph_analysis"]
+        broken_link_analysis = site_analysis["broken_link_analysis"]
+
+        broken_link_count = None
+        if broken_link_analysis is not None:
+            broken_link_count = len(
+                broken_link_analysis.get_broken_links(document_analysis)
+            )
+
+        return {
+            "url": document_analysis["url"],
+            "date": document_analysis["date"],
+            "section": document_analysis["section"],
+            "category": document_analysis["category"],
+            "page_title_length": page_title_analysis.page_title_length,
+            "page_title_status": statuses["Page title analysis"],
+            "page_description_length": (
+                page_description_analysis.page_description_length
+            ),
+            "page_description_status": statuses["Page description analysis"],
+            "content_title_count": content_title_analysis.content_title_occurrence,
+            "content_title_status": statuses["Content title analysis"],
+            "internal_link_count": internal_link_analysis.internal_link_occurrence,
+            "internal_link_status": statuses["Internal link analysis"],
+            "inbound_link_count": link_graph_analysis.get_inbound_count(
+                document_analysis
+            ),
+            "outbound_link_count": link_graph_analysis.get_outbound_count(
+                document_analysis
+            ),
+            "link_depth": link_graph_analysis.get_depth(document_analysis),
+            "link_authority": round(
+                link_graph_analysis.get_authority(document_analysis), 4
+            ),
+            "link_graph_status": statuses["Internal link graph analysis"],
+            "broken_link_count": broken_link_count,
+            # Without the site URLs, broken links are not checked
+            "broken_link_status": statuses.get("Broken internal link analysis"),
+            "duplicate_page_title_count": len(duplicates.get("page_title", [])),
+            "duplicate_page_description_count": len(
+                duplicates.get("page_description", [])
+            ),
+            "duplicate_content_title_count": len(duplicates.get("content_title", [])),
+            "near_duplicate_count": len(near_duplicates),
+            "duplicate_status": statuses["Duplicate content analysis"],
+        }
+
+    def generate_records(
+        self, documents_analysis, formats=("jsonl", "csv"), site_analysis=None
+    ):
+        """
+        Generate the SEO report as machine-readable files : one record
+        by document, in the given :formats: ("jsonl" and/or "csv").
+        Records are written one by one, in the same order as the HTML report.
+        :site_analysis: is the result of analyze_site, run if not given.
+        """
+
+        formats = [
+            report_format for report_format in formats if report_format != "html"
+        ]
+        if not formats:
+            return
+
+        with ExitStack() as stack:
+            writers = []
+            for report_format in formats:
+                report = stack.enter_context(
+                    open(
+                        f"{REPORT_BASE_NAME}.{report_format}",
+                        "w",
+                        encoding="utf8",
+                        newline="",
+                    )
+                )
+                if report_format == "csv":
+                    csv_writer = csv.DictWriter(report, fieldnames=RECORD_FIELDS)
+                    csv_writer.writeheader()
+                    writers.append(csv_writer.writerow)
+                else:
+                    writers.append(
+                        lambda record, report=report: report.write(
+                            json.dumps(record, ensure_ascii=False) + "\n"
+                        )
+                    )
+
+            if site_analysis is None:
+                site_analysis = self.analyze_site(documents_analysis)
+            for document_analysis in self._sort_by_date(documents_analysis):
+                record = self._get_record(document_analysis, site_analysis)
+                for write in writers:
+                    write(record)
+
+        for report_format in formats:
+            logger.info(
+                f"SEO plugin - SEO Report: {REPORT_BASE_NAME}.{report_format} "
+                "file created"
+            )
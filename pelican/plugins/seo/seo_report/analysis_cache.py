@@ -0,0 +1,161 @@
+"""
+Analysis cache : remember, from one build to the next, the SEO analysis
+of each document, so that only changed documents are analyzed again.
+"""
+
+import hashlib
+from importlib.metadata import PackageNotFoundError, version
+import json
+import logging
+import os
+
+from .seo_analyzer import (
+    ContentFingerprintAnalyzer,
+    ContentTitleAnalyzer,
+    InternalLinkAnalyzer,
+    PageDescriptionAnalyzer,
+    PageTitleAnalyzer,
+)
+
+logger = logging.getLogger(__name__)
+
+# Analyzer class of each entry of a document analysis
+ANALYZERS = {
+    "page_title_analysis": PageTitleAnalyzer,
+    "page_description_analysis": PageDescriptionAnalyzer,
+    "content_title_analysis": ContentTitleAnalyzer,
+    "internal_link_analysis": InternalLinkAnalyzer,
+    "content_fingerprint_analysis": ContentFingerprintAnalyzer,
+}
+
+
+def get_plugin_version():
+    """Return the installed version of the plugin, or None if it isn't installed."""
+
+    try:
+        return version("pelican-seo")
+    except PackageNotFoundError:
+        return None
+
+
+class AnalysisCache:
+    """
+    Persistent cache of documents analysis, keyed by the hash of the
+    document fields the analysis depends on.
+    Each entry holds the findings of each analyzer, in their slots order.
+
+    The cache is invalidated when the plugin version changes.
+    Entries of documents that were not analyzed during the build
+    are evicted on save.
+    """
+
+    VERSION = 5
+
+    def __init__(self):
+        self._path = None
+        self._version = None
+        self._previous_entries = {}
+        self._entries = {}
+        self._hits = 0
+
+    @property
+    def loaded(self):
+        """Return True if the cache has been loaded from a file."""
+
+        return self._path is not None
+
+    @staticmethod
+    def key(inputs, html_parser):
+        """
+        Return the cache key of a document, from the inputs returned by
+        SEOReport.get_analysis_inputs and the parser used to analyze it.
+        """
+
+        serialized = json.dumps(
+            [
+                inputs["url"],
+                inputs["title"],
+                inputs["description"],
+                inputs["content"],
+                inputs["siteurl"],
+                html_parser,
+            ],
+            ensure_ascii=False,
+            default=str,
+        )
+        return hashlib.blake2b(serialized.encode("utf8"), digest_size=16).hexdigest()
+
+    def load(self, path):
+        """Load the cache file. A missing, invalid or outdated file is ignored."""
+
+        self._path = path
+        self._version = [self.VERSION, get_plugin_version()]
+        self._previous_entries = {}
+        self._entries = {}
+        self._hits = 0
+
+        try:
+            with open(path, encoding="utf8") as cache_file:
+                cache = json.load(cache_file)
+        except (OSError, ValueError):
+            return
+
+        if cache.get("version") == self._version:
+            self._previous_entries = cache.get("documents", {})
+
+    def get(self, key):
+        """
+        Return the analysis recorded by the previous build, as a dict of
+        analyzers like the "seo_analysis" of SEOReport.analyze, or None.
+        """
+
+        findings = self._previous_entries.get(key)
+        if findings is None:
+            return None
+
+        self._entries[key] = findings
+        self._hits += 1
+
+        seo_analysis = {}
+        for name, analyzer_class in ANALYZERS.items():
+            analyzer = analyzer_class.__new__(analyzer_class)
+            for slot, value in zip(analyzer_class.__slots__, findings[name]):
+                # JSON has no tuples
+                setattr(
+                    analyzer, slot, tuple(value) if isinstance(value, list) else value
+                )
+            seo_analysis[name] = analyzer
+
+        return seo_analysis
+
+    def record(self, key, seo_analysis):
+        """Record the analysis of a document analyzed during this build."""
+
+        self._entries[key] = {
+            name: [getattr(analyzer, slot) for slot in analyzer.__slots__]
+            for name, analyzer in seo_analysis.items()
+        }
+
+    def save(self):
+        """Write the cache file, with only the documents analyzed during this build."""
+
+        if not self.loaded:
+            return
+
+        evicted = len(self._previous_entries.keys() - self._entries.keys())
+
+        os.makedirs(os.path.dirname(self._path) or ".", exist_ok=True)
+        with open(self._path, "w", encoding="utf8") as cache_file:
+            json.dump(
+                {"version": self._version, "documents": self._entries}, cache_file
+            )
+
+        logger.info(
+            f"SEO plugin - SEO Report: cache saved with {len(self._entries)} "
+            f"documents, {self._hits} reused, {evicted} removed"
+        )
+
+        self._path = None
+        self._previous_entries = {}
+        self._entries = {}
+        self._hits = 0
@@ -1,27 +1,56 @@
 """Launch micro SEO analysis."""
 
+from .content_fingerprint_analyzer import ContentFingerprintAnalyzer
 from .content_title_analyzer import ContentTitleAnalyzer
+from .document_facts import DocumentFacts
 from .internal_link_analyzer import InternalLinkAnalyzer
 from .page_description_analyzer import PageDescriptionAnalyzer
 from .page_title_analyzer import PageTitleAnalyzer
 
 
+def get_analysis_inputs(article):
+    """
+    Return the article fields needed by SEOAnalyzer, as a picklable dict
+    that can be sent to another process.
+    """
+
+    settings = getattr(article, "settings", None)
+    return {
+        "url": getattr(article, "url", None),
+        "title": getattr(article, "title", None),
+        "description": getattr(article, "description", None)
+        or getattr(article, "summary", None),
+        "content": getattr(article, "content", None),
+        "siteurl": settings["SITEURL"],
+    }
+
+
 class SEOAnalyzer:
-    """Instancy all micro SEO analyzers."""
+    """
+    Instancy all micro SEO analyzers.
+    Analyzers only keep their findings, neither the document nor its parse tree.
+    :inputs: are the ones returned by get_analysis_inputs, used instead of :article:.
+    """
 
-    def __init__(self, article):
-        self._title = getattr(article, "title", None)
-        self._description = getattr(article, "description", None) or getattr(
-            article, "summary", None
-        )
-        self._content = getattr(article, "content", None)
-        self._settings = getattr(article, "settings", None)
+    def __init__(self, article=None, html_parser="html.parser", inputs=None):
+        if inputs is None:
+            inputs = get_analysis_inputs(article)
 
-        self.page_title_analysis = PageTitleAnalyzer(title=self._title)
+        self.page_title_analysis = PageTitleAnalyzer(title=inputs["title"])
         self.page_description_analysis = PageDescriptionAnalyzer(
-            description=self._description
+            description=inputs["description"]
+        )
+
+        # Content is parsed once, all analyzers read the extracted facts
+        self.document_facts = DocumentFacts(inputs["content"], html_parser=html_parser)
+        self.content_title_analysis = ContentTitleAnalyzer(
+            document_facts=self.document_facts
         )
-        self.content_title_analysis = ContentTitleAnalyzer(content=self._content)
         self.internal_link_analysis = InternalLinkAnalyzer(
-            content=self._content, siteurl=self._settings["SITEURL"]
+            siteurl=inputs["siteurl"],
+            document_facts=self.document_facts,
+            url=inputs["url"],
+        )
+        self.content_fingerprint_analysis = ContentFingerprintAnalyzer(
+            document_facts=self.document_facts
         )
@@ -0,0 +1,80 @@
+"""Analyze the content fingerprint, to find near-duplicate contents."""
+
+import hashlib
+import re
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .document_facts import DocumentFacts
+
+SIMHASH_BITS = 64
+# Number of consecutive words hashed together
+SHINGLE_SIZE = 3
+WORD = re.compile(r"\w+")
+
+
+def get_simhash(text):
+    """
+    Return the 64 bits SimHash of a text, from the hashes of its shingles
+    (groups of SHINGLE_SIZE consecutive words). Close texts have SimHashes
+    differing by a few bits only. Return 0 if there is no word.
+    The result is the same with or without NumPy.
+    """
+
+    words = WORD.findall(text.casefold())
+    if not words:
+        return 0
+
+    shingles = {
+        " ".join(words[index : index + SHINGLE_SIZE])
+        for index in range(max(1, len(words) - SHINGLE_SIZE + 1))
+    }
+    hashes = [
+        hashlib.blake2b(shingle.encode("utf8"), digest_size=8).digest()
+        for shingle in shingles
+    ]
+
+    # Number of hashes with each bit set, from the most significant bit
+    if np is not None:
+        bits = np.unpackbits(
+            np.frombuffer(b"".join(hashes), dtype=np.uint8).reshape(
+                len(hashes), SIMHASH_BITS // 8
+            ),
+            axis=1,
+        )
+        counts = bits.sum(axis=0).tolist()
+    else:
+        counts = [0] * SIMHASH_BITS
+        for shingle_hash in hashes:
+            for index, bit in enumerate(
+                f"{int.from_bytes(shingle_hash, 'big'):0{SIMHASH_BITS}b}"
+            ):
+                if bit == "1":
+                    counts[index] += 1
+
+    # A bit is set when it is set in the majority of hashes
+    simhash = 0
+    for count in counts:
+        simhash = (simhash << 1) | (count * 2 > len(hashes))
+
+    return simhash
+
+
+class ContentFingerprintAnalyzer:
+    """Analyze the content fingerprint."""
+
+    __slots__ = ("_simhash",)
+
+    def __init__(self, content=None, html_parser="html.parser", document_facts=None):
+        if document_facts is None:
+            document_facts = DocumentFacts(content, html_parser=html_parser)
+        self._simhash = get_simhash(document_facts.text)
+
+    @property
+    def content_simhash(self):
+        """Return the SimHash of the content text, 0 if there is no text."""
+
+        return self._simhash
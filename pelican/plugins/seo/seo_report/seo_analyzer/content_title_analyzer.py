@@ -1,18 +1,23 @@
 """Analyze the content title."""
 
-from bs4 import BeautifulSoup
+from .document_facts import DocumentFacts, get_normalized_hash
 
 
 class ContentTitleAnalyzer:
     """Analyze the content title."""
 
-    def __init__(self, content):
-        self._soup = BeautifulSoup(content, features="html.parser")
+    __slots__ = ("_h1_count", "_h1_hash")
+
+    def __init__(self, content=None, html_parser="html.parser", document_facts=None):
+        if document_facts is None:
+            document_facts = DocumentFacts(content, html_parser=html_parser)
+        self._h1_count = document_facts.h1_count
+        self._h1_hash = get_normalized_hash(document_facts.h1_text)
 
     def has_content_title(self):
         """Return True is there is a content title."""
 
-        if not self._soup.h1:
+        if not self._h1_count:
             return False
 
         return True
@@ -20,9 +25,19 @@ class ContentTitleAnalyzer:
     def is_content_title_unique(self):
         """Return True if content title is unique."""
 
-        content_titles = self._soup.find_all("h1")
-
-        if len(content_titles) > 1:
+        if self._h1_count > 1:
             return False
 
         return True
+
+    @property
+    def content_title_occurrence(self):
+        """Return the content title occurrence."""
+
+        return self._h1_count
+
+    @property
+    def content_title_hash(self):
+        """Return the normalized hash of the first content title, 0 if there is none."""
+
+        return self._h1_hash
@@ -0,0 +1,79 @@
+"""Extract the facts needed by the analyzers with a single parse of the content."""
+
+import hashlib
+
+from bs4 import BeautifulSoup, NavigableString, Tag
+
+HEADINGS = {"h1": 1, "h2": 2, "h3": 3, "h4": 4, "h5": 5, "h6": 6}
+
+
+def get_normalized_hash(text):
+    """
+    Return a 64 bits hash of a text, ignoring case and whitespace differences,
+    to find documents with the same text. Return 0 if there is no text.
+    """
+
+    normalized = " ".join((text or "").split()).casefold()
+    if not normalized:
+        return 0
+
+    digest = hashlib.blake2b(normalized.encode("utf8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+class DocumentFacts:
+    """
+    Parse a document content once and extract, in the same traversal,
+    everything the analyzers need. The parse tree is not kept.
+    """
+
+    __slots__ = ("h1_count", "headings", "images", "links", "text", "text_length")
+
+    def __init__(self, content, html_parser="html.parser"):
+        self.h1_count = 0
+        # (level, text) of each heading, in document order
+        self.headings = []
+        # href of each link, in document order
+        self.links = []
+        # (src, alt) of each image, in document order
+        self.images = []
+        texts = []
+
+        soup = BeautifulSoup(content, features=html_parser)
+        for element in soup.descendants:
+            if isinstance(element, Tag):
+                self._extract_tag_facts(element)
+            # Subclasses are comments, doctypes, scripts, etc. : not visible text
+            elif type(element) is NavigableString:
+                texts.append(element)
+
+        # Visible text of the document
+        self.text = "".join(texts)
+        self.text_length = len(self.text)
+
+    @property
+    def h1_text(self):
+        """Return the text of the first h1 heading, or None."""
+
+        for level, text in self.headings:
+            if level == 1:
+                return text
+
+        return None
+
+    def _extract_tag_facts(self, tag):
+        """Extract facts from a single tag."""
+
+        if tag.name in HEADINGS:
+            level = HEADINGS[tag.name]
+            if level == 1:
+                self.h1_count += 1
+            self.headings.append((level, tag.get_text().strip()))
+
+        elif tag.name == "a":
+            href = tag.get("href")
+            if href is not None:
+                self.links.append(href)
+
+        elif tag.name == "img":
+            self.images.append((tag.get("src"), tag.get("alt")))
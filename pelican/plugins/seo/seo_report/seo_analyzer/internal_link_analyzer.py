@@ -1,33 +1,60 @@
 """Analyze the internal link of an article."""
 
-from bs4 import BeautifulSoup
+from pelican.plugins.seo.internal_url import get_internal_url
+
+from .document_facts import DocumentFacts
 
 
 class InternalLinkAnalyzer:
     """Analyze internal link of an article."""
 
-    def __init__(self, content, siteurl):
-        self._soup = BeautifulSoup(content, features="html.parser")
-        self._links = self._soup.find_all("a", href=True)
-        self._siteurl = siteurl
+    __slots__ = ("_internal_link_occurrence", "_internal_link_urls")
+
+    def __init__(
+        self,
+        content=None,
+        siteurl=None,
+        html_parser="html.parser",
+        document_facts=None,
+        url=None,
+    ):
+        if document_facts is None:
+            document_facts = DocumentFacts(content, html_parser=html_parser)
+
+        # Links to the document itself, like anchors, are not counted
+        document_url = None if url is None else get_internal_url(url, siteurl)
+        self._internal_link_occurrence = 0
+        # Each linked internal URL once, in document order, for the link graph
+        internal_urls = {}
+        for link in document_facts.links:
+            internal_url = get_internal_url(link, siteurl, url)
+            if internal_url is not None and internal_url != document_url:
+                self._internal_link_occurrence += 1
+                internal_urls[internal_url] = None
+        self._internal_link_urls = tuple(internal_urls)
 
     def has_internal_link(self):
         """
-        Return True is there is a internal link.
-        Need to have SITEURL parameter declared.
+        Return True is there is a internal link : a relative link,
+        or an absolute link with the scheme and host of SITEURL.
         """
 
-        if not self._links:
+        if not self._internal_link_occurrence:
             return False
 
-        for link in self._links:
-            if self._siteurl in link["href"]:
-                return True
-
-        return False
+        return True
 
     @property
     def internal_link_occurrence(self):
         """Return the internal link occurrence."""
 
-        return len([link for link in self._links if self._siteurl in link["href"]])
+        return self._internal_link_occurrence
+
+    @property
+    def internal_link_urls(self):
+        """
+        Return the internal URLs linked by the article, each once,
+        as returned by get_internal_url.
+        """
+
+        return self._internal_link_urls
@@ -1,16 +1,21 @@
 """Analyze the page description."""
 
+from .document_facts import get_normalized_hash
+
 
 class PageDescriptionAnalyzer:
     """Analyze the page description."""
 
+    __slots__ = ("_description_hash", "_description_length")
+
     def __init__(self, description):
-        self._description = description
+        self._description_length = len(description) if description else 0
+        self._description_hash = get_normalized_hash(description)
 
     def has_page_description(self):
         """Return True if there is a page description."""
 
-        if not self._description:
+        if not self._description_length:
             return False
 
         return True
@@ -19,4 +24,10 @@ class PageDescriptionAnalyzer:
     def page_description_length(self):
         """Return page description length."""
 
-        return len(self._description)
+        return self._description_length
+
+    @property
+    def page_description_hash(self):
+        """Return the normalized hash of the page description, 0 if there is none."""
+
+        return self._description_hash
@@ -1,16 +1,21 @@
 """Analyze the page title."""
 
+from .document_facts import get_normalized_hash
+
 
 class PageTitleAnalyzer:
     """Analyze the page title."""
 
+    __slots__ = ("_title_hash", "_title_length")
+
     def __init__(self, title):
-        self._title = title
+        self._title_length = len(title) if title else 0
+        self._title_hash = get_normalized_hash(title)
 
     def has_page_title(self):
         """Return True is there is a page title."""
 
-        if not self._title:
+        if not self._title_length:
             return False
 
         return True
@@ -19,4 +24,10 @@ class PageTitleAnalyzer:
     def page_title_length(self):
         """Return page title length."""
 
-        return len(self._title)
+        return self._title_length
+
+    @property
+    def page_title_hash(self):
+        """Return the normalized hash of the page title, 0 if there is none."""
+
+        return self._title_hash
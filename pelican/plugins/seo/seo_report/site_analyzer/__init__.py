@@ -0,0 +1,13 @@
+"""Site-wide SEO analyzers, working on the analysis of all documents."""
+
+from .broken_link_analyzer import BrokenLinkAnalyzer
+from .duplicate_analyzer import DuplicateAnalyzer
+from .link_graph_analyzer import LinkGraphAnalyzer
+from .near_duplicate_analyzer import NearDuplicateAnalyzer
+
+__all__ = [
+    "BrokenLinkAnalyzer",
+    "DuplicateAnalyzer",
+    "LinkGraphAnalyzer",
+    "NearDuplicateAnalyzer",
+]
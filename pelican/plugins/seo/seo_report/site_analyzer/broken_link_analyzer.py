@@ -0,0 +1,31 @@
+"""Find internal links leading to URLs the site doesn't have."""
+
+
+class BrokenLinkAnalyzer:
+    """
+    Check the internal links of each document against the set of URLs
+    written by the site, as returned by get_internal_url.
+    Each link is a single set lookup : no file is read and no request is sent.
+    """
+
+    def __init__(self, documents_analysis, site_urls):
+        # Broken links of each document, by URL
+        self._broken_links = {}
+
+        for document_analysis in documents_analysis:
+            broken_links = [
+                url
+                for url in document_analysis["seo_analysis"][
+                    "internal_link_analysis"
+                ].internal_link_urls
+                if url not in site_urls
+            ]
+            if broken_links:
+                self._broken_links[document_analysis["url"]] = broken_links
+
+        self.broken_links_count = sum(map(len, self._broken_links.values()))
+
+    def get_broken_links(self, document_analysis):
+        """Return the internal URLs linked by the document which don't exist."""
+
+        return self._broken_links.get(document_analysis["url"], [])
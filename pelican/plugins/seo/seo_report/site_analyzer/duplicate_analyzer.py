@@ -0,0 +1,56 @@
+"""Find documents sharing the same title, description or content title."""
+
+# Analysis and hash property of each compared text
+FIELDS = {
+    "page_title": ("page_title_analysis", "page_title_hash"),
+    "page_description": ("page_description_analysis", "page_description_hash"),
+    "content_title": ("content_title_analysis", "content_title_hash"),
+}
+
+
+class DuplicateAnalyzer:
+    """
+    Index the documents by the normalized hash of their title, description
+    and content title, in a single pass over the documents analysis.
+    Documents without one of these texts are not indexed for it.
+    """
+
+    def __init__(self, documents_analysis):
+        # URLs of the documents, by hash, for each field
+        self._urls = {field: {} for field in FIELDS}
+
+        for document_analysis in documents_analysis:
+            for field, text_hash in self._get_hashes(document_analysis):
+                self._urls[field].setdefault(text_hash, []).append(
+                    document_analysis["url"]
+                )
+
+    def _get_hashes(self, document_analysis):
+        """Yield the field and the hash of each text the document has."""
+
+        seo_analysis = document_analysis["seo_analysis"]
+        for field, (analysis_name, hash_name) in FIELDS.items():
+            text_hash = getattr(seo_analysis[analysis_name], hash_name)
+            if text_hash:
+                yield field, text_hash
+
+    def get_duplicates(self, document_analysis):
+        """
+        Return the URLs of the other documents with the same text as
+        the given document, by field. Fields without duplicates are omitted.
+        """
+
+        duplicates = {}
+        for field, text_hash in self._get_hashes(document_analysis):
+            urls = self._urls[field].get(text_hash, [])
+            if len(urls) > 1:
+                other_urls = list(urls)
+                other_urls.remove(document_analysis["url"])
+                duplicates[field] = other_urls
+
+        return duplicates
+
+    def count_duplicate_groups(self, field):
+        """Return the number of groups of documents sharing the same :field: text."""
+
+        return sum(1 for urls in self._urls[field].values() if len(urls) > 1)
@@ -0,0 +1,232 @@
+"""
+Build the internal link graph of the site, from the links of each document
+and of the listing pages written by Pelican.
+"""
+
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from pelican.plugins.seo.internal_url import get_internal_url
+
+# URL of the home page, as returned by get_internal_url
+HOME_URL = ""
+# Probability to follow a link rather than jumping to any document (PageRank)
+DAMPING_FACTOR = 0.85
+# Authority scores are computed until their total change is under TOLERANCE
+TOLERANCE = 1e-6
+MAX_ITERATIONS = 100
+
+
+class LinkGraphAnalyzer:
+    """
+    Build the graph of the internal links between documents and the
+    :listings: of the site, (url, linked URLs) pairs of the pages listing
+    documents : index, categories, tags... Documents then listings are
+    the nodes, numbered in order and indexed by normalized URL.
+    Links are stored as compact integer arrays : the nodes linked by node i
+    are targets[offsets[i]:offsets[i + 1]]. Links to URLs which are neither
+    documents nor listings (static files, feeds...) are ignored.
+
+    Link depth is counted from the home page, the index listing or a
+    document saved as index.html. The authority of each node is its
+    PageRank, computed by power iteration over the links, with NumPy
+    if it is installed.
+
+    The graph is :complete: if the documents and listings are all the
+    pages of the site. Otherwise, a document may be linked by a page
+    missing from the graph : it may not really be an orphan or that deep.
+    """
+
+    def __init__(self, documents_analysis, listings=(), complete=False):
+        # Node of each document, by normalized URL and by document URL
+        self._nodes = {}
+        self._document_nodes = {}
+        nodes_links = []
+        for document_analysis in documents_analysis:
+            url = get_internal_url(document_analysis["url"] or "", "")
+            if url not in self._nodes:
+                self._nodes[url] = len(nodes_links)
+                nodes_links.append(
+                    document_analysis["seo_analysis"][
+                        "internal_link_analysis"
+                    ].internal_link_urls
+                )
+            self._document_nodes[document_analysis["url"]] = self._nodes[url]
+        self._documents_count = len(nodes_links)
+
+        for listing_url, linked_urls in listings:
+            url = get_internal_url(listing_url, "")
+            # Pelican URLs are relative to the site root, not to the listing.
+            # Each linked URL once, without the listing itself, like documents.
+            links = {get_internal_url(link, ""): None for link in linked_urls}
+            links.pop(url, None)
+            node = self._nodes.get(url)
+            if node is None:
+                self._nodes[url] = len(nodes_links)
+                nodes_links.append(links)
+            else:
+                # A document saved with the URL of a listing
+                nodes_links[node] = dict.fromkeys((*nodes_links[node], *links))
+
+        nodes_count = len(nodes_links)
+        self._offsets = array("l", [0])
+        self._targets = array("l")
+        self._inbound_counts = array("l", [0]) * nodes_count
+        for links in nodes_links:
+            for link in links:
+                target = self._nodes.get(link)
+                if target is not None:
+                    self._targets.append(target)
+                    self._inbound_counts[target] += 1
+            self._offsets.append(len(self._targets))
+
+        self._home = self._nodes.get(HOME_URL)
+        self._depths = self._get_depths(nodes_count)
+        self._authorities = self._get_authorities(nodes_count)
+
+        self.complete = complete and self._home is not None
+        self.orphans_count = sum(
+            1
+            for node in range(self._documents_count)
+            if not self._inbound_counts[node] and node != self._home
+        )
+
+    def _get_depths(self, nodes_count):
+        """
+        Return the link depth of each node from the home page,
+        with a breadth-first search. Unreachable nodes have a -1 depth.
+        """
+
+        depths = array("l", [-1]) * nodes_count
+        if self._home is None:
+            return depths
+
+        depths[self._home] = 0
+        frontier = [self._home]
+        depth = 0
+        while frontier:
+            depth += 1
+            next_frontier = []
+            for node in frontier:
+                for target in self._targets[
+                    self._offsets[node] : self._offsets[node + 1]
+                ]:
+                    if depths[target] < 0:
+                        depths[target] = depth
+                        next_frontier.append(target)
+            frontier = next_frontier
+
+        return depths
+
+    def _get_authorities(self, nodes_count):
+        """
+        Return the authority score of each node : its PageRank,
+        relative to the highest one of the documents, from 0 to 1.
+        Nodes without links share their score with all nodes.
+        """
+
+        if not self._documents_count:
+            return array("d", [0.0]) * nodes_count
+
+        if np is not None:
+            offsets = np.array(self._offsets, dtype=np.intp)
+            targets = np.array(self._targets, dtype=np.intp)
+            out_counts = np.diff(offsets)
+            sources = np.repeat(np.arange(nodes_count), out_counts)
+            dangling = out_counts == 0
+            # Avoid dividing by zero, dangling nodes have no link to share with
+            divisors = np.where(dangling, 1, out_counts)
+
+            ranks = np.full(nodes_count, 1 / nodes_count)
+            for _ in range(MAX_ITERATIONS):
+                base = 1 - DAMPING_FACTOR + DAMPING_FACTOR * ranks[dangling].sum()
+                shares = np.bincount(
+                    targets, weights=(ranks / divisors)[sources], minlength=nodes_count
+                )
+                next_ranks = base / nodes_count + DAMPING_FACTOR * shares
+                change = np.abs(next_ranks - ranks).sum()
+                ranks = next_ranks
+                if change < TOLERANCE:
+                    break
+
+            highest_rank = ranks[: self._documents_count].max()
+            return array("d", (ranks / highest_rank).tolist())
+
+        out_counts = [
+            self._offsets[node + 1] - self._offsets[node] for node in range(nodes_count)
+        ]
+        ranks = [1 / nodes_count] * nodes_count
+        for _ in range(MAX_ITERATIONS):
+            dangling_rank = sum(
+                rank for rank, out_count in zip(ranks, out_counts) if not out_count
+            )
+            base = (1 - DAMPING_FACTOR + DAMPING_FACTOR * dangling_rank) / nodes_count
+            next_ranks = [base] * nodes_count
+            for node, out_count in enumerate(out_counts):
+                if out_count:
+                    share = DAMPING_FACTOR * ranks[node] / out_count
+                    for target in self._targets[
+                        self._offsets[node] : self._offsets[node + 1]
+                    ]:
+                        next_ranks[target] += share
+            change = sum(abs(new - old) for new, old in zip(next_ranks, ranks))
+            ranks = next_ranks
+            if change < TOLERANCE:
+                break
+
+        highest_rank = max(ranks[: self._documents_count])
+        return array("d", (rank / highest_rank for rank in ranks))
+
+    def _get_node(self, document_analysis):
+        """Return the node of a document."""
+
+        return self._document_nodes[document_analysis["url"]]
+
+    @property
+    def has_home(self):
+        """Return True if the home page is one of the documents or listings."""
+
+        return self._home is not None
+
+    def get_inbound_count(self, document_analysis):
+        """Return the number of other documents and listings linking to it."""
+
+        return self._inbound_counts[self._get_node(document_analysis)]
+
+    def get_outbound_count(self, document_analysis):
+        """Return the number of other documents and listings it links to."""
+
+        node = self._get_node(document_analysis)
+        return self._offsets[node + 1] - self._offsets[node]
+
+    def get_depth(self, document_analysis):
+        """
+        Return the number of clicks needed to reach the document from the
+        home page, or None if it can't be reached or there is no home page.
+        """
+
+        depth = self._depths[self._get_node(document_analysis)]
+        return None if depth < 0 else depth
+
+    def get_authority(self, document_analysis):
+        """
+        Return the internal link authority of the document, from 0 to 1,
+        relative to the document with the highest authority.
+        """
+
+        return self._authorities[self._get_node(document_analysis)]
+
+    def get_url_authority(self, url):
+        """Return the internal link authority of the document with this URL."""
+
+        return self._authorities[self._document_nodes[url]]
+
+    def is_orphan(self, document_analysis):
+        """Return True if no other document or listing links to the document."""
+
+        node = self._get_node(document_analysis)
+        return not self._inbound_counts[node] and node != self._home
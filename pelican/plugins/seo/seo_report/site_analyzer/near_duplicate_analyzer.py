@@ -0,0 +1,141 @@
+"""Find documents with near-duplicate contents, from their SimHash."""
+
+from itertools import combinations
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+SIMHASH_BITS = 64
+
+
+class NearDuplicateAnalyzer:
+    """
+    Find documents whose content SimHashes differ by at most
+    :max_distance: bits, without comparing all the pairs.
+
+    Documents are grouped by SimHash, and only distinct SimHashes are
+    compared : many documents with the same content, like stub pages,
+    are a single group rather than all their pairs.
+    SimHashes are split into max_distance + 1 bands : two SimHashes close
+    enough have at least one identical band. SimHashes are bucketed by band
+    (LSH banding) and only SimHashes sharing a bucket are compared.
+    Documents without text are ignored.
+    """
+
+    def __init__(self, documents_analysis, max_distance=3):
+        self._max_distance = max_distance
+        # URLs of the documents, by SimHash, and SimHash of each URL
+        self._urls = {}
+        self._simhashes = {}
+
+        for document_analysis in documents_analysis:
+            simhash = document_analysis["seo_analysis"][
+                "content_fingerprint_analysis"
+            ].content_simhash
+            if simhash:
+                self._urls.setdefault(simhash, []).append(document_analysis["url"])
+                self._simhashes[document_analysis["url"]] = simhash
+
+        # Other SimHashes close enough to each SimHash
+        self._near_simhashes = {}
+        simhashes = list(self._urls)
+        for first, second in self._find_pairs(simhashes):
+            self._near_simhashes.setdefault(simhashes[first], []).append(
+                simhashes[second]
+            )
+            self._near_simhashes.setdefault(simhashes[second], []).append(
+                simhashes[first]
+            )
+
+        self.groups_count = self._count_groups()
+
+    def _count_groups(self):
+        """
+        Return the number of groups of documents linked to each other
+        by near-duplicate contents.
+        """
+
+        groups_count = 0
+        seen = set()
+        for simhash in self._urls:
+            if simhash in seen:
+                continue
+            seen.add(simhash)
+            group = [simhash]
+            documents_count = 0
+            while group:
+                group_simhash = group.pop()
+                documents_count += len(self._urls[group_simhash])
+                for near_simhash in self._near_simhashes.get(group_simhash, ()):
+                    if near_simhash not in seen:
+                        seen.add(near_simhash)
+                        group.append(near_simhash)
+            if documents_count > 1:
+                groups_count += 1
+
+        return groups_count
+
+    def _get_candidates(self, simhashes):
+        """Return the pairs of indexes of SimHashes sharing at least one band."""
+
+        bands = self._max_distance + 1
+        band_bits = -(-SIMHASH_BITS // bands)
+        band_mask = (1 << band_bits) - 1
+
+        candidates = set()
+        for band in range(bands):
+            buckets = {}
+            for index, simhash in enumerate(simhashes):
+                buckets.setdefault(
+                    (simhash >> (band * band_bits)) & band_mask, []
+                ).append(index)
+            for bucket in buckets.values():
+                candidates.update(combinations(bucket, 2))
+
+        return sorted(candidates)
+
+    def _find_pairs(self, simhashes):
+        """Return the pairs of indexes of SimHashes close enough."""
+
+        candidates = self._get_candidates(simhashes)
+        if not candidates:
+            return []
+
+        if np is not None:
+            signatures = np.array(simhashes, dtype=np.uint64)
+            first, second = np.array(candidates, dtype=np.intp).T
+            differences = (signatures[first] ^ signatures[second]).astype(">u8")
+            distances = (
+                np.unpackbits(differences.view(np.uint8))
+                .reshape(len(candidates), SIMHASH_BITS)
+                .sum(axis=1)
+            )
+            return [
+                candidates[index]
+                for index in np.flatnonzero(distances <= self._max_distance)
+            ]
+
+        return [
+            (first, second)
+            for first, second in candidates
+            if bin(simhashes[first] ^ simhashes[second]).count("1")
+            <= self._max_distance
+        ]
+
+    def get_near_duplicates(self, document_analysis):
+        """Return the URLs of the documents with a content close to the given one."""
+
+        url = document_analysis["url"]
+        simhash = self._simhashes.get(url)
+        if simhash is None:
+            return []
+
+        near_duplicates = [
+            other_url for other_url in self._urls[simhash] if other_url != url
+        ]
+        for near_simhash in self._near_simhashes.get(simhash, ()):
+            near_duplicates.extend(self._urls[near_simhash])
+
+        return near_duplicates
@@ -1,10 +1,44 @@
 """Plugin settings : activate or deactivate SEO features."""
 
+# Beautiful Soup parser : "auto" (lxml if installed), "lxml", "html5lib", "html.parser"
+SEO_HTML_PARSER = "auto"
+
 SEO_REPORT = True
+# Report files : "html" (seo_report.html), "jsonl" (seo_report.jsonl), "csv"
+SEO_REPORT_FORMATS = ("html",)
+# Analyze documents with a pool of processes
+SEO_REPORT_PARALLEL = False
+SEO_REPORT_PROCESSES = None  # Number of CPUs by default
+# Only analyze documents that changed since the last build
+SEO_REPORT_CACHE = False
+# Split the report in pages grouped by "section", "category" or "date", None to disable
+SEO_REPORT_SHARD_BY = None
+SEO_REPORT_SHARD_SIZE = 500  # Documents by page
 SEO_ENHANCER = False
 SEO_ENHANCER_OPEN_GRAPH = False
 SEO_ENHANCER_TWITTER_CARDS = False
+# Write sitemap.xml, split in files of 50,000 URLs listed in sitemap_index.xml
+SEO_ENHANCER_SITEMAP = False
+SEO_ENHANCER_SITEMAP_GZIP = False
 SEO_ENHANCER_SITEMAP_URL = None
+# Sitemap priority from the internal link authority of each article and page
+SEO_ENHANCER_SITEMAP_PRIORITY = False
+# Use a single robots.txt rule for directories whose URLs all have the same rule
+SEO_ENHANCER_ROBOTS_COMPACT = False
+# Enhance all HTML files at the end of the build, with a pool of processes
+SEO_ENHANCER_DEFERRED = False
+SEO_ENHANCER_PROCESSES = None  # Number of CPUs by default
+# Enhance HTML files in background threads while Pelican writes the next ones
+SEO_ENHANCER_BACKGROUND = False
+SEO_ENHANCER_BACKGROUND_THREADS = 1
+SEO_ENHANCER_BACKGROUND_QUEUE_SIZE = 100
+# Keep the modification time of HTML files that didn't change since the last build
+SEO_ENHANCER_MANIFEST = False
+# Remember the content hash of each document URL in CACHE_PATH, for accurate lastmod
+SEO_ENHANCER_URL_STATES = False
+# IndexNow key : write its key file and the URLs changed since the previous build
+SEO_ENHANCER_INDEXNOW_KEY = None
 
+# Number of articles and pages to analyze, None to analyze all of them
 SEO_ARTICLES_LIMIT = 10
 SEO_PAGES_LIMIT = 10
@@ -5,8 +5,10 @@ from datetime import datetime
 import pytest
 
 from pelican.contents import Article
-from pelican.settings import DEFAULT_CONFIG
+from pelican.generators import ArticlesGenerator, PagesGenerator
+from pelican.settings import DEFAULT_CONFIG, read_settings
 
+from seo.html_parser import HTML_PARSERS
 from seo.seo_enhancer import SEOEnhancer
 from seo.seo_report import SEOReport
 
@@ -259,11 +261,48 @@ def fake_article_multiple_elements():
     )
 
 
+@pytest.fixture(params=HTML_PARSERS)
+def html_parser(request):
+    """Run the test with each HTML parser that is installed."""
+
+    if request.param != "html.parser":
+        pytest.importorskip(request.param)
+
+    return request.param
+
+
 @pytest.fixture()
-def fake_seo_report():
+def fake_seo_report(html_parser):
     """Create a fake seo report instance."""
 
-    return SEOReport()
+    return SEOReport(html_parser=html_parser)
+
+
+@pytest.fixture()
+def analyze_document(fake_seo_report):
+    """
+    Return a function analyzing a document from its url, its linked hrefs
+    or its HTML content, and its texts.
+    """
+
+    def _analyze_document(url, hrefs=(), title="Title", description="", content=None):
+        if content is None:
+            links = "".join(f'<a href="{href}">Link</a>' for href in hrefs)
+            content = f"<p>{links}</p>"
+        return fake_seo_report.analyze(
+            {
+                "url": url,
+                "date": None,
+                "section": "articles",
+                "category": None,
+                "title": title,
+                "description": description,
+                "content": content,
+                "siteurl": "https://www.fakesite.com",
+            }
+        )
+
+    return _analyze_document
 
 
 @pytest.fixture()
@@ -311,7 +350,65 @@ def fake_articles_analysis(
 
 
 @pytest.fixture()
-def fake_seo_enhancer():
+def fake_seo_enhancer(html_parser):
     """Create a fake seo enhancer instance."""
 
-    return SEOEnhancer()
+    return SEOEnhancer(html_parser=html_parser)
+
+
+@pytest.fixture()
+def generate_site(tmp_path):
+    """
+    Return a function writing the content of a site in tmp_path, and
+    returning the Pelican generators with their context generated, with the
+    given settings : five articles in one category, one by listing page,
+    and a page.
+    """
+
+    def _generate_site(**settings):
+        content_path = tmp_path / "content"
+        (content_path / "pages").mkdir(parents=True)
+        for number in range(1, 6):
+            (content_path / f"post-{number}.html").write_text(
+                f"<html><head><title>Post {number}</title>"
+                f'<meta name="date" content="2024-01-0{number}">'
+                '<meta name="category" content="News">'
+                f"</head><body><p>Post {number}</p></body></html>"
+            )
+        (content_path / "pages" / "about.html").write_text(
+            "<html><head><title>About</title></head><body><p>About</p></body></html>"
+        )
+
+        settings = read_settings(
+            override={
+                "PATH": str(content_path),
+                "OUTPUT_PATH": str(tmp_path / "output"),
+                "CACHE_PATH": str(tmp_path / "cache"),
+                "DEFAULT_PAGINATION": 1,
+                **settings,
+            }
+        )
+        # Like Pelican.run
+        context = {
+            **settings,
+            "generated_content": {},
+            "static_links": set(),
+            "static_content": {},
+            "localsiteurl": settings["SITEURL"],
+        }
+        generators = [
+            generator_class(
+                context=context,
+                settings=settings,
+                path=settings["PATH"],
+                theme=settings["THEME"],
+                output_path=settings["OUTPUT_PATH"],
+            )
+            for generator_class in (ArticlesGenerator, PagesGenerator)
+        ]
+        for generator in generators:
+            generator.generate_context()
+
+        return generators
+
+    return _generate_site
@@ -0,0 +1,148 @@
+"""Units tests for Analysis Cache."""
+
+import json
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from seo.seo_report.analysis_cache import AnalysisCache
+
+
+def _findings(seo_analysis):
+    return {
+        name: [getattr(analyzer, slot) for slot in analyzer.__slots__]
+        for name, analyzer in seo_analysis.items()
+    }
+
+
+class TestAnalysisCache:
+    """Units tests for AnalysisCache."""
+
+    def test_get_gives_back_the_recorded_analysis(self, fake_seo_report, fake_article):
+        """Test that a saved analysis is given back by the next build, as analyzers."""
+
+        seo_analysis = fake_seo_report.launch_analysis(fake_article)["seo_analysis"]
+
+        with TemporaryDirectory() as tmp_dir_name:
+            cache_path = str(Path(tmp_dir_name) / "cache" / "seo_report_cache.json")
+            cache = AnalysisCache()
+
+            cache.load(cache_path)
+            assert cache.get("key") is None
+            cache.record("key", seo_analysis)
+            cache.save()
+            assert not cache.loaded
+
+            cache.load(cache_path)
+            cached_analysis = cache.get("key")
+
+        assert {name: type(analyzer) for name, analyzer in cached_analysis.items()} == {
+            name: type(analyzer) for name, analyzer in seo_analysis.items()
+        }
+        assert _findings(cached_analysis) == _findings(seo_analysis)
+
+    def test_save_evicts_documents_not_analyzed_during_the_build(
+        self, fake_seo_report, fake_article
+    ):
+        """Test that only the documents used during the build are saved."""
+
+        seo_analysis = fake_seo_report.launch_analysis(fake_article)["seo_analysis"]
+
+        with TemporaryDirectory() as tmp_dir_name:
+            cache_path = str(Path(tmp_dir_name) / "seo_report_cache.json")
+            cache = AnalysisCache()
+
+            cache.load(cache_path)
+            cache.record("kept", seo_analysis)
+            cache.record("removed", seo_analysis)
+            cache.save()
+
+            cache.load(cache_path)
+            assert cache.get("kept")
+            cache.save()
+
+            cache.load(cache_path)
+            assert cache.get("kept")
+            assert cache.get("removed") is None
+
+    def test_load_ignores_another_plugin_version(self, fake_seo_report, fake_article):
+        """Test that the cache of another plugin version is not used."""
+
+        seo_analysis = fake_seo_report.launch_analysis(fake_article)["seo_analysis"]
+
+        with TemporaryDirectory() as tmp_dir_name:
+            cache_path = Path(tmp_dir_name) / "seo_report_cache.json"
+            cache = AnalysisCache()
+
+            with patch(
+                "seo.seo_report.analysis_cache.get_plugin_version", return_value="1.0"
+            ):
+                cache.load(str(cache_path))
+                cache.record("key", seo_analysis)
+                cache.save()
+            assert json.loads(cache_path.read_text())["documents"]
+
+            with patch(
+                "seo.seo_report.analysis_cache.get_plugin_version", return_value="2.0"
+            ):
+                cache.load(str(cache_path))
+                assert cache.get("key") is None
+
+            cache_path.write_text("not json")
+            cache.load(str(cache_path))
+            assert cache.get("key") is None
+
+    def test_key_depends_on_analyzed_fields(self, fake_seo_report, fake_article):
+        """Test that the key changes with the URL, the content and the parser only."""
+
+        inputs = fake_seo_report.get_analysis_inputs(fake_article)
+        key = AnalysisCache.key(inputs, "html.parser")
+
+        assert AnalysisCache.key(dict(inputs, date="2020-01-01"), "html.parser") == key
+        assert AnalysisCache.key(dict(inputs, url="moved.html"), "html.parser") != key
+        assert AnalysisCache.key(dict(inputs, content="Changed"), "html.parser") != key
+        assert AnalysisCache.key(inputs, "lxml") != key
+
+    def test_launch_analyses_only_analyzes_changed_documents(
+        self,
+        fake_seo_report,
+        fake_article,
+        fake_article_missing_elements,
+        fake_article_multiple_elements,
+    ):
+        """
+        Test that launch_analyses with a cache only analyzes documents
+        it doesn't hold, and gives the same analysis in the same order.
+        """
+
+        documents = [
+            fake_article,
+            fake_article_missing_elements,
+            fake_article_multiple_elements,
+        ]
+        expected = [
+            (analysis["url"], _findings(analysis["seo_analysis"]))
+            for analysis in fake_seo_report.launch_analyses(documents, processes=1)
+        ]
+
+        with TemporaryDirectory() as tmp_dir_name:
+            cache_path = str(Path(tmp_dir_name) / "seo_report_cache.json")
+            cache = AnalysisCache()
+
+            cache.load(cache_path)
+            fake_seo_report.launch_analyses(documents[1:], processes=1, cache=cache)
+            cache.save()
+
+            cache.load(cache_path)
+            with patch.object(
+                fake_seo_report, "analyze", wraps=fake_seo_report.analyze
+            ) as mocked_analyze:
+                documents_analysis = fake_seo_report.launch_analyses(
+                    documents, processes=1, cache=cache
+                )
+
+        mocked_analyze.assert_called_once()
+        assert [
+            (analysis["url"], _findings(analysis["seo_analysis"]))
+            for analysis in documents_analysis
+        ] == expected
@@ -0,0 +1,144 @@
+"""Units tests for Broken Link Analyzer."""
+
+from collections import namedtuple
+
+from pelican.generators import ArticlesGenerator, PagesGenerator, StaticGenerator
+from pelican.settings import read_settings
+from seo.seo import get_site_urls
+from seo.seo_report.site_analyzer import BrokenLinkAnalyzer
+
+Content = namedtuple("Content", ["url", "save_as", "slug"])
+
+
+def _content(url, save_as=None, slug=None):
+    return Content(url, url if save_as is None else save_as, slug)
+
+
+def _generator(generator_class, settings, **attributes):
+    generator = generator_class.__new__(generator_class)
+    generator.settings = settings
+    for name, value in attributes.items():
+        setattr(generator, name, value)
+    return generator
+
+
+class TestBrokenLinkAnalyzer:
+    """Units tests for BrokenLinkAnalyzer."""
+
+    def test_get_broken_links_lists_unknown_urls(self, analyze_document):
+        """Test that only internal links to unknown URLs are broken."""
+
+        first = analyze_document(
+            "first.html",
+            [
+                "second.html",
+                "https://www.fakesite.com/images/logo%20big.png",
+                "https://www.fakesite.com/missing.html#top",
+                "https://www.test.com/missing.html",
+            ],
+        )
+        second = analyze_document("second.html", ["first.html"])
+        broken_link_analyzer = BrokenLinkAnalyzer(
+            [first, second], {"first.html", "second.html", "images/logo big.png"}
+        )
+
+        assert broken_link_analyzer.get_broken_links(first) == ["missing.html"]
+        assert broken_link_analyzer.get_broken_links(second) == []
+        assert broken_link_analyzer.broken_links_count == 1
+
+    def test_report_lists_broken_links(
+        self, fake_seo_report, analyze_document, tmp_path, monkeypatch
+    ):
+        """Test that the report lists broken links only if site URLs are given."""
+
+        monkeypatch.chdir(tmp_path)
+        documents_analysis = [analyze_document("first.html", ["missing.html"])]
+
+        fake_seo_report.generate("Fake site", documents_analysis)
+        report = (tmp_path / "seo_report.html").read_text(encoding="utf8")
+        assert "Broken internal link analysis" not in report
+
+        fake_seo_report.generate(
+            "Fake site",
+            documents_analysis,
+            site_analysis=fake_seo_report.analyze_site(
+                documents_analysis, site_urls={"first.html"}
+            ),
+        )
+        report = (tmp_path / "seo_report.html").read_text(encoding="utf8")
+        assert (
+            "1 internal links lead to pages the site doesn't have: missing.html"
+        ) in report
+
+
+def test_get_site_urls(tmp_path):
+    """
+    Test that get_site_urls returns the URLs of all written contents,
+    taxonomies, direct templates with their paginated pages, period archives,
+    feeds and theme static files.
+    """
+
+    (tmp_path / "static" / "css").mkdir(parents=True)
+    (tmp_path / "static" / "css" / "main.css").write_text("")
+    settings = read_settings(
+        override={
+            "THEME": str(tmp_path),
+            "CATEGORY_FEED_ATOM": "feeds/{slug}.atom.xml",
+            "DEFAULT_PAGINATION": 1,
+        }
+    )
+    articles = [
+        _content("posts/first/", "posts/first/index.html"),
+        _content("posts/second.html"),
+    ]
+    category = _content("category/news.html", slug="news")
+    generators = [
+        _generator(
+            ArticlesGenerator,
+            settings,
+            articles=articles,
+            translations=[_content("first-fr.html")],
+            drafts=[_content("drafts/draft.html")],
+            categories=[(category, articles[:1])],
+            tags={_content("tag/python.html", slug="python"): articles},
+            authors=[],
+            period_archives={
+                "year": [
+                    {
+                        "save_as": "2024/index.html",
+                        "url": "2024/",
+                        "articles": articles,
+                        "dates": articles,
+                    }
+                ]
+            },
+        ),
+        _generator(
+            PagesGenerator,
+            settings,
+            pages=[_content("pages/about.html")],
+            hidden_pages=[_content("hidden.html", save_as="")],
+        ),
+        _generator(StaticGenerator, settings, staticfiles=[_content("images/a.png")]),
+    ]
+
+    site_urls = get_site_urls(generators)
+
+    assert {
+        "",
+        "posts/first/",
+        "first-fr.html",
+        "drafts/draft.html",
+        "category/news.html",
+        "tag/python.html",
+        "pages/about.html",
+        "images/a.png",
+        "archives.html",
+        "index2.html",
+        "tag/python2.html",
+        "2024/",
+        "feeds/all.atom.xml",
+        "feeds/news.atom.xml",
+        "theme/css/main.css",
+    } <= site_urls
+    assert "hidden.html" not in site_urls
@@ -0,0 +1,47 @@
+"""Unit tests for Document Facts."""
+
+from unittest.mock import patch
+
+from bs4 import BeautifulSoup
+
+from seo.seo_report.seo_analyzer import DocumentFacts, SEOAnalyzer
+
+
+class TestDocumentFacts:
+    """Units tests for DocumentFacts."""
+
+    def test_document_facts(self, fake_article_multiple_elements, html_parser):
+        """Test that all facts are extracted from the content."""
+
+        content = fake_article_multiple_elements.content.replace(
+            "<p>Fake content 🙃</p>",
+            "<h2>Sub title</h2><img src='fake.jpg' alt='Fake image'><img src='x.jpg'>",
+        )
+        document_facts = DocumentFacts(content, html_parser=html_parser)
+
+        assert document_facts.h1_count == 2
+        assert document_facts.headings == [
+            (1, "Content title"),
+            (2, "Sub title"),
+            (1, "Multiple content title"),
+        ]
+        assert document_facts.links == [
+            "https://www.fakesite.com",
+            "https://www.test.com",
+            "https://www.fakesite.com/test/",
+        ]
+        assert document_facts.images == [("fake.jpg", "Fake image"), ("x.jpg", None)]
+        assert document_facts.text_length == len(
+            BeautifulSoup(content, features=html_parser).get_text()
+        )
+
+    def test_content_is_parsed_once(self, fake_article):
+        """Test that SEOAnalyzer parses the content once for all analyzers."""
+
+        with patch(
+            "seo.seo_report.seo_analyzer.document_facts.BeautifulSoup",
+            wraps=BeautifulSoup,
+        ) as mocked_soup:
+            SEOAnalyzer(fake_article)
+
+        mocked_soup.assert_called_once()
@@ -0,0 +1,75 @@
+"""Units tests for Duplicate Analyzer."""
+
+from seo.seo_report.site_analyzer import DuplicateAnalyzer
+
+
+class TestDuplicateAnalyzer:
+    """Units tests for DuplicateAnalyzer."""
+
+    def test_get_duplicates_lists_the_other_documents_by_field(self, analyze_document):
+        """
+        Test that documents with the same texts, ignoring case and whitespace,
+        are listed as duplicates of each other.
+        """
+
+        first = analyze_document(
+            "first.html",
+            title="Fake Title",
+            description="Description",
+            content="<h1>Title</h1>",
+        )
+        second = analyze_document(
+            "second.html",
+            title=" fake  title",
+            description="Other",
+            content="<h1>TITLE</h1>",
+        )
+        third = analyze_document(
+            "third.html",
+            title="Other title",
+            description="Other",
+            content="<h1>Title</h1>",
+        )
+        duplicate_analyzer = DuplicateAnalyzer([first, second, third])
+
+        assert duplicate_analyzer.get_duplicates(first) == {
+            "page_title": ["second.html"],
+            "content_title": ["second.html", "third.html"],
+        }
+        assert duplicate_analyzer.get_duplicates(third) == {
+            "page_description": ["second.html"],
+            "content_title": ["first.html", "second.html"],
+        }
+        assert duplicate_analyzer.count_duplicate_groups("page_title") == 1
+        assert duplicate_analyzer.count_duplicate_groups("content_title") == 1
+
+    def test_missing_texts_are_not_duplicates(self, analyze_document):
+        """Test that documents without a text don't share it."""
+
+        first = analyze_document("first.html", title="First")
+        second = analyze_document("second.html", title="Second")
+        duplicate_analyzer = DuplicateAnalyzer([first, second])
+
+        assert duplicate_analyzer.get_duplicates(first) == {}
+        assert duplicate_analyzer.count_duplicate_groups("page_description") == 0
+
+    def test_report_lists_duplicate_urls(
+        self, fake_seo_report, analyze_document, tmp_path, monkeypatch
+    ):
+        """Test that the report of a document lists the URLs sharing its texts."""
+
+        monkeypatch.chdir(tmp_path)
+        documents_analysis = [
+            analyze_document(f"page-{number}.html", title="Same title")
+            for number in range(12)
+        ]
+
+        fake_seo_report.generate("Fake site", documents_analysis)
+
+        report = (tmp_path / "seo_report.html").read_text(encoding="utf8")
+        assert report.count("Your title is also used by 11 other documents") == 12
+        assert (
+            "Your title is also used by 11 other documents: "
+            + ", ".join(f"page-{number}.html" for number in range(1, 11))
+            + ", ..."
+        ) in report
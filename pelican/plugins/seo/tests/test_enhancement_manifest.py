@@ -0,0 +1,56 @@
+"""Units tests for Enhancement Manifest."""
+
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from seo.seo_enhancer.enhancement_manifest import EnhancementManifest
+
+
+class TestEnhancementManifest:
+    """Units tests for EnhancementManifest."""
+
+    def test_hash_enhancements_ignores_keys_order(self):
+        """Test that the same enhancements in another order have the same hash."""
+
+        assert EnhancementManifest.hash_enhancements(
+            {"canonical_tag": "a", "open_graph": {"title": "b", "url": "c"}}
+        ) == EnhancementManifest.hash_enhancements(
+            {"open_graph": {"url": "c", "title": "b"}, "canonical_tag": "a"}
+        )
+
+    def test_load_missing_or_invalid_file(self):
+        """Test that a missing or invalid manifest file gives an empty manifest."""
+
+        with TemporaryDirectory() as tmp_dir_name:
+            manifest_path = Path(tmp_dir_name) / "manifest.json"
+            manifest = EnhancementManifest()
+
+            manifest.load(str(manifest_path))
+            assert manifest.loaded
+            assert manifest.get("index.html") == {}
+
+            manifest_path.write_text("not json")
+            manifest.load(str(manifest_path))
+            assert manifest.get("index.html") == {}
+
+    def test_save_prunes_files_not_enhanced_during_the_build(self):
+        """Test that only the states recorded during the build are saved."""
+
+        with TemporaryDirectory() as tmp_dir_name:
+            manifest_path = str(Path(tmp_dir_name) / "cache" / "manifest.json")
+            manifest = EnhancementManifest()
+
+            manifest.load(manifest_path)
+            manifest.record("kept.html", {"source": "1"})
+            manifest.record("removed.html", {"source": "2"})
+            manifest.save()
+            assert not manifest.loaded
+
+            manifest.load(manifest_path)
+            assert manifest.get("removed.html") == {"source": "2"}
+            manifest.record("kept.html", {"source": "3"})
+            manifest.save()
+
+            manifest.load(manifest_path)
+            assert manifest.get("kept.html") == {"source": "3"}
+            assert manifest.get("removed.html") == {}
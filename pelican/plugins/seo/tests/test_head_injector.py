@@ -0,0 +1,150 @@
+"""Units tests for Head Injector."""
+
+import pytest
+
+from seo.seo_enhancer.head_injector import BLOCK_START, HeadInjector
+
+
+@pytest.fixture()
+def fake_html_enhancements(fake_article, fake_seo_enhancer):
+    """Create HTML enhancements with every feature enabled."""
+
+    return fake_seo_enhancer.launch_html_enhancer(
+        file=fake_article,
+        output_path="fake_output",
+        path="fake_output/fake_file.html",
+        open_graph=True,
+        twitter_cards=True,
+    )
+
+
+class TestHeadInjector:
+    """Units tests for HeadInjector."""
+
+    def test_inject_keeps_the_rest_of_the_document_untouched(
+        self, fake_html_enhancements
+    ):
+        """Test that only the enhancements are added, right before </head>."""
+
+        html_content = (
+            "<html>\r\n<HEAD><meta name='description' content='A &amp; B' >\r\n"
+            "</HEAD >\r\n<body><p class=x>Unclosed paragraph</body></html>"
+        )
+
+        enhanced_content = HeadInjector(fake_html_enhancements).inject(html_content)
+
+        head_end = html_content.index("</HEAD >")
+        assert enhanced_content.startswith(html_content[:head_end])
+        assert enhanced_content.endswith(html_content[head_end:])
+        assert len(enhanced_content) > len(html_content)
+
+    def test_inject_returns_none_without_closing_head_tag(self, fake_html_enhancements):
+        """Test that inject returns None when there is no </head> to splice into."""
+
+        html_content = "<html><head><title>Fake</title><body></body></html>"
+
+        assert HeadInjector(fake_html_enhancements).inject(html_content) is None
+
+    @pytest.mark.parametrize(
+        "head_content",
+        (
+            '<script>var s = "</head>";</script>',
+            "<style>/* </head> */</style>",
+            "<!-- </head> -->",
+            "<title>Fake </HEAD> title</title>",
+        ),
+    )
+    def test_inject_skips_closing_head_tag_in_text(
+        self, fake_html_enhancements, head_content
+    ):
+        """
+        Test that a "</head>" in a comment, or in the text of a script,
+        style or title element, is not taken for the closing tag.
+        """
+
+        html_content = f"<html><head>{head_content}</head><body></body></html>"
+
+        enhanced_content = HeadInjector(fake_html_enhancements).inject(html_content)
+
+        assert enhanced_content.startswith(f"<html><head>{head_content}{BLOCK_START}")
+        assert enhanced_content.endswith("</head><body></body></html>")
+
+    def test_inject_returns_none_in_unclosed_comment(self, fake_html_enhancements):
+        """Test that inject returns None when </head> is in an unclosed comment."""
+
+        html_content = "<html><head><!-- </head><body></body></html>"
+
+        assert HeadInjector(fake_html_enhancements).inject(html_content) is None
+
+    def test_inject_matches_bs4_enhancement(
+        self, fake_html_enhancements, fake_seo_enhancer
+    ):
+        """Test that injected tags have the same markup as the bs4 enhancement."""
+
+        html_content = "<html><head><title>Fake</title></head><body></body></html>"
+
+        assert HeadInjector(fake_html_enhancements).inject(
+            html_content
+        ) == fake_seo_enhancer._add_html_with_bs4(
+            enhancements=fake_html_enhancements, html_content=html_content
+        )
+
+    def test_render_tags_escapes_attributes_and_schemas(self):
+        """Test that values can't break out of attributes or script elements."""
+
+        enhancements = {
+            "canonical_tag": 'https://www.fakesite.com/?a=1&b="2"',
+            "breadcrumb_schema": {"name": "</script><script>alert(1)"},
+            "open_graph": {"title": "Fish & <Chips>"},
+        }
+
+        tags = HeadInjector(enhancements).render_tags()
+
+        assert tags == [
+            '<link href="https://www.fakesite.com/?a=1&amp;b=&quot;2&quot;"'
+            ' rel="canonical"/>',
+            '<script type="application/ld+json">'
+            '{"name": "<\\/script><script>alert(1)"}</script>',
+            '<meta content="Fish &amp; &lt;Chips&gt;" property="og:title"/>',
+        ]
+
+    def test_inject_is_idempotent(self, fake_html_enhancements, fake_article):
+        """Test that injecting twice gives the same document as injecting once."""
+
+        head_injector = HeadInjector(fake_html_enhancements)
+        enhanced_content = head_injector.inject(fake_article.content)
+
+        assert head_injector.inject(enhanced_content) == enhanced_content
+        assert enhanced_content.count(BLOCK_START) == 1
+        assert enhanced_content.count('rel="canonical"') == 1
+
+    def test_inject_replaces_previous_block(self, fake_html_enhancements, fake_article):
+        """Test that a block injected by a previous run is replaced in place."""
+
+        enhanced_content = HeadInjector(fake_html_enhancements).inject(
+            fake_article.content
+        )
+        fake_html_enhancements["canonical_tag"] = "https://www.fakesite.com/new.html"
+
+        new_content = HeadInjector(fake_html_enhancements).inject(enhanced_content)
+
+        assert new_content.count(BLOCK_START) == 1
+        assert 'href="https://www.fakesite.com/new.html"' in new_content
+        assert 'href="https://www.fakesite.com/fake-title.html"' not in new_content
+
+    def test_inject_skips_tags_provided_by_the_theme(self, fake_html_enhancements):
+        """Test that tags the theme already provides are not added again."""
+
+        html_content = """<html><head>
+<link rel="canonical" href="https://www.fakesite.com/theme.html">
+<meta property="og:title" content="Theme title">
+<script type="application/ld+json">{"@type": "BreadcrumbList"}</script>
+</head><body></body></html>"""
+
+        tags = HeadInjector(fake_html_enhancements).render_tags(html_content)
+
+        assert not [tag for tag in tags if 'rel="canonical"' in tag]
+        assert not [tag for tag in tags if 'property="og:title"' in tag]
+        assert not [tag for tag in tags if "BreadcrumbList" in tag]
+        assert [tag for tag in tags if '"@type": "Article"' in tag]
+        assert [tag for tag in tags if 'property="og:url"' in tag]
@@ -0,0 +1,28 @@
+"""Units tests for HTML parser selection."""
+
+from importlib.util import find_spec
+
+import pytest
+
+from seo.html_parser import get_html_parser
+
+
+class TestHTMLParser:
+    """Units tests for get_html_parser."""
+
+    def test_auto_prefers_lxml(self):
+        """Test that auto selects lxml if installed, html.parser otherwise."""
+
+        expected_parser = "lxml" if find_spec("lxml") else "html.parser"
+        assert get_html_parser("auto") == expected_parser
+
+    def test_installed_parser(self, html_parser):
+        """Test that an installed parser is selected as is."""
+
+        assert get_html_parser(html_parser) == html_parser
+
+    def test_unknown_parser(self):
+        """Test that an unknown parser raises."""
+
+        with pytest.raises(Exception, match="Unknown SEO_HTML_PARSER"):
+            get_html_parser("fake-parser")
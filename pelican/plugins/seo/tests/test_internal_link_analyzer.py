@@ -6,7 +6,7 @@ from seo.seo_report.seo_analyzer import InternalLinkAnalyzer
 class TestInternalLinkAnalyzer:
     """Units tests for InternalLinkAnalyzer."""
 
-    def test_article_has_internal_link(self, fake_article):
+    def test_article_has_internal_link(self, fake_article, html_parser):
         """
         Test if has_internal_link returns True
         if fake_article has at least one internal link.
@@ -15,10 +15,13 @@ class TestInternalLinkAnalyzer:
         fake_analysis = InternalLinkAnalyzer(
             content=fake_article.content,
             siteurl=fake_article.settings["SITEURL"],
+            html_parser=html_parser,
         )
         assert fake_analysis.has_internal_link()
 
-    def test_article_has_no_internal_link(self, fake_article_missing_elements):
+    def test_article_has_no_internal_link(
+        self, fake_article_missing_elements, html_parser
+    ):
         """
         Test if has_internal_link returns False
         if fake_article has no internal link.
@@ -27,14 +30,65 @@ class TestInternalLinkAnalyzer:
         fake_analysis = InternalLinkAnalyzer(
             content=fake_article_missing_elements.content,
             siteurl=fake_article_missing_elements.settings["SITEURL"],
+            html_parser=html_parser,
         )
         assert not fake_analysis.has_internal_link()
 
-    def test_article_internal_link_occurrence(self, fake_article_multiple_elements):
+    def test_article_internal_link_occurrence(
+        self, fake_article_multiple_elements, html_parser
+    ):
         """Test if internal_link_occurrence returns the rigth length."""
 
         fake_analysis = InternalLinkAnalyzer(
             content=fake_article_multiple_elements.content,
             siteurl=fake_article_multiple_elements.settings["SITEURL"],
+            html_parser=html_parser,
         )
         assert fake_analysis.internal_link_occurrence == 2
+
+    def test_internal_link_occurrence_parses_links(self, html_parser):
+        """
+        Test that relative links are internal, and that external links
+        containing the site URL are not.
+        """
+
+        fake_analysis = InternalLinkAnalyzer(
+            content=(
+                '<a href="/about/">About</a>'
+                '<a href="../tags.html">Tags</a>'
+                '<a href="#comments">Comments</a>'
+                '<a href="https://www.test.com/?from=https://www.fakesite.com">Test</a>'
+            ),
+            siteurl="https://www.fakesite.com",
+            html_parser=html_parser,
+            url="blog/post.html",
+        )
+        assert fake_analysis.internal_link_occurrence == 2
+        assert fake_analysis.internal_link_urls == ("about/", "tags.html")
+
+    def test_malformed_link_is_external(self, html_parser):
+        """Test that a malformed link doesn't stop the analysis."""
+
+        fake_analysis = InternalLinkAnalyzer(
+            content='<a href="http://[oops/x">Oops</a><a href="/about/">About</a>',
+            siteurl="https://www.fakesite.com",
+            html_parser=html_parser,
+            url="post.html",
+        )
+        assert fake_analysis.internal_link_urls == ("about/",)
+
+    def test_article_internal_link_urls(
+        self, fake_article_multiple_elements, html_parser
+    ):
+        """
+        Test that internal_link_urls returns each internal URL once,
+        relative to the site root.
+        """
+
+        fake_analysis = InternalLinkAnalyzer(
+            content=fake_article_multiple_elements.content,
+            siteurl=fake_article_multiple_elements.settings["SITEURL"],
+            html_parser=html_parser,
+            url=fake_article_multiple_elements.url,
+        )
+        assert fake_analysis.internal_link_urls == ("", "test/")
@@ -0,0 +1,29 @@
+"""Unit tests for Internal URL."""
+
+import pytest
+
+from seo.internal_url import get_internal_url
+
+
+@pytest.mark.parametrize(
+    ("href", "document_url", "expected"),
+    [
+        ("https://www.fakesite.com", "post.html", ""),
+        ("https://www.fakesite.com/blog/index.html", "post.html", "blog/"),
+        ("../about.html?ref=post#team", "blog/post.html", "about.html"),
+        ("/tag/python.html", "blog/post.html", "tag/python.html"),
+        ("#comments", "blog/post.html", "blog/post.html"),
+        ("", "blog/", "blog/"),
+        ("/about/", "blog/post.html", "about/"),
+        ("https://www.test.com/post.html", "post.html", None),
+        ("https://www.test.com/?from=https://www.fakesite.com", "post.html", None),
+        ("http://www.fakesite.com/post.html", "post.html", None),
+        ("mailto:contact@fakesite.com", "post.html", None),
+        ("http://[oops/x", "post.html", None),
+        ("//[oops/x", "blog/post.html", None),
+    ],
+)
+def test_get_internal_url(href, document_url, expected):
+    """Test that internal links are resolved and normalized, external are None."""
+
+    assert get_internal_url(href, "https://www.fakesite.com", document_url) == expected
@@ -0,0 +1,187 @@
+"""Units tests for Link Graph Analyzer."""
+
+import pytest
+
+from seo.seo_report.site_analyzer import LinkGraphAnalyzer, link_graph_analyzer
+
+
+class TestLinkGraphAnalyzer:
+    """Units tests for LinkGraphAnalyzer."""
+
+    def test_counts_links_between_documents(self, analyze_document):
+        """
+        Test that only links between documents are counted, whatever
+        their form, and that documents without inbound links are orphans.
+        """
+
+        first = analyze_document(
+            "first.html",
+            [
+                "https://www.fakesite.com/second.html",
+                "second.html#comments",
+                "https://www.fakesite.com/category/news.html",
+                "https://www.test.com/third.html",
+            ],
+        )
+        second = analyze_document("second.html", ["/first.html", "third.html"])
+        third = analyze_document("third.html", ["third.html"])
+        link_graph_analyzer = LinkGraphAnalyzer([first, second, third])
+
+        assert link_graph_analyzer.get_outbound_count(first) == 1
+        assert link_graph_analyzer.get_outbound_count(second) == 2
+        assert link_graph_analyzer.get_outbound_count(third) == 0
+        assert link_graph_analyzer.get_inbound_count(first) == 1
+        assert link_graph_analyzer.get_inbound_count(third) == 1
+        assert not link_graph_analyzer.is_orphan(third)
+        assert not link_graph_analyzer.has_home
+        assert link_graph_analyzer.get_depth(first) is None
+        assert link_graph_analyzer.orphans_count == 0
+
+    def test_depth_from_the_home_page(self, analyze_document):
+        """
+        Test that the link depth is the shortest number of clicks from
+        the home page, and None for documents it doesn't lead to.
+        """
+
+        documents_analysis = [
+            analyze_document("index.html", ["blog/", "about.html"]),
+            analyze_document("about.html"),
+            analyze_document("blog/index.html", ["post.html"]),
+            analyze_document("blog/post.html", ["/about.html", "../index.html"]),
+            analyze_document("draft.html", ["about.html"]),
+        ]
+        link_graph_analyzer = LinkGraphAnalyzer(documents_analysis)
+
+        assert link_graph_analyzer.has_home
+        assert [
+            link_graph_analyzer.get_depth(document_analysis)
+            for document_analysis in documents_analysis
+        ] == [0, 1, 1, 2, None]
+        assert link_graph_analyzer.is_orphan(documents_analysis[4])
+        assert not link_graph_analyzer.is_orphan(documents_analysis[0])
+        assert link_graph_analyzer.orphans_count == 1
+
+    def test_authority_follows_links(self, analyze_document, monkeypatch):
+        """
+        Test that the authority is the PageRank relative to the highest one,
+        the same with or without NumPy.
+        """
+
+        documents_analysis = [
+            analyze_document("a.html", ["b.html"]),
+            analyze_document("b.html", ["a.html"]),
+            analyze_document("c.html", ["b.html"]),
+            analyze_document("d.html"),
+        ]
+
+        def _get_authorities():
+            link_graph_analyzer = LinkGraphAnalyzer(documents_analysis)
+            return [
+                link_graph_analyzer.get_authority(document_analysis)
+                for document_analysis in documents_analysis
+            ]
+
+        authorities = _get_authorities()
+        assert authorities[1] == 1.0
+        assert authorities[1] > authorities[0] > authorities[2]
+        assert authorities[2] == pytest.approx(authorities[3])
+
+        monkeypatch.setattr(link_graph_analyzer, "np", None)
+        assert _get_authorities() == pytest.approx(authorities, abs=1e-5)
+
+    def test_authority_with_numpy(self, analyze_document, monkeypatch):
+        """Test that NumPy gives the same authorities as pure Python."""
+
+        pytest.importorskip("numpy")
+        documents_analysis = [
+            analyze_document(f"page-{number}.html", [f"page-{number // 2}.html"])
+            for number in range(20)
+        ]
+
+        link_graph_analysis = LinkGraphAnalyzer(documents_analysis)
+        monkeypatch.setattr(link_graph_analyzer, "np", None)
+        python_link_graph_analysis = LinkGraphAnalyzer(documents_analysis)
+
+        for document_analysis in documents_analysis:
+            assert link_graph_analysis.get_authority(
+                document_analysis
+            ) == pytest.approx(
+                python_link_graph_analysis.get_authority(document_analysis), abs=1e-5
+            )
+
+    def test_listings_link_to_documents(self, analyze_document):
+        """
+        Test that listings link to documents without being documents :
+        the home page is the index, and only documents can be orphans.
+        """
+
+        documents_analysis = [
+            analyze_document("first.html", ["second.html"]),
+            analyze_document("second.html"),
+            analyze_document("pages/about.html"),
+            analyze_document("hidden.html"),
+        ]
+        listings = [
+            ("index.html", ["pages/about.html", "first.html", "index2.html"]),
+            ("index2.html", ["second.html", "index2.html"]),
+            ("category/news.html", ["first.html", "/second.html"]),
+            ("tags.html", []),
+        ]
+        link_graph_analyzer = LinkGraphAnalyzer(
+            documents_analysis, listings, complete=True
+        )
+
+        assert link_graph_analyzer.complete
+        assert [
+            link_graph_analyzer.get_depth(document_analysis)
+            for document_analysis in documents_analysis
+        ] == [1, 2, 1, None]
+        assert link_graph_analyzer.get_inbound_count(documents_analysis[0]) == 2
+        assert link_graph_analyzer.get_inbound_count(documents_analysis[1]) == 3
+        assert link_graph_analyzer.get_outbound_count(documents_analysis[0]) == 1
+        assert link_graph_analyzer.is_orphan(documents_analysis[3])
+        assert link_graph_analyzer.orphans_count == 1
+        assert (
+            max(
+                link_graph_analyzer.get_authority(document_analysis)
+                for document_analysis in documents_analysis
+            )
+            == 1.0
+        )
+
+        assert not LinkGraphAnalyzer(documents_analysis, listings).complete
+        assert not LinkGraphAnalyzer(documents_analysis, complete=True).complete
+
+    @pytest.mark.parametrize("complete", (True, False))
+    def test_report_flags_orphan_and_deep_documents(
+        self, fake_seo_report, analyze_document, tmp_path, monkeypatch, complete
+    ):
+        """
+        Test that the report flags orphans and documents far from home,
+        only if the link graph is complete.
+        """
+
+        monkeypatch.chdir(tmp_path)
+        documents_analysis = [
+            analyze_document(f"page-{number}.html", [f"page-{number + 1}.html"])
+            for number in range(1, 5)
+        ]
+        documents_analysis.append(analyze_document("orphan.html"))
+
+        fake_seo_report.generate(
+            "Fake site",
+            documents_analysis,
+            site_analysis=fake_seo_report.analyze_site(
+                documents_analysis,
+                listings=[("index.html", ["page-1.html"])],
+                complete=complete,
+            ),
+        )
+
+        report = (tmp_path / "seo_report.html").read_text(encoding="utf8")
+        assert "This document is 3 clicks away from the home page. Nice job!" in report
+        assert report.count("No other page links to this one") == int(complete)
+        assert (
+            "This document is 4 clicks away from the home page. "
+            "The recommended maximum is 3 clicks." in report
+        ) is complete
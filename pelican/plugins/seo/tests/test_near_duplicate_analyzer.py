@@ -0,0 +1,159 @@
+"""Units tests for Near Duplicate Analyzer."""
+
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from seo.seo_report.seo_analyzer import content_fingerprint_analyzer
+from seo.seo_report.seo_analyzer.content_fingerprint_analyzer import get_simhash
+from seo.seo_report.site_analyzer import NearDuplicateAnalyzer, near_duplicate_analyzer
+
+VOCABULARY = (
+    "the a static site generator pelican python article page theme plugin feed "
+    "tag category content markdown write host publish image sitemap search engine "
+    "link title description heading"
+).split()
+
+
+def _get_text(seed, length=800):
+    generator = random.Random(seed)
+    return " ".join(generator.choice(VOCABULARY) for _ in range(length))
+
+
+# SimHashes are meant for page-sized texts : a short edit of a long text
+CONTENT = _get_text(seed=0)
+EDITED_CONTENT = CONTENT + " again"
+OTHER_CONTENT = _get_text(seed=1)
+
+
+def _distance(first, second):
+    return bin(first ^ second).count("1")
+
+
+class TestGetSimhash:
+    """Units tests for get_simhash."""
+
+    def test_close_texts_have_close_simhashes(self):
+        """Test that a small edit changes only a few bits of the SimHash."""
+
+        assert get_simhash(CONTENT) == get_simhash(CONTENT.upper())
+        assert _distance(get_simhash(CONTENT), get_simhash(EDITED_CONTENT)) <= 3
+        assert _distance(get_simhash(CONTENT), get_simhash(OTHER_CONTENT)) > 3
+
+    def test_no_word_gives_zero(self):
+        """Test that a text without words has no SimHash."""
+
+        assert get_simhash("") == 0
+        assert get_simhash(" ... ") == 0
+
+    def test_same_simhash_without_numpy(self, monkeypatch):
+        """Test that the SimHash doesn't depend on NumPy being installed."""
+
+        pytest.importorskip("numpy")
+        simhash = get_simhash(CONTENT)
+        monkeypatch.setattr(content_fingerprint_analyzer, "np", None)
+
+        assert get_simhash(CONTENT) == simhash
+
+
+class TestNearDuplicateAnalyzer:
+    """Units tests for NearDuplicateAnalyzer."""
+
+    def test_get_near_duplicates_lists_close_contents(self, analyze_document):
+        """Test that documents with nearly the same content are paired."""
+
+        first = analyze_document("first.html", content=f"<p>{CONTENT}</p>")
+        second = analyze_document("second.html", content=f"<p>{EDITED_CONTENT}</p>")
+        third = analyze_document("third.html", content=f"<p>{OTHER_CONTENT}</p>")
+        empty = analyze_document("empty.html", content="<p></p>")
+        near_duplicate_analyzer = NearDuplicateAnalyzer([first, second, third, empty])
+
+        assert near_duplicate_analyzer.get_near_duplicates(first) == ["second.html"]
+        assert near_duplicate_analyzer.get_near_duplicates(second) == ["first.html"]
+        assert near_duplicate_analyzer.get_near_duplicates(third) == []
+        assert near_duplicate_analyzer.get_near_duplicates(empty) == []
+        assert near_duplicate_analyzer.groups_count == 1
+
+    def test_same_simhashes_are_compared_once(self, monkeypatch):
+        """
+        Test that documents with the same SimHash are grouped before pairing,
+        and that the near-duplicates of a group are those of its SimHash.
+        """
+
+        def _analysis(url, simhash):
+            fingerprint = SimpleNamespace(content_simhash=simhash)
+            return {
+                "url": url,
+                "seo_analysis": {"content_fingerprint_analysis": fingerprint},
+            }
+
+        documents_analysis = [
+            _analysis(f"stub-{number}.html", 0b1) for number in range(3000)
+        ]
+        documents_analysis.append(_analysis("close.html", 0b11))
+        documents_analysis.append(_analysis("other.html", 2**64 - 1))
+        find_pairs = NearDuplicateAnalyzer._find_pairs
+        compared_simhashes = []
+
+        def _find_pairs(analyzer, simhashes):
+            compared_simhashes.append(simhashes)
+            return find_pairs(analyzer, simhashes)
+
+        monkeypatch.setattr(NearDuplicateAnalyzer, "_find_pairs", _find_pairs)
+        near_duplicate_analyzer = NearDuplicateAnalyzer(documents_analysis)
+
+        assert compared_simhashes == [[0b1, 0b11, 2**64 - 1]]
+        near_duplicates = near_duplicate_analyzer.get_near_duplicates(
+            documents_analysis[0]
+        )
+        assert len(near_duplicates) == 3000
+        assert "stub-0.html" not in near_duplicates
+        assert near_duplicates[-1] == "close.html"
+        assert (
+            len(near_duplicate_analyzer.get_near_duplicates(documents_analysis[-2]))
+            == 3000
+        )
+        assert near_duplicate_analyzer.get_near_duplicates(documents_analysis[-1]) == []
+        assert near_duplicate_analyzer.groups_count == 1
+
+    def test_same_pairs_without_numpy(self, analyze_document, monkeypatch):
+        """Test that the pairs found don't depend on NumPy being installed."""
+
+        pytest.importorskip("numpy")
+        documents_analysis = [
+            analyze_document(
+                f"page-{number}.html",
+                content=f"<p>{CONTENT}{' word' * number * 10}</p>",
+            )
+            for number in range(6)
+        ]
+        pairs = NearDuplicateAnalyzer(documents_analysis)._find_pairs
+        simhashes = [
+            document_analysis["seo_analysis"][
+                "content_fingerprint_analysis"
+            ].content_simhash
+            for document_analysis in documents_analysis
+        ]
+        expected_pairs = pairs(simhashes)
+        monkeypatch.setattr(near_duplicate_analyzer, "np", None)
+
+        assert pairs(simhashes) == expected_pairs
+
+    def test_report_lists_near_duplicate_urls(
+        self, fake_seo_report, analyze_document, tmp_path, monkeypatch
+    ):
+        """Test that the report of a document lists its near-duplicates."""
+
+        monkeypatch.chdir(tmp_path)
+        documents_analysis = [
+            analyze_document("first.html", content=f"<p>{CONTENT}</p>"),
+            analyze_document("second.html", content=f"<p>{EDITED_CONTENT}</p>"),
+        ]
+
+        fake_seo_report.generate("Fake site", documents_analysis)
+
+        report = (tmp_path / "seo_report.html").read_text(encoding="utf8")
+        assert (
+            "Your content is nearly the same as 1 other documents: second.html"
+        ) in report
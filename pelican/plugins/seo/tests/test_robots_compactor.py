@@ -0,0 +1,62 @@
+"""Units tests for Robots Compactor."""
+
+from seo.seo_enhancer.robots_compactor import compact_robots_urls
+
+SITE_URLS = {
+    "",
+    "about.html",
+    "drafts/first.html",
+    "drafts/second.html",
+    "blog/2020/first.html",
+    "blog/2020/second.html",
+    "blog/2021/third.html",
+    "posts/fourth/",
+    "posts/fourth/image.png",
+}
+
+
+def test_fully_ruled_directories_get_a_single_rule():
+    """
+    Test that URLs get the rule of their highest directory
+    whose site URLs are all ruled.
+    """
+
+    rules = compact_robots_urls(
+        [
+            "about.html",
+            "drafts/first.html",
+            "drafts/second.html",
+            "blog/2020/first.html",
+            "blog/2020/second.html",
+            "posts/fourth/index.html",
+            "posts/fourth/image.png",
+        ],
+        SITE_URLS,
+    )
+
+    assert rules == {
+        "about.html": "about.html",
+        "drafts/first.html": "drafts/",
+        "drafts/second.html": "drafts/",
+        "blog/2020/first.html": "blog/2020/",
+        "blog/2020/second.html": "blog/2020/",
+        "posts/fourth/index.html": "posts/",
+        "posts/fourth/image.png": "posts/",
+    }
+
+
+def test_allowed_urls_are_never_ruled():
+    """
+    Test that directories with an allowed URL are not compacted,
+    nor the site root, nor directories with a single URL.
+    """
+
+    rules = compact_robots_urls(
+        ["about.html", "drafts/first.html", "blog/2021/third.html"], SITE_URLS
+    )
+
+    assert rules == {
+        "about.html": "about.html",
+        "drafts/first.html": "drafts/first.html",
+        "blog/2021/third.html": "blog/2021/third.html",
+    }
@@ -0,0 +1,63 @@
+"""Units tests for Robots Matcher."""
+
+import pytest
+
+from seo.seo_enhancer.robots_matcher import RobotsMatcher
+
+ROBOTS_TEXT = """User-agent: googlebot
+Disallow: /
+
+User-agent: other
+User-agent: *
+Disallow: /drafts/
+Allow: /drafts/public
+Disallow: /*.pdf$
+Disallow: /private*/secret
+Disallow:
+Noindex: /tag/  # Tags are thin
+"""
+
+
+@pytest.mark.parametrize(
+    "path, allowed",
+    (
+        ("/", True),
+        ("/about.html", True),
+        ("/drafts/first.html", False),
+        ("/drafts/public.html", True),
+        ("/file.pdf", False),
+        ("/file.pdf.html", True),
+        ("/private-posts/secret.html", False),
+        ("/private-posts/public.html", True),
+    ),
+)
+def test_is_allowed(path, allowed):
+    """
+    Test that the longest matching rule applies, with wildcards,
+    and that groups of other user agents are ignored.
+    """
+
+    assert RobotsMatcher(ROBOTS_TEXT).is_allowed(path) is allowed
+
+
+def test_allow_wins_ties():
+    """Test that Allow wins over Disallow for patterns of the same length."""
+
+    robots_matcher = RobotsMatcher(
+        "User-agent: *\nDisallow: /page\nAllow: /page\nDisallow: /*.html\n"
+        "Allow: /a*html"
+    )
+
+    assert robots_matcher.is_allowed("/page")
+    assert not robots_matcher.is_allowed("/other.html")
+    assert robots_matcher.is_allowed("/about.html")
+
+
+def test_is_noindex():
+    """Test that Noindex rules match the paths they start."""
+
+    robots_matcher = RobotsMatcher(ROBOTS_TEXT)
+
+    assert robots_matcher.is_noindex("/tag/python.html")
+    assert not robots_matcher.is_noindex("/tags.html")
+    assert robots_matcher.is_allowed("/tag/python.html")
@@ -0,0 +1,106 @@
+import os
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import MagicMock
+
+import pytest
+
+from seo import seo
+from seo.seo import (
+    finalize_html_enhancer,
+    join_background_html_enhancer,
+    run_deferred_html_enhancer,
+    run_html_enhancer,
+)
+
+
+def test_run_html_enhancer_deferred(fake_article):
+    with TemporaryDirectory() as tmp_dir_name:
+        path = Path(tmp_dir_name) / "fake-title.html"
+        path.write_text(fake_article.content, encoding="utf8")
+        context = {
+            "SEO_ENHANCER": True,
+            "SEO_ENHANCER_DEFERRED": True,
+            "SEO_ENHANCER_PROCESSES": 1,
+            "OUTPUT_PATH": tmp_dir_name,
+            "article": fake_article,
+        }
+
+        run_html_enhancer(str(path), context)
+
+        # Nothing is written until the build is finalized
+        assert path.read_text(encoding="utf8") == fake_article.content
+        assert str(path) in seo._deferred_html_enhancements
+
+        run_deferred_html_enhancer(MagicMock(settings=context))
+
+        assert 'rel="canonical"' in path.read_text(encoding="utf8")
+        assert not seo._deferred_html_enhancements
+
+
+def test_run_html_enhancer_background(fake_article):
+    with TemporaryDirectory() as tmp_dir_name:
+        paths = [Path(tmp_dir_name) / f"fake-title-{i}.html" for i in range(5)]
+        context = {
+            "SEO_ENHANCER": True,
+            "SEO_ENHANCER_BACKGROUND": True,
+            "SEO_ENHANCER_BACKGROUND_THREADS": 2,
+            "SEO_ENHANCER_BACKGROUND_QUEUE_SIZE": 1,
+            "OUTPUT_PATH": tmp_dir_name,
+            "article": fake_article,
+        }
+
+        for path in paths:
+            path.write_text(fake_article.content, encoding="utf8")
+            run_html_enhancer(str(path), context)
+
+        join_background_html_enhancer(MagicMock(settings=context))
+
+        assert not seo._background_html_enhancer.started
+        for path in paths:
+            assert path.read_text(encoding="utf8").count('rel="canonical"') == 1
+
+
+def test_run_html_enhancer_deferred_and_background_are_exclusive(fake_article):
+    context = {
+        "SEO_ENHANCER": True,
+        "SEO_ENHANCER_DEFERRED": True,
+        "SEO_ENHANCER_BACKGROUND": True,
+        "article": fake_article,
+    }
+
+    with pytest.raises(Exception, match="SEO_ENHANCER_BACKGROUND"):
+        run_html_enhancer("fake_output/fake-title.html", context)
+
+
+def test_run_html_enhancer_manifest_keeps_unchanged_files_mtime(fake_article):
+    with TemporaryDirectory() as tmp_dir_name:
+        output_path = Path(tmp_dir_name) / "output"
+        output_path.mkdir()
+        path = output_path / "fake-title.html"
+        context = {
+            "SEO_ENHANCER": True,
+            "SEO_ENHANCER_MANIFEST": True,
+            "OUTPUT_PATH": str(output_path),
+            "CACHE_PATH": str(Path(tmp_dir_name) / "cache"),
+            "article": fake_article,
+        }
+
+        def build(content, written_at):
+            # Pelican writes the file again on every build
+            path.write_text(content, encoding="utf8")
+            os.utime(path, ns=(written_at, written_at))
+            run_html_enhancer(str(path), context)
+            finalize_html_enhancer(MagicMock(settings=context))
+            return path.stat().st_mtime_ns
+
+        first_mtime = build(fake_article.content, written_at=10**18)
+        enhanced_content = path.read_text(encoding="utf8")
+
+        # Same content and enhancements: the file is identical and looks untouched
+        assert build(fake_article.content, written_at=2 * 10**18) == first_mtime
+        assert path.read_text(encoding="utf8") == enhanced_content
+
+        # Changed content: the modification time is the new one
+        changed_content = fake_article.content.replace("Fake", "New")
+        assert build(changed_content, written_at=3 * 10**18) != first_mtime
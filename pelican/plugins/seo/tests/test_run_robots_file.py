@@ -1,7 +1,13 @@
+from pathlib import Path
+import re
+from types import SimpleNamespace
+from seo import seo
 from seo.seo import run_robots_file
 import pytest
 from unittest.mock import patch, call, MagicMock
 
+from pelican.generators import ArticlesGenerator
+
 
 def test_run_robots_file():
     class FakeGenerator:
@@ -12,13 +18,175 @@ def test_run_robots_file():
         output_path = "foo"
 
     with patch("seo.seo.SEOEnhancer") as patched_seo_enhancer:
-        run_robots_file([FakeGenerator()])
+        with patch("seo.seo.get_site_urls", return_value={""}):
+            run_robots_file([FakeGenerator()])
 
         assert (
             call().generate_robots(
                 rules=[],
                 output_path="foo",
                 sitemap_url="https://www.example.com/sitemap.xml",
+                site_urls=None,
             )
             in patched_seo_enhancer.mock_calls
         )
+        assert (
+            call().check_robots(rules=[], output_path="foo", site_urls={""})
+            in patched_seo_enhancer.mock_calls
+        )
+
+
+def test_run_robots_file_with_sitemap(tmp_path):
+    """
+    Test that the sitemap is written in the same pass, without noindex
+    and disallow documents, and that robots.txt links to its index.
+    """
+
+    generator = ArticlesGenerator.__new__(ArticlesGenerator)
+    generator.context = {
+        "SITEURL": "https://www.example.com",
+        "SEO_ENHANCER": True,
+        "SEO_ENHANCER_SITEMAP": True,
+    }
+    generator.output_path = str(tmp_path)
+    generator.articles = [
+        SimpleNamespace(url="first.html", metadata={}),
+        SimpleNamespace(url="second.html", metadata={"noindex": True}),
+        SimpleNamespace(url="third.html", metadata={"disallow": True}),
+    ]
+
+    with patch("seo.seo.get_site_urls", return_value={"", "first.html"}):
+        run_robots_file([generator])
+
+    sitemap = (tmp_path / "sitemap.xml").read_text()
+    assert "<loc>https://www.example.com/first.html</loc>" in sitemap
+    assert sitemap.count("<url>") == 1
+    assert (
+        (tmp_path / "robots.txt")
+        .read_text()
+        .endswith("Sitemap: https://www.example.com/sitemap_index.xml")
+    )
+
+
+def test_run_robots_file_with_indexnow(tmp_path):
+    """
+    Test that the URLs changed since the previous build are listed
+    for IndexNow, without the noindex and disallow documents,
+    with the key file at the site root.
+    """
+
+    generator = ArticlesGenerator.__new__(ArticlesGenerator)
+    generator.context = {
+        "SITEURL": "https://www.example.com",
+        "CACHE_PATH": str(tmp_path / "cache"),
+        "SEO_ENHANCER": True,
+        "SEO_ENHANCER_URL_STATES": True,
+        "SEO_ENHANCER_INDEXNOW_KEY": "0123456789abcdef",
+    }
+    generator.output_path = str(tmp_path / "output")
+    generator.articles = [
+        SimpleNamespace(url="first.html", metadata={}, title="First", content=""),
+        SimpleNamespace(
+            url="second.html", metadata={"noindex": True}, title="Second", content=""
+        ),
+        SimpleNamespace(
+            url="third.html", metadata={"disallow": True}, title="Third", content=""
+        ),
+    ]
+
+    with patch("seo.seo.get_site_urls", return_value={"", "first.html"}):
+        run_robots_file([generator])
+    # Saved at the end of the build
+    seo._url_state_store.save()
+
+    assert (tmp_path / "output" / "0123456789abcdef.txt").exists()
+    assert (tmp_path / "cache" / "seo_enhancer_indexnow_urls.txt").read_text() == (
+        "https://www.example.com/first.html\n"
+    )
+
+    # Removed URLs are always listed, for search engines to drop them
+    generator.articles = generator.articles[1:]
+    generator.articles[0].content = "Changed"
+    with patch("seo.seo.get_site_urls", return_value={""}):
+        run_robots_file([generator])
+    seo._url_state_store.save()
+
+    assert (tmp_path / "cache" / "seo_enhancer_indexnow_urls.txt").read_text() == (
+        "https://www.example.com/first.html\n"
+    )
+
+
+def test_run_robots_file_with_sitemap_priority(generate_site):
+    """
+    Test that the sitemap priority of each document is the rank of its
+    internal link authority, in the link graph of the site with its listings.
+    """
+
+    generators = generate_site(
+        SITEURL="https://www.example.com",
+        SEO_ENHANCER=True,
+        SEO_ENHANCER_SITEMAP=True,
+        SEO_ENHANCER_SITEMAP_PRIORITY=True,
+    )
+
+    run_robots_file(generators)
+
+    sitemap = Path(generators[0].output_path, "sitemap.xml").read_text()
+    priorities = {
+        url: float(priority)
+        for url, priority in re.findall(
+            r"<loc>https://www.example.com/(.+?)</loc>.*?"
+            r"<priority>(.+?)</priority>",
+            sitemap,
+        )
+    }
+    assert set(priorities) == {f"post-{number}.html" for number in range(1, 6)} | {
+        "pages/about.html"
+    }
+    assert max(priorities.values()) == 1.0
+    assert min(priorities.values()) == 0.1
+    # Authority flows down the paginated listings, and pools on their last page
+    assert priorities["post-5.html"] > priorities["post-2.html"]
+
+
+def test_run_robots_file_shares_the_link_graph_of_the_seo_report(generate_site):
+    """Test that the sitemap priorities reuse the link graph of the SEO report."""
+
+    generators = generate_site(
+        SITEURL="https://www.example.com",
+        SEO_REPORT=True,
+        SEO_REPORT_FORMATS=(),
+        SEO_ENHANCER=True,
+        SEO_ENHANCER_SITEMAP=True,
+        SEO_ENHANCER_SITEMAP_PRIORITY=True,
+    )
+
+    seo.run_seo_report(generators)
+    with patch("seo.seo.SEOReport.launch_analyses") as patched_launch_analyses:
+        run_robots_file(generators)
+
+    patched_launch_analyses.assert_not_called()
+    assert "<priority>1.0</priority>" in (
+        Path(generators[0].output_path, "sitemap.xml").read_text()
+    )
+
+
+@pytest.mark.parametrize(
+    "authorities, priorities",
+    (
+        (
+            {"a": 1.0, "b": 0.4, "c": 0.4, "d": 0.1},
+            {"a": 1, "b": 0.6, "c": 0.6, "d": 0.1},
+        ),
+        ({"a": 0.1, "b": 0.1}, {"a": 1.0, "b": 1.0}),
+    ),
+)
+def test_get_sitemap_priorities(authorities, priorities):
+    """
+    Test that sitemap priorities spread from 0.1 to 1.0 by authority rank,
+    whatever the authorities of the documents left out of the sitemap.
+    """
+
+    link_graph_analysis = SimpleNamespace(get_url_authority=authorities.get)
+
+    assert seo._get_sitemap_priorities(link_graph_analysis, authorities) == priorities
@@ -0,0 +1,84 @@
+import json
+from unittest.mock import DEFAULT, patch
+
+import pytest
+
+from seo.seo import run_seo_report
+
+
+def test_run_seo_report_analyzes_the_site_once():
+    """
+    Test that the site-wide analysis is run once, and shared between
+    the HTML report and the records.
+    """
+
+    class FakeGenerator:
+        context = {
+            "SITENAME": "Fake Site Name",
+            "SEO_REPORT": True,
+            "SEO_REPORT_FORMATS": ("html", "jsonl"),
+        }
+
+    with patch.multiple(
+        "seo.seo.SEOReport",
+        launch_analyses=DEFAULT,
+        analyze_site=DEFAULT,
+        generate=DEFAULT,
+        generate_records=DEFAULT,
+    ) as patched:
+        with (
+            patch("seo.seo.get_site_urls", return_value={""}),
+            patch("seo.seo.get_site_listings", return_value=[("", "index.html", [])]),
+        ):
+            run_seo_report([FakeGenerator()])
+
+    patched["analyze_site"].assert_called_once_with(
+        patched["launch_analyses"].return_value,
+        {""},
+        listings=[("", [])],
+        complete=True,
+    )
+    site_analysis = patched["analyze_site"].return_value
+    assert patched["generate"].call_args.kwargs["site_analysis"] is site_analysis
+    assert (
+        patched["generate_records"].call_args.kwargs["site_analysis"] is site_analysis
+    )
+
+
+@pytest.mark.parametrize("articles_limit", (None, 4))
+def test_run_seo_report_on_a_generated_site(
+    generate_site, tmp_path, monkeypatch, articles_limit
+):
+    """
+    Test that the link graph of a site generated by Pelican has its listings :
+    documents are linked by the pages of the index and of their category,
+    at a depth counted from the index. Depth problems are only reported
+    if the limits leave no document out.
+    """
+
+    monkeypatch.chdir(tmp_path)
+    generators = generate_site(
+        SEO_REPORT=True,
+        SEO_REPORT_FORMATS=("jsonl",),
+        SEO_ARTICLES_LIMIT=articles_limit,
+    )
+
+    run_seo_report(generators)
+
+    with open(tmp_path / "seo_report.jsonl", encoding="utf8") as jsonl_file:
+        records = {record["url"]: record for record in map(json.loads, jsonl_file)}
+
+    # Linked by the first pages of the index and of the category, and archives
+    assert records["post-5.html"]["inbound_link_count"] == 3
+    assert {url: record["link_depth"] for url, record in records.items()} == {
+        "post-5.html": 1,
+        "post-4.html": 2,
+        "post-3.html": 3,
+        "post-2.html": 4,
+        **({"post-1.html": 5} if articles_limit is None else {}),
+        "pages/about.html": 1,
+    }
+    assert records["post-2.html"]["link_graph_status"] == (
+        "to_improve" if articles_limit is None else "good"
+    )
+    assert records["pages/about.html"]["link_graph_status"] == "good"
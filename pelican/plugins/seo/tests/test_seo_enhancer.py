@@ -42,7 +42,7 @@ class TestSEOEnhancer:
 
                 args, _ = mocked_file_handle.write.call_args_list[1]
                 fake_rule = args[0]
-                assert "Noindex: fake-title.html" in fake_rule
+                assert "Noindex: /fake-title.html" in fake_rule
 
     def test_generate_robots_file_with_sitemap_url(
         self, fake_seo_enhancer, fake_robots_rules
@@ -61,6 +61,112 @@ class TestSEOEnhancer:
 
             assert sitemap_url in contents
 
+    def test_generate_robots_file_with_site_urls(self, fake_seo_enhancer):
+        """
+        Test that generate_robots compacts the rules of fully ruled
+        directories, and logs the bytes saved.
+        """
+
+        rules = [
+            {"document_url": f"drafts/{number}.html", "noindex": True, "disallow": True}
+            for number in range(3)
+        ]
+        rules.append({"document_url": "about.html", "noindex": None, "disallow": True})
+        site_urls = {"", "about.html", "contact.html"} | {
+            f"drafts/{number}.html" for number in range(3)
+        }
+
+        with TemporaryDirectory() as tmp_dir_name:
+            with patch("seo.seo_enhancer.logger") as mocked_logger:
+                fake_seo_enhancer.generate_robots(
+                    rules=rules, output_path=tmp_dir_name, site_urls=site_urls
+                )
+            contents = (Path(tmp_dir_name) / "robots.txt").read_text()
+
+        assert contents == (
+            "User-agent: *\nNoindex: /drafts/\nDisallow: /drafts/\n"
+            "Disallow: /about.html"
+        )
+        mocked_logger.info.assert_called_with(
+            "SEO plugin - SEO Enhancement: robots.txt rules compacted, 110 bytes saved"
+        )
+
+    def test_check_robots_file(self, fake_seo_enhancer):
+        """Test that check_robots returns no conflict for a generated file."""
+
+        rules = [
+            {"document_url": f"drafts/{number}.html", "noindex": True, "disallow": True}
+            for number in range(3)
+        ]
+        site_urls = {"", "about.html"} | {
+            f"drafts/{number}.html" for number in range(3)
+        }
+
+        with TemporaryDirectory() as tmp_dir_name:
+            fake_seo_enhancer.generate_robots(
+                rules=rules, output_path=tmp_dir_name, site_urls=site_urls
+            )
+            with patch("seo.seo_enhancer.logger") as mocked_logger:
+                conflicts = fake_seo_enhancer.check_robots(
+                    rules=rules, output_path=tmp_dir_name, site_urls=site_urls
+                )
+
+        assert conflicts == {"unexpected": [], "missing": []}
+        mocked_logger.warning.assert_not_called()
+
+    def test_check_robots_file_with_conflicts(self, fake_seo_enhancer):
+        """
+        Test that check_robots reports URLs blocked by the rule of another URL,
+        and ruled URLs which the file doesn't block.
+        """
+
+        rules = [
+            {"document_url": "post-1", "noindex": None, "disallow": True},
+            {"document_url": "about.html", "noindex": True, "disallow": None},
+        ]
+        site_urls = {"", "post-1", "post-10", "about.html"}
+
+        with TemporaryDirectory() as tmp_dir_name:
+            (Path(tmp_dir_name) / "robots.txt").write_text(
+                "User-agent: *\nDisallow: /post-1"
+            )
+            with patch("seo.seo_enhancer.logger") as mocked_logger:
+                conflicts = fake_seo_enhancer.check_robots(
+                    rules=rules, output_path=tmp_dir_name, site_urls=site_urls
+                )
+
+        assert conflicts == {
+            "unexpected": [("Disallow", "post-10")],
+            "missing": [("Noindex", "about.html")],
+        }
+        assert mocked_logger.warning.call_count == 2
+        mocked_logger.warning.assert_any_call(
+            "SEO plugin - SEO Enhancement: robots.txt has rules applying "
+            "to other URLs (1): Disallow /post-10"
+        )
+
+    def test_generate_indexnow(self, fake_seo_enhancer, tmp_path):
+        """
+        Test that generate_indexnow writes the key file at the site root,
+        and the absolute URLs to submit, one by line.
+        """
+
+        fake_seo_enhancer.generate_indexnow(
+            key="0123456789abcdef",
+            urls=["added.html", "posts/changed/", "removed.html"],
+            output_path=str(tmp_path / "output"),
+            urls_path=str(tmp_path / "cache" / "urls.txt"),
+            siteurl="https://www.example.com",
+        )
+
+        key_file = tmp_path / "output" / "0123456789abcdef.txt"
+        assert key_file.read_text() == "0123456789abcdef"
+        assert (tmp_path / "cache" / "urls.txt").read_text() == (
+            "https://www.example.com/added.html\n"
+            "https://www.example.com/posts/changed/\n"
+            "https://www.example.com/removed.html\n"
+        )
+
     @pytest.mark.parametrize("open_graph", (True, False))
     def test_launch_html_enhancer_returns_dict(
         self, fake_article, fake_seo_enhancer, open_graph
@@ -119,15 +225,17 @@ class TestSEOEnhancer:
                 == """<html>
                     <head>
                         <title>Fake Title</title>
-                        <meta content="Fake description" name="description"/>
-                    <link href="https://www.fakesite.com/fake-title.html" rel="canonical"/>
+                        <meta name='description' content='Fake description' />
+                    <!-- pelican-seo -->
+<link href="https://www.fakesite.com/fake-title.html" rel="canonical"/>
 <script type="application/ld+json">{"@context": "https://schema.org", "@type": "BreadcrumbList", "itemListElement": [{"@type": "ListItem", "position": 1, "name": "Fake Site Name", "item": "https://www.fakesite.com"}, {"@type": "ListItem", "position": 2, "name": "Fake_file", "item": "https://www.fakesite.com/fake_file.html"}]}</script>
 <script type="application/ld+json">{"@context": "https://schema.org", "@type": "Article", "author": {"@type": "Person", "name": "Fake author"}, "publisher": {"@type": "Organization", "name": "Fake Site Name", "logo": {"@type": "ImageObject", "url": "https://www.fakesite.com/fake-logo.jpg"}}, "headline": "Fake Title", "about": "Fake category", "datePublished": "2019-04-03 23:49"}</script>
+<!-- /pelican-seo -->
 </head>
                     <body>
                         <h1>Fake content title</h1>
                         <p>Fake content 🙃</p>
-                        <a href="https://www.fakesite.com">Fake internal link</a>
+                        <a href='https://www.fakesite.com'>Fake internal link</a>
                         <p>Fake content with <code>inline code</code></p>
                         <p>Fake content with "<a href="https://www.fakesite.com">Fake inline internal link</a>"</p>
                     </body>
@@ -229,8 +337,9 @@ class TestSEOEnhancer:
                 == """<html>
                     <head>
                         <title>Fake Title</title>
-                        <meta content="Fake description" name="description"/>
-                    <link href="https://www.fakesite.com/fake-title.html" rel="canonical"/>
+                        <meta name='description' content='Fake description' />
+                    <!-- pelican-seo -->
+<link href="https://www.fakesite.com/fake-title.html" rel="canonical"/>
 <script type="application/ld+json">{"@context": "https://schema.org", "@type": "BreadcrumbList", "itemListElement": [{"@type": "ListItem", "position": 1, "name": "Fake Site Name", "item": "https://www.fakesite.com"}, {"@type": "ListItem", "position": 2, "name": "Fake_file", "item": "https://www.fakesite.com/fake_file.html"}]}</script>
 <script type="application/ld+json">{"@context": "https://schema.org", "@type": "Article", "author": {"@type": "Person", "name": "Fake author"}, "publisher": {"@type": "Organization", "name": "Fake Site Name", "logo": {"@type": "ImageObject", "url": "https://www.fakesite.com/fake-logo.jpg"}}, "headline": "Fake Title", "about": "Fake category", "datePublished": "2019-04-03 23:49"}</script>
 <meta content="Fake Site Name" property="og:site_name"/>
@@ -240,11 +349,12 @@ class TestSEOEnhancer:
 <meta content="OG Description" property="og:description"/>
 <meta content="https://www.fakesite.com/og-image.jpg" property="og:image"/>
 <meta content="fr_FR" property="og:locale"/>
+<!-- /pelican-seo -->
 </head>
                     <body>
                         <h1>Fake content title</h1>
                         <p>Fake content 🙃</p>
-                        <a href="https://www.fakesite.com">Fake internal link</a>
+                        <a href='https://www.fakesite.com'>Fake internal link</a>
                         <p>Fake content with <code>inline code</code></p>
                         <p>Fake content with "<a href="https://www.fakesite.com">Fake inline internal link</a>"</p>
                     </body>
@@ -294,8 +404,9 @@ class TestSEOEnhancer:
                 == """<html>
                     <head>
                         <title>Fake Title</title>
-                        <meta content="Fake description" name="description"/>
-                    <link href="https://www.fakesite.com/fake-title.html" rel="canonical"/>
+                        <meta name='description' content='Fake description' />
+                    <!-- pelican-seo -->
+<link href="https://www.fakesite.com/fake-title.html" rel="canonical"/>
 <script type="application/ld+json">{"@context": "https://schema.org", "@type": "BreadcrumbList", "itemListElement": [{"@type": "ListItem", "position": 1, "name": "Fake Site Name", "item": "https://www.fakesite.com"}, {"@type": "ListItem", "position": 2, "name": "Fake_file", "item": "https://www.fakesite.com/fake_file.html"}]}</script>
 <script type="application/ld+json">{"@context": "https://schema.org", "@type": "Article", "author": {"@type": "Person", "name": "Fake author"}, "publisher": {"@type": "Organization", "name": "Fake Site Name", "logo": {"@type": "ImageObject", "url": "https://www.fakesite.com/fake-logo.jpg"}}, "headline": "Fake Title", "about": "Fake category", "datePublished": "2019-04-03 23:49"}</script>
 <meta content="Fake Site Name" property="og:site_name"/>
@@ -305,11 +416,12 @@ class TestSEOEnhancer:
 <meta content="Fake summary" property="og:description"/>
 <meta content="https://www.fakesite.com/og-image.jpg" property="og:image"/>
 <meta content="fr_FR" property="og:locale"/>
+<!-- /pelican-seo -->
 </head>
                     <body>
                         <h1>Fake content title</h1>
                         <p>Fake content 🙃</p>
-                        <a href="https://www.fakesite.com">Fake internal link</a>
+                        <a href='https://www.fakesite.com'>Fake internal link</a>
                         <p>Fake content with <code>inline code</code></p>
                         <p>Fake content with "<a href="https://www.fakesite.com">Fake inline internal link</a>"</p>
                     </body>
@@ -352,8 +464,9 @@ class TestSEOEnhancer:
                 == """<html>
                     <head>
                         <title>Fake Title</title>
-                        <meta content="Fake description" name="description"/>
-                    <link href="https://www.fakesite.com/fake-title.html" rel="canonical"/>
+                        <meta name='description' content='Fake description' />
+                    <!-- pelican-seo -->
+<link href="https://www.fakesite.com/fake-title.html" rel="canonical"/>
 <script type="application/ld+json">{"@context": "https://schema.org", "@type": "BreadcrumbList", "itemListElement": [{"@type": "ListItem", "position": 1, "name": "Fake Site Name", "item": "https://www.fakesite.com"}, {"@type": "ListItem", "position": 2, "name": "Fake_file", "item": "https://www.fakesite.com/fake_file.html"}]}</script>
 <script type="application/ld+json">{"@context": "https://schema.org", "@type": "Article", "author": {"@type": "Person", "name": "Fake author"}, "publisher": {"@type": "Organization", "name": "Fake Site Name", "logo": {"@type": "ImageObject", "url": "https://www.fakesite.com/fake-logo.jpg"}}, "headline": "Fake Title", "about": "Fake category", "datePublished": "2019-04-03 23:49", "image": "https://www.fakesite.com/fake-image.jpg"}</script>
 <meta content="Fake Site Name" property="og:site_name"/>
@@ -368,11 +481,12 @@ class TestSEOEnhancer:
 <meta content="Fake category" property="article:section"/>
 <meta content="Fake tag 1" property="article:tags"/>
 <meta content="Fake tag 2" property="article:tags"/>
+<!-- /pelican-seo -->
 </head>
                     <body>
                         <h1>Fake content title</h1>
                         <p>Fake content 🙃</p>
-                        <a href="https://www.fakesite.com">Fake internal link</a>
+                        <a href='https://www.fakesite.com'>Fake internal link</a>
                         <p>Fake content with <code>inline code</code></p>
                         <p>Fake content with "<a href="https://www.fakesite.com">Fake inline internal link</a>"</p>
                     </body>
@@ -427,8 +541,9 @@ class TestSEOEnhancer:
                 == """<html>
                     <head>
                         <title>Fake Title</title>
-                        <meta content="Fake description" name="description"/>
-                    <link href="https://www.fakesite.com/fake-title.html" rel="canonical"/>
+                        <meta name='description' content='Fake description' />
+                    <!-- pelican-seo -->
+<link href="https://www.fakesite.com/fake-title.html" rel="canonical"/>
 <script type="application/ld+json">{"@context": "https://schema.org", "@type": "BreadcrumbList", "itemListElement": [{"@type": "ListItem", "position": 1, "name": "Fake Site Name", "item": "https://www.fakesite.com"}, {"@type": "ListItem", "position": 2, "name": "Fake_file", "item": "https://www.fakesite.com/fake_file.html"}]}</script>
 <script type="application/ld+json">{"@context": "https://schema.org", "@type": "Article", "author": {"@type": "Person", "name": "Fake author"}, "publisher": {"@type": "Organization", "name": "Fake Site Name", "logo": {"@type": "ImageObject", "url": "https://www.fakesite.com/fake-logo.jpg"}}, "headline": "Fake Title", "about": "Fake category", "datePublished": "2019-04-03 23:49", "image": "https://www.fakesite.com/fake-image.jpg"}</script>
 <meta content="Fake Site Name" property="og:site_name"/>
@@ -444,11 +559,12 @@ class TestSEOEnhancer:
 <meta content="Fake tag 1" property="article:tags"/>
 <meta content="Fake tag 2" property="article:tags"/>
 <meta content="https://www.fakesite.com/fake-author-profile" property="article:author"/>
+<!-- /pelican-seo -->
 </head>
                     <body>
                         <h1>Fake content title</h1>
                         <p>Fake content 🙃</p>
-                        <a href="https://www.fakesite.com">Fake internal link</a>
+                        <a href='https://www.fakesite.com'>Fake internal link</a>
                         <p>Fake content with <code>inline code</code></p>
                         <p>Fake content with "<a href="https://www.fakesite.com">Fake inline internal link</a>"</p>
                     </body>
@@ -501,8 +617,9 @@ class TestSEOEnhancer:
                 == """<html>
                     <head>
                         <title>Fake Title</title>
-                        <meta content="Fake description" name="description"/>
-                    <link href="https://www.fakesite.com/fake-title.html" rel="canonical"/>
+                        <meta name='description' content='Fake description' />
+                    <!-- pelican-seo -->
+<link href="https://www.fakesite.com/fake-title.html" rel="canonical"/>
 <script type="application/ld+json">{"@context": "https://schema.org", "@type": "BreadcrumbList", "itemListElement": [{"@type": "ListItem", "position": 1, "name": "Fake Site Name", "item": "https://www.fakesite.com"}, {"@type": "ListItem", "position": 2, "name": "Fake_file", "item": "https://www.fakesite.com/fake_file.html"}]}</script>
 <script type="application/ld+json">{"@context": "https://schema.org", "@type": "Article", "author": {"@type": "Person", "name": "Fake author"}, "publisher": {"@type": "Organization", "name": "Fake Site Name", "logo": {"@type": "ImageObject", "url": "https://www.fakesite.com/fake-logo.jpg"}}, "headline": "Fake Title", "about": "Fake category", "datePublished": "2019-04-03 23:49"}</script>
 <meta content="summary" name="twitter:card"/>
@@ -514,13 +631,136 @@ class TestSEOEnhancer:
 <meta content="OG Description" property="og:description"/>
 <meta content="https://www.fakesite.com/og-image.jpg" property="og:image"/>
 <meta content="fr_FR" property="og:locale"/>
+<!-- /pelican-seo -->
 </head>
                     <body>
                         <h1>Fake content title</h1>
                         <p>Fake content 🙃</p>
-                        <a href="https://www.fakesite.com">Fake internal link</a>
+                        <a href='https://www.fakesite.com'>Fake internal link</a>
                         <p>Fake content with <code>inline code</code></p>
                         <p>Fake content with "<a href="https://www.fakesite.com">Fake inline internal link</a>"</p>
                     </body>
                 </html>"""
             )
+
+    def test_add_html_enhancements_to_file_without_closing_head_tag(
+        self, fake_article, fake_seo_enhancer
+    ):
+        """
+        Test that add_html_to_file falls back on bs4
+        when the document has no closing </head> tag.
+        """
+
+        path = "fake_output/fake_file.html"
+        fake_html_enhancements = fake_seo_enhancer.launch_html_enhancer(
+            file=fake_article,
+            output_path="fake_output",
+            path=path,
+        )
+        html_content = "<html><head><title>Fake Title</title><body></body></html>"
+
+        with patch(
+            "seo.seo_enhancer.open", mock_open(read_data=html_content)
+        ) as mocked_open:
+            mocked_file_handle = mocked_open.return_value
+
+            fake_seo_enhancer.add_html_to_file(
+                enhancements=fake_html_enhancements, path=path
+            )
+            mocked_file_handle.write.assert_called_once()
+
+            write_args, _ = mocked_file_handle.write.call_args_list[0]
+            fake_html_content = write_args[0]
+
+            assert (
+                '<link href="https://www.fakesite.com/fake-title.html" rel="canonical"/>'
+                in fake_html_content
+            )
+
+    def test_add_html_enhancements_to_file_without_head(
+        self, fake_article, fake_seo_enhancer, html_parser
+    ):
+        """
+        Test that add_html_to_file doesn't write a document without <head>.
+        html5lib creates the missing <head>, like browsers do.
+        """
+
+        path = "fake_output/fake_file.html"
+        fake_html_enhancements = fake_seo_enhancer.launch_html_enhancer(
+            file=fake_article,
+            output_path="fake_output",
+            path=path,
+        )
+
+        with patch(
+            "seo.seo_enhancer.open", mock_open(read_data="<p>Fake content</p>")
+        ) as mocked_open:
+            mocked_file_handle = mocked_open.return_value
+
+            fake_seo_enhancer.add_html_to_file(
+                enhancements=fake_html_enhancements, path=path
+            )
+            if html_parser == "html5lib":
+                mocked_file_handle.write.assert_called_once()
+            else:
+                mocked_file_handle.write.assert_not_called()
+
+    @pytest.mark.parametrize("processes", (1, 2))
+    def test_add_html_to_files_matches_add_html_to_file(
+        self, fake_article, fake_seo_enhancer, processes
+    ):
+        """
+        Test that add_html_to_files, with or without a pool of processes,
+        writes the same files as add_html_to_file.
+        """
+
+        with TemporaryDirectory() as tmp_dir_name:
+            serial_paths = [Path(tmp_dir_name) / f"serial-{i}.html" for i in range(3)]
+            pool_paths = [Path(tmp_dir_name) / f"pool-{i}.html" for i in range(3)]
+            enhancements_by_path = {}
+
+            for serial_path, pool_path in zip(serial_paths, pool_paths):
+                serial_path.write_text(fake_article.content, encoding="utf8")
+                pool_path.write_text(fake_article.content, encoding="utf8")
+                enhancements = fake_seo_enhancer.launch_html_enhancer(
+                    file=fake_article,
+                    output_path=tmp_dir_name,
+                    path=str(pool_path),
+                    open_graph=True,
+                )
+                fake_seo_enhancer.add_html_to_file(
+                    enhancements=enhancements, path=str(serial_path)
+                )
+                enhancements_by_path[str(pool_path)] = enhancements
+
+            fake_seo_enhancer.add_html_to_files(
+                enhancements_by_path=enhancements_by_path, processes=processes
+            )
+
+            for serial_path, pool_path in zip(serial_paths, pool_paths):
+                assert pool_path.read_bytes() == serial_path.read_bytes()
+
+    def test_add_html_enhancements_to_already_enhanced_file(
+        self, fake_article, fake_seo_enhancer
+    ):
+        """Test that a file already enhanced the same way is not written again."""
+
+        path = "fake_output/fake_file.html"
+        fake_html_enhancements = fake_seo_enhancer.launch_html_enhancer(
+            file=fake_article,
+            output_path="fake_output",
+            path=path,
+        )
+        enhanced_content = fake_seo_enhancer._add_html_with_bs4(
+            enhancements=fake_html_enhancements, html_content=fake_article.content
+        )
+
+        with patch(
+            "seo.seo_enhancer.open", mock_open(read_data=enhanced_content)
+        ) as mocked_open:
+            mocked_file_handle = mocked_open.return_value
+
+            fake_seo_enhancer.add_html_to_file(
+                enhancements=fake_html_enhancements, path=path
+            )
+            mocked_file_handle.write.assert_not_called()
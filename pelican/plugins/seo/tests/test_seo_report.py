@@ -1,5 +1,7 @@
 """Unit tests for SEO Report."""
 
+import csv
+import json
 from unittest.mock import mock_open, patch
 
 import pytest
@@ -32,13 +34,11 @@ def seo_report(fake_seo_report, fake_articles_analysis):
         # mocked_open and the file handle got all
         # executed calls, and can assert them
         mocked_open.assert_called_once_with("seo_report.html", "w", encoding="utf8")
-        mocked_file_handle.write.assert_called_once()
+        mocked_file_handle.write.assert_called()
 
-        # Get all arguments in the mocked write call and select the first
-        # true arg (output)
-        args, _ = mocked_file_handle.write.call_args_list[0]
-
-        return args[0]
+        # The report is streamed : join the true arg (output) of all
+        # the mocked write calls
+        return "".join(args[0] for args, _ in mocked_file_handle.write.call_args_list)
 
 
 class TestSEOReport:
@@ -78,6 +78,65 @@ class TestSEOReport:
         assert isinstance(content_title_analysis, ContentTitleAnalyzer)
         assert isinstance(internal_link_analysis, InternalLinkAnalyzer)
 
+    def test_launch_analysis_keeps_only_compact_findings(
+        self, fake_article, fake_seo_report
+    ):
+        """
+        Test that analysis objects returned by launch_analysis are slotted
+        and keep neither the document content nor a parse tree :
+        only numbers and tuples of URLs.
+        """
+
+        fake_articles_analysis = fake_seo_report.launch_analysis(fake_article)
+
+        for analysis in fake_articles_analysis["seo_analysis"].values():
+            assert not hasattr(analysis, "__dict__")
+            for slot in type(analysis).__slots__:
+                value = getattr(analysis, slot)
+                if isinstance(value, tuple):
+                    assert all(isinstance(url, str) for url in value)
+                else:
+                    assert isinstance(value, int)
+
+    @pytest.mark.parametrize("processes", [1, 2])
+    def test_launch_analyses_gives_the_same_analysis_in_the_same_order(
+        self,
+        fake_seo_report,
+        fake_article,
+        fake_article_missing_elements,
+        fake_article_multiple_elements,
+        processes,
+    ):
+        """
+        Test that launch_analyses, with or without a pool of processes,
+        gives the same analysis as launch_analysis, in the documents order.
+        """
+
+        def _findings(document_analysis):
+            return (
+                document_analysis["url"],
+                document_analysis["date"],
+                [
+                    (name, [getattr(analysis, slot) for slot in analysis.__slots__])
+                    for name, analysis in document_analysis["seo_analysis"].items()
+                ],
+            )
+
+        documents = [
+            fake_article,
+            fake_article_missing_elements,
+            fake_article_multiple_elements,
+        ]
+
+        documents_analysis = fake_seo_report.launch_analyses(
+            documents, processes=processes
+        )
+
+        assert [_findings(analysis) for analysis in documents_analysis] == [
+            _findings(fake_seo_report.launch_analysis(document))
+            for document in documents
+        ]
+
     def test_generate_create_report_file_and_write_output(self, seo_report):
         """
         Test that generate create a HTML file and write SEO report on it.
@@ -85,6 +144,191 @@ class TestSEOReport:
 
         assert "<h1>SEO report - Fake site</h1>" in seo_report
 
+    def test_generate_creates_document_reports_while_writing(
+        self, fake_seo_report, fake_articles_analysis
+    ):
+        """
+        Test that generate streams the report : document reports are created
+        while the file is written, not all before.
+        """
+
+        documents_analysis = fake_articles_analysis * 100
+        launched_reports = []
+
+        def _launch_report(document_analysis, site_analysis=None):
+            launched_reports.append(document_analysis)
+            return []
+
+        written_reports = []
+
+        def _write(chunk):
+            written_reports.append(len(launched_reports))
+
+        mocked_open = mock_open()
+        mocked_open.return_value.write.side_effect = _write
+        with patch("seo.seo_report.open", mocked_open):
+            with patch.object(
+                fake_seo_report, "_launch_report", side_effect=_launch_report
+            ):
+                fake_seo_report.generate("Fake site", documents_analysis)
+
+        assert len(launched_reports) == len(documents_analysis)
+        assert written_reports[0] < len(documents_analysis)
+
+    def test_generate_shards_writes_index_and_shard_pages(
+        self, fake_seo_report, fake_articles_analysis, tmp_path, monkeypatch
+    ):
+        """
+        Test that generate_shards writes an index with site-wide totals,
+        linking to shard pages of at most shard_size documents by group.
+        """
+
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "seo_report").mkdir()
+        (tmp_path / "seo_report" / "removed-category-1.html").write_text("Old")
+
+        fake_seo_report.generate_shards(
+            "Fake site", fake_articles_analysis, shard_by="category", shard_size=1
+        )
+
+        index = (tmp_path / "seo_report.html").read_text(encoding="utf8")
+        assert "<span>3 documents</span>" in index
+        assert '<a href="seo_report/fake-category-1.html">' in index
+        assert '<a href="seo_report/fake-category-2.html">' in index
+        assert '<a href="seo_report/uncategorized-1.html">' in index
+        assert sorted(path.name for path in (tmp_path / "seo_report").iterdir()) == [
+            "fake-category-1.html",
+            "fake-category-2.html",
+            "uncategorized-1.html",
+        ]
+
+        shard = (tmp_path / "seo_report" / "fake-category-2.html").read_text(
+            encoding="utf8"
+        )
+        assert "Fake category (2/2)" in shard
+        assert '<a href="../seo_report.html">' in shard
+        assert shard.count("<article>") == 1
+
+    def test_generate_shards_totals_match_the_single_page_report(
+        self, fake_seo_report, fake_articles_analysis, seo_report, tmp_path, monkeypatch
+    ):
+        """
+        Test that the totals of the index count each document once for
+        each analysis, with the same outcome as the single page report.
+        """
+
+        monkeypatch.chdir(tmp_path)
+
+        fake_seo_report.generate_shards(
+            "Fake site", fake_articles_analysis, shard_by="date", shard_size=500
+        )
+
+        index = (tmp_path / "seo_report.html").read_text(encoding="utf8")
+        assert '<a href="seo_report/2019-1.html">' in index
+        assert (
+            "<td>Page description analysis</td>\n"
+            "                        <td>1</td>\n"
+            "                        <td>1</td>\n"
+            "                        <td>1</td>"
+        ) in index
+
+        shard = (tmp_path / "seo_report" / "2019-1.html").read_text(encoding="utf8")
+        assert shard.count("<article>") == seo_report.count("<article>") == 3
+
+    def test_generate_records_writes_one_record_by_document(
+        self, fake_seo_report, fake_articles_analysis, tmp_path, monkeypatch
+    ):
+        """
+        Test that generate_records writes the same records in JSON Lines
+        and CSV, one by document, with the status of each analysis.
+        """
+
+        monkeypatch.chdir(tmp_path)
+
+        fake_seo_report.generate_records(
+            fake_articles_analysis, formats=["html", "jsonl", "csv"]
+        )
+
+        assert not (tmp_path / "seo_report.html").exists()
+
+        with open(tmp_path / "seo_report.jsonl", encoding="utf8") as jsonl_file:
+            jsonl_records = [json.loads(line) for line in jsonl_file]
+        with open(tmp_path / "seo_report.csv", encoding="utf8", newline="") as csv_file:
+            csv_records = list(csv.DictReader(csv_file))
+
+        assert len(jsonl_records) == len(fake_articles_analysis)
+        assert jsonl_records[0] == {
+            "url": "fake-title.html",
+            "date": "2019-04-03 23:49",
+            "section": "articles",
+            "category": "Fake category",
+            "page_title_length": 10,
+            "page_title_status": "to_improve",
+            "page_description_length": 16,
+            "page_description_status": "to_improve",
+            "content_title_count": 1,
+            "content_title_status": "good",
+            "internal_link_count": 2,
+            "internal_link_status": "good",
+            "inbound_link_count": 0,
+            "outbound_link_count": 0,
+            "link_depth": None,
+            "link_authority": 1.0,
+            "link_graph_status": "good",
+            "broken_link_count": None,
+            "broken_link_status": None,
+            "duplicate_page_title_count": 0,
+            "duplicate_page_description_count": 0,
+            "duplicate_content_title_count": 0,
+            "near_duplicate_count": 0,
+            "duplicate_status": "good",
+        }
+        # CSV has no null values
+        assert [
+            {
+                name: "" if value is None else str(value)
+                for name, value in record.items()
+            }
+            for record in jsonl_records
+        ] == csv_records
+        assert {record["content_title_status"] for record in csv_records} == {
+            "good",
+            "to_improve",
+            "problems",
+        }
+
+    def test_records_statuses_dont_depend_on_reports_order(
+        self, fake_seo_report, fake_articles_analysis, tmp_path, monkeypatch
+    ):
+        """
+        Test that each status field of the records gets the status of its
+        micro-report, whatever the order of the micro-reports.
+        """
+
+        monkeypatch.chdir(tmp_path)
+        site_analysis = fake_seo_report.analyze_site(
+            fake_articles_analysis, site_urls={""}
+        )
+
+        def _get_records():
+            fake_seo_report.generate_records(
+                fake_articles_analysis, formats=["jsonl"], site_analysis=site_analysis
+            )
+            with open(tmp_path / "seo_report.jsonl", encoding="utf8") as jsonl_file:
+                return [json.loads(line) for line in jsonl_file]
+
+        records = _get_records()
+        launch_report = fake_seo_report._launch_report
+        monkeypatch.setattr(
+            fake_seo_report,
+            "_launch_report",
+            lambda *args: launch_report(*args)[::-1],
+        )
+
+        assert _get_records() == records
+        assert records[0]["broken_link_status"] == "problems"
+        assert records[0]["page_title_status"] == "to_improve"
+
     def test_report_contains_correct_analysis(self, seo_report):
         """
         Test that generated HTML SEO report contains expected analysis.
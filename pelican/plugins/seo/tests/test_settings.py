@@ -1,4 +1,14 @@
-from seo import get_plugin_settings
+from unittest.mock import MagicMock
+
+import pytest
+
+from seo import (
+    PLUGIN_SETTINGS_KEY,
+    PluginSettings,
+    get_plugin_settings,
+    plugin_initializer,
+    resolve_plugin_settings,
+)
 
 
 def test_get_settings():
@@ -12,8 +22,8 @@ def test_get_settings():
     settings = get_plugin_settings(context=pelican_context)
 
     assert (
-        len(settings) == 9
-    )  # 6 in the plugin settings file + 2 from the Pelican context
+        len(settings) == 28
+    )  # 26 in the plugin settings file + 2 from the Pelican context
 
     # Let's define a setting in Pelican context that
     # override the identic plugin setting value
@@ -21,5 +31,68 @@ def test_get_settings():
 
     settings = get_plugin_settings(context={"SEO_REPORT": False})
 
-    assert len(settings) == 7
+    assert len(settings) == 26
     assert settings["SEO_REPORT"] is False
+
+
+def test_plugin_initializer_resolves_settings_once():
+    """
+    Settings are resolved at initialization and stored in Pelican settings,
+    so that every hook shares the same read-only settings.
+    """
+    pelican = MagicMock(
+        settings={"SITEURL": "https://www.fakesite.com", "SEO_ENHANCER": True}
+    )
+
+    plugin_initializer(pelican)
+
+    plugin_settings = pelican.settings[PLUGIN_SETTINGS_KEY]
+    assert isinstance(plugin_settings, PluginSettings)
+    assert plugin_settings["SEO_ENHANCER"] is True
+    assert resolve_plugin_settings(pelican.settings) is plugin_settings
+
+    with pytest.raises(TypeError):
+        plugin_settings["SEO_ENHANCER"] = False
+
+
+@pytest.mark.parametrize(
+    "pelican_settings",
+    [
+        {"SEO_ENHANCER_OPEN_GRAPH": True},
+        {"SEO_ENHANCER": True, "SEO_ENHANCER_TWITTER_CARDS": True},
+        {
+            "SEO_ENHANCER": True,
+            "SEO_ENHANCER_DEFERRED": True,
+            "SEO_ENHANCER_BACKGROUND": True,
+        },
+        {"SEO_REPORT_SHARD_BY": "author"},
+        {"SEO_REPORT_FORMATS": ["html", "xml"]},
+        {"SEO_REPORT_FORMATS": "jsonl"},
+        {"SEO_ENHANCER_SITEMAP": True},
+        {
+            "SEO_ENHANCER": True,
+            "SEO_ENHANCER_BACKGROUND": True,
+            "SEO_ENHANCER_BACKGROUND_THREADS": 0,
+        },
+        {"SEO_ENHANCER_BACKGROUND_THREADS": "2"},
+        {"SEO_ENHANCER_BACKGROUND_QUEUE_SIZE": 0},
+        {"SEO_ENHANCER_BACKGROUND_QUEUE_SIZE": 10.5},
+        {"SEO_REPORT_SHARD_SIZE": 0},
+        {"SEO_REPORT_PROCESSES": -1},
+        {"SEO_ENHANCER": True, "SEO_ENHANCER_PROCESSES": 0},
+        {"SEO_ENHANCER": True, "SEO_ENHANCER_SITEMAP_PRIORITY": True},
+        {"SEO_ENHANCER_URL_STATES": True},
+        {"SEO_ENHANCER": True, "SEO_ENHANCER_INDEXNOW_KEY": "0123456789abcdef"},
+        {
+            "SEO_ENHANCER": True,
+            "SEO_ENHANCER_URL_STATES": True,
+            "SEO_ENHANCER_INDEXNOW_KEY": "short",
+        },
+    ],
+)
+def test_plugin_initializer_raises_on_misconfiguration(pelican_settings):
+    """Inconsistent settings make the build fail at startup."""
+    pelican_settings["SITEURL"] = "https://www.fakesite.com"
+
+    with pytest.raises(Exception, match="SEO_ENHANCER|Open Graph|SEO_REPORT_"):
+        plugin_initializer(MagicMock(settings=pelican_settings))
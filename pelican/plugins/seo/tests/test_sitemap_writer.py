@@ -0,0 +1,105 @@
+"""Units tests for Sitemap Writer."""
+
+from datetime import datetime, timezone
+import gzip
+
+from seo.seo_enhancer import sitemap_writer
+from seo.seo_enhancer.sitemap_writer import SitemapWriter
+
+
+def test_write_sitemap(tmp_path):
+    """
+    Test that SitemapWriter writes the absolute URL of each entry, quoted
+    and escaped, with its lastmod and priority, and a sitemap index.
+    """
+
+    writer = SitemapWriter(tmp_path / "output", "https://www.example.com/")
+    writer.add(
+        "first.html",
+        lastmod=datetime(2024, 1, 2, 10, tzinfo=timezone.utc),
+        priority=0.8,
+    )
+    writer.add("posts/café & bar/")
+    index_url = writer.close()
+
+    assert index_url == "https://www.example.com/sitemap_index.xml"
+    assert writer.urls_count == 2
+    assert (tmp_path / "output" / "sitemap.xml").read_text() == (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+        "<url><loc>https://www.example.com/first.html</loc>"
+        "<lastmod>2024-01-02T10:00:00+00:00</lastmod><priority>0.8</priority>"
+        "</url>\n"
+        "<url><loc>https://www.example.com/posts/caf%C3%A9%20&amp;%20bar/</loc>"
+        "</url>\n"
+        "</urlset>\n"
+    )
+    assert (tmp_path / "output" / "sitemap_index.xml").read_text() == (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+        "<sitemap><loc>https://www.example.com/sitemap.xml</loc></sitemap>\n"
+        "</sitemapindex>\n"
+    )
+
+
+def test_write_sitemap_files_by_urls_count(tmp_path, monkeypatch):
+    """Test that a new sitemap file is started every MAX_URLS URLs."""
+
+    monkeypatch.setattr(sitemap_writer, "MAX_URLS", 2)
+
+    writer = SitemapWriter(tmp_path, "https://www.example.com")
+    for number in range(5):
+        writer.add(f"{number}.html")
+    writer.close()
+
+    sitemap_names = ["sitemap.xml", "sitemap-2.xml", "sitemap-3.xml"]
+    for sitemap_name, urls_count in zip(sitemap_names, (2, 2, 1)):
+        assert (tmp_path / sitemap_name).read_text().count("<url>") == urls_count
+    index = (tmp_path / "sitemap_index.xml").read_text()
+    assert [name for name in sitemap_names if f"/{name}<" in index] == sitemap_names
+
+
+def test_write_sitemap_files_by_size(tmp_path, monkeypatch):
+    """Test that sitemap files, with their end, don't grow past MAX_SIZE bytes."""
+
+    monkeypatch.setattr(sitemap_writer, "MAX_SIZE", 300)
+
+    writer = SitemapWriter(tmp_path, "https://www.example.com")
+    for number in range(10):
+        writer.add(f"{number}.html")
+    writer.close()
+
+    sitemap_paths = [tmp_path / "sitemap.xml", *tmp_path.glob("sitemap-*.xml")]
+    assert len(sitemap_paths) > 2
+    for sitemap_path in sitemap_paths:
+        assert len(sitemap_path.read_bytes()) <= 300
+    assert sum(path.read_text().count("<url>") for path in sitemap_paths) == 10
+
+
+def test_write_compressed_sitemap(tmp_path):
+    """Test that compressed sitemap files are gzipped, with a ".gz" extension."""
+
+    writer = SitemapWriter(tmp_path, "https://www.example.com", compress=True)
+    writer.add("first.html")
+    index_url = writer.close()
+
+    assert index_url == "https://www.example.com/sitemap_index.xml.gz"
+    with gzip.open(tmp_path / "sitemap.xml.gz", "rt", encoding="utf-8") as file:
+        assert "<loc>https://www.example.com/first.html</loc>" in file.read()
+    with gzip.open(tmp_path / "sitemap_index.xml.gz", "rt", encoding="utf-8") as file:
+        assert "<loc>https://www.example.com/sitemap.xml.gz</loc>" in file.read()
+
+
+def test_write_empty_sitemap(tmp_path):
+    """Test that a site without URL still gets a valid sitemap."""
+
+    SitemapWriter(tmp_path, "https://www.example.com").close()
+
+    assert (
+        (tmp_path / "sitemap.xml")
+        .read_text()
+        .endswith(
+            '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n</urlset>\n'
+        )
+    )
+    assert (tmp_path / "sitemap_index.xml").exists()
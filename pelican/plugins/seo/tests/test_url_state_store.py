@@ -0,0 +1,97 @@
+"""Units tests for URL State Store."""
+
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from seo.seo_enhancer.url_state_store import URLStateStore
+
+FIRST_BUILD = 1_700_000_000
+SECOND_BUILD = FIRST_BUILD + 3600
+
+
+def _load(store, path, build_time):
+    """Load the store as if the build started at :build_time:."""
+
+    with patch("seo.seo_enhancer.url_state_store.time.time", return_value=build_time):
+        store.load(str(path))
+
+
+class TestURLStateStore:
+    """Units tests for URLStateStore."""
+
+    def test_hash_document(self):
+        """Test that the hash of a document depends on its title and content."""
+
+        document = SimpleNamespace(title="Title", content="<p>Content</p>")
+        url_hash = URLStateStore.hash_document(document)
+
+        assert len(url_hash) == 16
+        assert url_hash == URLStateStore.hash_document(
+            SimpleNamespace(title="Title", content="<p>Content</p>")
+        )
+        assert url_hash != URLStateStore.hash_document(
+            SimpleNamespace(title="Title", content="<p>Other content</p>")
+        )
+
+    def test_load_missing_or_invalid_file(self, tmp_path):
+        """Test that a missing or invalid store file gives an empty store."""
+
+        store_path = tmp_path / "url_states.sqlite3"
+        store = URLStateStore()
+
+        store.load(str(store_path))
+        assert store.loaded
+        assert store.get_lastmod("first.html") is None
+
+        store_path.write_text("not a database")
+        store.load(str(store_path))
+        store.update("first.html", b"1")
+        assert store.changed_urls == ["first.html"]
+
+    def test_lastmod_changes_only_with_the_hash(self, tmp_path):
+        """
+        Test that new URLs get their first seen date, and that the last change
+        of a URL is the build where its hash changed.
+        """
+
+        store_path = tmp_path / "cache" / "url_states.sqlite3"
+        store = URLStateStore()
+        published = datetime(2024, 1, 2, 10, tzinfo=timezone.utc)
+
+        _load(store, store_path, FIRST_BUILD)
+        assert store.update("kept.html", b"1", first_seen=published) == published
+        store.update("changed.html", b"2")
+        store.update("removed.html", b"3")
+        assert store.changed_urls == ["kept.html", "changed.html", "removed.html"]
+        store.save()
+        assert not store.loaded
+
+        _load(store, store_path, SECOND_BUILD)
+        assert store.update("kept.html", b"1") == published
+        assert store.update("changed.html", b"new") == datetime.fromtimestamp(
+            SECOND_BUILD, timezone.utc
+        )
+        store.update("added.html", b"4")
+        assert store.changed_urls == ["changed.html", "added.html"]
+        assert store.get_lastmod("kept.html") == published
+        store.save()
+
+        _load(store, store_path, SECOND_BUILD + 3600)
+        store.update("removed.html", b"3")
+        assert store.changed_urls == ["removed.html"]
+
+    def test_removed_urls(self, tmp_path):
+        """Test that URLs of the previous build not updated are removed."""
+
+        store_path = tmp_path / "url_states.sqlite3"
+        store = URLStateStore()
+
+        store.load(str(store_path))
+        for url in ("kept.html", "removed.html"):
+            store.update(url, b"1")
+        store.save()
+
+        store.load(str(store_path))
+        store.update("kept.html", b"1")
+        assert store.removed_urls == ["removed.html"]